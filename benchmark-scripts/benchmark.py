@@ -6,13 +6,38 @@
 
 import argparse
 import os
+import re
 import shlex
 import subprocess  # nosec B404
+import threading
 import time
 import traceback
 import csv
 import json
+import platform
+from dataclasses import asdict, dataclass, field
+import cgroup_stats
+import log_io
+import mixed_density
+import pipeline_sweep
+import result_parsers
 import stream_density
+import trials
+
+# cpus the metrics-collector container pins every collector to
+COLLECTOR_CPUSET_KEY = "COLLECTOR_CPUSET"
+CPUSET_PATTERN = re.compile(r'^\d+(-\d+)?(,\d+(-\d+)?)*$')
+# the metrics-collector compose file added to every run
+BENCHMARK_COMPOSE_FILE = os.path.join(
+    os.curdir, '..', 'docker', 'docker-compose.yaml')
+# the config of every run written to its results directory
+RUN_CONFIG_FILE = "run_config.json"
+FIXED_MODE = "fixed"
+SWEEP_MODE = "sweep"
+STREAM_DENSITY_MODE = "stream_density"
+MIXED_DENSITY_MODE = "mixed_density"
+# stream density container name when no --container_names is given
+DEFAULT_CONTAINER_NAME = "default_container"
 
 
 def parse_args(print=False):
@@ -29,8 +54,10 @@ def parse_args(print=False):
     parser = argparse.ArgumentParser(
         prog='benchmark',
         description='runs benchmarking using docker compose')
-    parser.add_argument('--pipelines', type=int, default=1,
-                        help='number of pipelines')
+    parser.add_argument('--pipelines', default='1',
+                        help='number of pipelines, or start:stop[:step] ' +
+                        'to sweep the pipeline count and write the ' +
+                        'scaling curve')
     # allowed multiple inputs for target_fps: e.g.: --target_fps 14.95 8.5
     parser.add_argument('--target_fps', type=float, nargs='*', default=None,
                         help='stream density target FPS; ' +
@@ -45,6 +72,28 @@ def parse_args(print=False):
                         default=None, help='stream density target ' +
                         'container names; used together with --target_fps ' +
                         'to have 1-to-1 mapping with the pipeline')
+    parser.add_argument('--mixed_density', '--mixed-density',
+                        action='store_true',
+                        help='search the mixes of pipeline counts of all ' +
+                        '--container_names that keep every --target_fps ' +
+                        'at once; the compose services read their count ' +
+                        'from PIPELINE_COUNT_<CONTAINER_NAME>')
+    parser.add_argument('--mix_ratio', '--mix-ratio', type=int, nargs='+',
+                        default=None,
+                        help='find the largest multiple of this mix of ' +
+                        'pipeline counts, one per container name, e.g. 3 1; ' +
+                        'the Pareto frontier of all mixes otherwise')
+    parser.add_argument('--max_pipelines', '--max-pipelines', type=int,
+                        default=None,
+                        help='largest pipeline count of a container in ' +
+                        'the mixed density search, default %d' %
+                        mixed_density.DEFAULT_MAX_PIPELINES)
+    parser.add_argument('--power_budget', '--power-budget', type=float,
+                        default=None,
+                        help='package power budget in watts: stream ' +
+                        'density only counts iterations within it and a ' +
+                        'sweep reports the most pipelines within it; ' +
+                        'iterations without a power reading do not count')
     parser.add_argument('--density_increment', type=int, default=None,
                         help='pipeline increment number for ' +
                              'stream density. If not specified, then ' +
@@ -73,10 +122,30 @@ def parse_args(print=False):
                         help='docker container name to get logs of and save to file')
     parser.add_argument('--parser_script', 
                         default=os.path.join(os.path.curdir, 'parse_csv_to_json.py'), 
-                        help='full path to the parsing script to obtain FPS')
+                        help='built-in parser name (parse_csv_to_json, ' +
+                        'parse_docker_log) or full path to the parsing ' +
+                        'script to obtain FPS; scripts defining ' +
+                        'parse_results(results_dir, args) run in-process')
     parser.add_argument('--parser_args', default='-k device -k igt', 
                         help='arguments to pass to the parser script, ' + 
                         'pass args with spaces in quotes: "args with spaces"')
+    parser.add_argument('--log_compression', choices=['gz', 'zst'],
+                        default=os.environ.get(log_io.LOG_COMPRESSION_KEY),
+                        help='compress the gst-launch and r*.jsonl ' +
+                        'pipeline logs once the pipelines are stopped')
+    parser.add_argument('--collector_cpuset',
+                        default=os.environ.get(COLLECTOR_CPUSET_KEY),
+                        help='housekeeping cpus to pin all metric ' +
+                        'collectors to in taskset list format, e.g. 0-1 ' +
+                        'or 0,2; keep them clear of the pipelines')
+    parser.add_argument('--trials', type=int, default=None,
+                        help='repeat the --duration measurement window ' +
+                        'on the running pipelines up to this many times')
+    parser.add_argument('--target_ci', '--target-ci', type=float,
+                        default=None,
+                        help='stop repeating once the 95%% confidence ' +
+                        'interval of the total FPS is within this ' +
+                        'fraction of the mean, e.g. 0.02 for +/-2%%')
     if print:
         parser.print_help()
         return
@@ -84,9 +153,54 @@ def parse_args(print=False):
     if args.density_increment and not args.target_fps:
         parser.error(
             '--density_increment needs to have --target_fps be specified')
+    if args.mix_ratio:
+        args.mixed_density = True
+    if args.mixed_density:
+        if not args.target_fps or len(args.target_fps) != len(
+                args.container_names or []):
+            parser.error('--mixed_density needs one --target_fps per ' +
+                         '--container_names')
+        if args.mix_ratio and (
+                len(args.mix_ratio) != len(args.container_names)
+                or min(args.mix_ratio) < 0 or not any(args.mix_ratio)):
+            parser.error('--mix_ratio needs one non-negative count per ' +
+                         '--container_names')
+        if args.max_pipelines is not None and args.max_pipelines < 1:
+            parser.error('--max_pipelines should be at least 1')
     if args.compose_file is None:
         parser.error(
             '--compose_file is empty, please provide compose files')
+    try:
+        args.pipeline_counts = pipeline_sweep.parse_pipeline_counts(
+            args.pipelines)
+    except ValueError as e:
+        parser.error(f'--pipelines {e}')
+    args.pipelines = args.pipeline_counts[0]
+    if len(args.pipeline_counts) > 1 and args.target_fps:
+        parser.error(
+            '--pipelines sweep cannot be combined with --target_fps')
+    if args.power_budget is not None:
+        if args.power_budget <= 0:
+            parser.error('--power_budget should be greater than 0')
+        if args.mixed_density or not (
+                args.target_fps or len(args.pipeline_counts) > 1):
+            parser.error('--power_budget needs --target_fps or a ' +
+                         '--pipelines sweep')
+    if args.trials is not None and args.trials < 1:
+        parser.error('--trials should be at least 1')
+    if args.target_ci is not None and args.target_ci <= 0:
+        parser.error('--target_ci should be greater than 0')
+    if (args.trials or args.target_ci) and (
+            args.target_fps or len(args.pipeline_counts) > 1):
+        parser.error('--trials and --target_ci only apply to a fixed ' +
+                     '--pipelines count')
+    if args.log_compression == 'zst' and log_io.zstandard is None:
+        parser.error('--log_compression zst needs the zstandard package, ' +
+                     'please pip install zstandard')
+    if args.collector_cpuset and not CPUSET_PATTERN.match(
+            args.collector_cpuset):
+        parser.error(
+            '--collector_cpuset should be a cpu list like 0-1 or 0,2')
     return args
 
 
@@ -130,131 +244,378 @@ def docker_compose_containers(command, compose_files=[], compose_pre_args="",
               (command, traceback.format_exc()))
 
 
+@dataclass
+class BenchmarkConfig:
+    '''
+    settings of a benchmark run, the command line options of benchmark.py
+    '''
+    compose_files: list
+    results_dir: str = os.path.join(os.curdir, 'results')
+    # a single count, pipeline_counts holds the counts of a sweep
+    pipelines: int = 1
+    pipeline_counts: list = None
+    target_fps: list = field(default_factory=list)
+    container_names: list = field(default_factory=list)
+    density_increment: int = None
+    duration: int = 30
+    init_duration: int = 20
+    target_device: str = 'CPU'
+    retail_use_case_root: str = os.path.join(os.curdir, '..', '..')
+    docker_log: str = None
+    parser_script: str = os.path.join(os.path.curdir, 'parse_csv_to_json.py')
+    parser_args: str = '-k device -k igt'
+    log_compression: str = None
+    collector_cpuset: str = None
+    trials: int = None
+    target_ci: float = None
+    mixed_density: bool = False
+    mix_ratio: list = None
+    # largest pipeline count per container of a mixed density search,
+    # mixed_density.DEFAULT_MAX_PIPELINES when None
+    max_pipelines: int = None
+    # package power budget in watts of stream density and sweep runs
+    power_budget: float = None
+    # extra environment variables for docker compose
+    env: dict = field(default_factory=dict)
 
-def main():
+    @classmethod
+    def from_args(cls, args):
+        '''
+        creates the config from the parsed command line arguments
+        '''
+        return cls(
+            compose_files=args.compose_file,
+            results_dir=args.results_dir,
+            pipelines=args.pipelines,
+            pipeline_counts=args.pipeline_counts,
+            target_fps=args.target_fps or [],
+            container_names=args.container_names or [],
+            density_increment=args.density_increment,
+            duration=args.duration,
+            init_duration=args.init_duration,
+            target_device=args.target_device,
+            retail_use_case_root=args.retail_use_case_root,
+            docker_log=args.docker_log,
+            parser_script=args.parser_script,
+            parser_args=args.parser_args,
+            log_compression=args.log_compression,
+            collector_cpuset=args.collector_cpuset,
+            trials=args.trials,
+            target_ci=args.target_ci,
+            mixed_density=args.mixed_density,
+            mix_ratio=args.mix_ratio,
+            max_pipelines=args.max_pipelines,
+            power_budget=args.power_budget)
+
+    @property
+    def mode(self):
+        if self.mixed_density or self.mix_ratio:
+            return MIXED_DENSITY_MODE
+        if self.target_fps:
+            return STREAM_DENSITY_MODE
+        if self.pipeline_counts and len(self.pipeline_counts) > 1:
+            return SWEEP_MODE
+        return FIXED_MODE
+
+    @property
+    def container_name(self):
+        '''
+        the container name filtering the logs of a fixed or sweep run
+        '''
+        return self.container_names[0] if self.container_names else ""
+
+    def validate(self):
+        if self.mode == MIXED_DENSITY_MODE and (
+                len(self.target_fps) != len(self.container_names)
+                or not self.container_names):
+            raise ValueError(
+                "For mixed density, every container name needs "
+                "a target FPS.")
+        if (len(self.target_fps) > 1
+                and len(self.target_fps) != len(self.container_names)):
+            raise ValueError(
+                "For stream density, the number of target FPS "
+                "values must match the number of "
+                "container names provided."
+            )
+
+    def all_compose_files(self):
+        '''
+        returns the absolute compose file paths including the
+        benchmark's own metrics-collector compose file
+        '''
+        compose_files = [os.path.abspath(file) for file in self.compose_files]
+        compose_files.append(os.path.abspath(BENCHMARK_COMPOSE_FILE))
+        return compose_files
+
+    def env_vars(self, results_dir):
+        '''
+        returns the environment variables passed to docker compose
+        '''
+        env_vars = os.environ.copy()
+        env_vars.update(self.env)
+        env_vars["log_dir"] = results_dir
+        env_vars["RESULTS_DIR"] = results_dir
+        env_vars["DEVICE"] = self.target_device
+        env_vars["RETAIL_USE_CASE_ROOT"] = os.path.abspath(
+            self.retail_use_case_root)
+        if self.density_increment:
+            env_vars["PIPELINE_INC"] = str(self.density_increment)
+        if self.power_budget:
+            env_vars[stream_density.POWER_BUDGET_KEY] = str(self.power_budget)
+        if self.log_compression:
+            env_vars[log_io.LOG_COMPRESSION_KEY] = self.log_compression
+        if self.collector_cpuset:
+            env_vars[COLLECTOR_CPUSET_KEY] = self.collector_cpuset
+        return env_vars
+
+
+@dataclass
+class BenchmarkResult:
     '''
-    runs benchmarking using docker compose for the specified pipeline
+    the outcome of a benchmark run
     '''
-    my_args = parse_args()
+    mode: str
+    results_dir: str
+    # stream_density.StreamDensityResult per target FPS
+    stream_density: list = field(default_factory=list)
+    # pipeline_sweep points of a sweep
+    sweep: list = field(default_factory=list)
+    # cgroup_stats.summarize_usage of a fixed run
+    resource_usage: dict = None
+    # trials.run_trials summary of a repeated fixed run
+    trials: dict = None
+    # mixed_density.run_mixed_density result of a mixed density search
+    mixed_density: dict = None
+    # results returned by the parser plugin
+    parsed: dict = None
 
-    target_fps_list = my_args.target_fps if my_args.target_fps else []
-    container_names_list = (
-        my_args.container_names
-        if my_args.container_names else []
-    )
-
-    if (len(target_fps_list) > 1
-            and len(target_fps_list) != len(container_names_list)):
-        raise ValueError(
-            "For stream density, the number of target FPS "
-            "values must match the number of "
-            "container names provided."
-        )
-
-    results_dir = os.path.abspath(my_args.results_dir)
-    if not os.path.exists(results_dir):
-        os.mkdir(results_dir)
-
-    print("Starting workload(s)")
-
-    # start the docker containers
-    # pass in necessary variables using env vars
-    compose_files = []
-    for file in my_args.compose_file:
-        compose_files.append(os.path.abspath(file))
-
-    # add the benchmark docker compose file
-    compose_files.append(os.path.abspath(os.path.join(
-        os.curdir, '..', 'docker', 'docker-compose.yaml')))
-    env_vars = os.environ.copy()
-    env_vars["log_dir"] = results_dir
-    env_vars["RESULTS_DIR"] = results_dir
-    env_vars["DEVICE"] = my_args.target_device
-    retail_use_case_root = os.path.abspath(my_args.retail_use_case_root)
-    env_vars["RETAIL_USE_CASE_ROOT"] = retail_use_case_root
-    if my_args.density_increment:
-        env_vars["PIPELINE_INC"] = str(my_args.density_increment)
-    if len(target_fps_list) > 1 and container_names_list:
-        # stream density for multiple target FPS values and containers
-        print('starting stream density for multiple running pipelines...')
-        results = stream_density.run_stream_density(env_vars, compose_files,
-                                                    target_fps_list,
-                                                    container_names_list)
-        for result in results:
-            target_fps, container_name, num_pipelines, met_fps = result
-            print(
-                f"Completed stream density for target FPS: {target_fps} in "
-                f"container: {container_name}. "
-                f"Max pipelines: {num_pipelines}, "
-                f"Met target FPS? {met_fps}")
-    elif len(target_fps_list) == 1:
-        # single target_fps stream density mode:
-        print('starting stream density...')
-        env_vars["TARGET_FPS"] = str(target_fps_list[0])
-        if my_args.density_increment:
-            env_vars["PIPELINE_INC"] = str(my_args.density_increment)
-        env_vars["INIT_DURATION"] = str(my_args.init_duration)
-        # use a default name since there is no
-        # --container_names provided in this case
-        container_name = (container_names_list[0]
-                          if container_names_list else "default_container")
-        results = stream_density.run_stream_density(
-            env_vars, compose_files, [target_fps_list[0]], [container_name])
-        target_fps, container_name, num_pipelines, met_fps = results[0]
-        print(
-            f"Max number of pipelines in stream density found for target "
-            f"FPS = {target_fps} is {num_pipelines}. "
-            f"Met target FPS? {met_fps}")
-    else:
+
+class Benchmark:
+    '''
+    runs a benchmark from a BenchmarkConfig
+    Args:
+        config: the BenchmarkConfig of the run
+        compose: callable with the signature of docker_compose_containers
+                 to run compose commands with, the docker compose CLI
+                 by default
+        on_iteration: optional callable receiving the manifest of every
+                      finished stream density iteration or sweep step
+    '''
+    def __init__(self, config, compose=None, on_iteration=None):
+        self.config = config
+        self.compose = compose
+        self.on_iteration = on_iteration
+
+    def _compose(self, *args, **kwargs):
+        compose = self.compose or docker_compose_containers
+        return compose(*args, **kwargs)
+
+    def run(self):
+        '''
+        runs the pipelines in the configured mode and parses the results
+        Returns:
+            BenchmarkResult
+        '''
+        config = self.config
+        config.validate()
+        results_dir = os.path.abspath(config.results_dir)
+        if not os.path.exists(results_dir):
+            os.mkdir(results_dir)
+
+        print("Starting workload(s)")
+        result = BenchmarkResult(config.mode, results_dir)
+        # start the docker containers
+        # pass in necessary variables using env vars
+        compose_files = config.all_compose_files()
+        self.write_run_config(results_dir, compose_files)
+        env_vars = config.env_vars(results_dir)
+        teardown = None
+        if config.mode == STREAM_DENSITY_MODE:
+            self._run_stream_density(env_vars, compose_files, result)
+        elif config.mode == MIXED_DENSITY_MODE:
+            print('starting mixed density search...')
+            result.mixed_density = mixed_density.run_mixed_density(
+                env_vars, compose_files, config.container_names,
+                config.target_fps, config.init_duration, config.mix_ratio,
+                config.max_pipelines, self._compose, self.on_iteration)
+        elif config.mode == SWEEP_MODE:
+            # --pipelines start:stop:step sweep mode
+            print('starting pipeline count sweep...')
+            result.sweep = pipeline_sweep.run_pipeline_sweep(
+                env_vars, compose_files, config.pipeline_counts,
+                config.init_duration, config.duration,
+                config.container_name, self._compose, self.on_iteration)
+        else:
+            teardown = self._run_fixed(env_vars, compose_files, result)
+
+        # collect metrics using copy-platform-metrics
+        print("workloads finished...")
+        # TODO: implement results handling based on what pipeline is run
+        result.parsed = result_parsers.run_parser(
+            config.parser_script, results_dir, config.parser_args, env_vars)
+        if teardown is not None:
+            teardown.join()
+            log_io.compress_logs(results_dir, log_io.PIPELINE_LOG_PATTERNS,
+                                 config.log_compression)
+        return result
+
+    def write_run_config(self, results_dir, compose_files):
+        '''
+        records the config of the run next to its results, see
+        results_db.py
+        '''
+        run_config = asdict(self.config)
+        # the extra environment may hold credentials
+        run_config.pop("env")
+        run_config.update({
+            "mode": self.config.mode,
+            "host": platform.node(),
+            "start_time": time.time(),
+            "compose_files": compose_files,
+        })
+        with open(os.path.join(results_dir, RUN_CONFIG_FILE), 'w') as f:
+            json.dump(run_config, f, indent=2)
+
+    def _run_stream_density(self, env_vars, compose_files, result):
+        config = self.config
+        target_fps_list = list(config.target_fps)
+        container_names_list = list(config.container_names)
+        if len(target_fps_list) > 1:
+            # stream density for multiple target FPS values and containers
+            print('starting stream density for multiple running '
+                  'pipelines...')
+        else:
+            # single target_fps stream density mode:
+            print('starting stream density...')
+            env_vars["TARGET_FPS"] = str(target_fps_list[0])
+            env_vars["INIT_DURATION"] = str(config.init_duration)
+            # use a default name since there is no
+            # --container_names provided in this case
+            container_names_list = [
+                container_names_list[0]
+                if container_names_list else DEFAULT_CONTAINER_NAME]
+        result.stream_density = stream_density.StreamDensity(
+            env_vars, compose_files, self._compose,
+            self.on_iteration).run(target_fps_list, container_names_list)
+
+    def _run_fixed(self, env_vars, compose_files, result):
+        '''
+        runs a fixed number of pipelines for the configured duration
+        Returns:
+            the thread stopping the containers
+        '''
+        config = self.config
+        results_dir = result.results_dir
         # regular --pipelines mode:
-        if my_args.pipelines > 0:
-            env_vars["PIPELINE_COUNT"] = str(my_args.pipelines)
-        docker_compose_containers("up", compose_files=compose_files,
-                                  compose_post_args="-d",
-                                  env_vars=env_vars)
-        print("Waiting for %ds init duration to complete" % my_args.init_duration)
-        time.sleep(my_args.init_duration)
-
-        # use duration to sleep
-        print(
-            "Waiting for %ds for workload to finish"
-            % my_args.duration)
-        time.sleep(my_args.duration)
-        
+        if config.pipelines > 0:
+            env_vars["PIPELINE_COUNT"] = str(config.pipelines)
+        self._compose("up", compose_files=compose_files,
+                      compose_post_args="-d", env_vars=env_vars)
+        print("Waiting for %ds init duration to complete" %
+              config.init_duration)
+        time.sleep(config.init_duration)
+
+        # the cgroup usage of the pipeline containers is measured
+        # over the whole workload duration
+        pipeline_cgroups = cgroup_stats.find_pipeline_cgroups(
+            config.container_name)
+        collector_cgroups = cgroup_stats.find_collector_cgroups()
+        cgroup_start = cgroup_stats.snapshot_cgroups(pipeline_cgroups)
+        collector_start = cgroup_stats.snapshot_cgroups(collector_cgroups)
+
+        total_fps = None
+        if config.trials or config.target_ci:
+            # repeated measurement windows on the same running pipelines
+            max_trials = config.trials or trials.DEFAULT_MAX_TRIALS
+            result.trials = trials.run_trials(
+                results_dir, config.duration, max_trials, config.target_ci,
+                "pipeline*_%s*.log" % config.container_name
+                if config.container_name else "pipeline*.log")
+            total_fps = result.trials["mean"]
+            print("Total FPS over %d trial(s): %s" % (
+                result.trials["trials"],
+                trials.format_summary(result.trials)))
+        else:
+            # use duration to sleep
+            print(
+                "Waiting for %ds for workload to finish"
+                % config.duration)
+            time.sleep(config.duration)
+        cgroup_end = cgroup_stats.snapshot_cgroups(pipeline_cgroups)
+        collector_end = cgroup_stats.snapshot_cgroups(collector_cgroups)
+        result.resource_usage = cgroup_stats.summarize_usage(
+            cgroup_stats.usage_between(cgroup_start, cgroup_end),
+            config.pipelines, total_fps,
+            collector_usages=cgroup_stats.usage_between(
+                collector_start, collector_end))
+        cgroup_stats.write_usage(results_dir, result.resource_usage)
+
         # grab the container logs if necessary
-        if my_args.docker_log:
+        if config.docker_log:
             try:
-                docker_log = ("docker logs %s" % my_args.docker_log)
+                docker_log = ("docker logs %s" % config.docker_log)
                 docker_log_args = shlex.split(docker_log)
-                log_file = os.path.join(my_args.results_dir, "%s.log" % my_args.docker_log)    
+                log_file = os.path.join(results_dir,
+                                        "%s.log" % config.docker_log)
                 print("writing docker log to %s" % log_file)
                 with open(log_file, 'wb') as f:
                     subprocess.run(docker_log_args,
                                    stdout=f,
                                    stderr=subprocess.STDOUT,
                                    check=True, env=env_vars)  # nosec B404, B603
-            
+
             except subprocess.CalledProcessError:
                 print("Exception getting the docker log %s: %s" %
-                    (my_args.docker_log, traceback.format_exc()))        
-        
-        # stop all containers and camera-simulator
-        docker_compose_containers("down", compose_files=compose_files,
-                                  env_vars=env_vars)
-
-    # collect metrics using copy-platform-metrics
-    print("workloads finished...")
-    # TODO: implement results handling based on what pipeline is run
-    try:
-        parser_string = ("python3 %s -d %s %s" % (my_args.parser_script, results_dir, my_args.parser_args))
-        # print("======DEBUG======: %s" % parser_string)
-        parser_args = shlex.split(parser_string)
+                      (config.docker_log, traceback.format_exc()))
+
+        # stop all containers and camera-simulator while the
+        # results are parsed
+        teardown = threading.Thread(
+            target=self._compose, args=("down",),
+            kwargs={"compose_files": compose_files, "env_vars": env_vars})
+        teardown.start()
+        return teardown
+
+
+def main():
+    '''
+    runs benchmarking using docker compose for the specified pipeline
+    '''
+    my_args = parse_args()
+    result = Benchmark(BenchmarkConfig.from_args(my_args)).run()
+    if result.mixed_density is not None:
+        print(f"Largest pipeline mix keeping every target FPS: "
+              f"{result.mixed_density['best']}")
+    elif len(result.stream_density) == 1:
+        density = result.stream_density[0]
+        print(
+            f"Max number of pipelines in stream density found for target "
+            f"FPS = {density.target_fps} is {density.num_pipelines}. "
+            f"Met target FPS? {density.meets_target_fps}")
+        efficient = stream_density.most_efficient_iteration(
+            density.iterations)
+        if efficient:
+            print(f"Most energy-efficient pipeline count: "
+                  f"{efficient['num_pipelines']} at "
+                  f"{efficient['fps_per_watt']:.2f} FPS per watt")
+    else:
+        for density in result.stream_density:
+            print(
+                f"Completed stream density for target FPS: "
+                f"{density.target_fps} in "
+                f"container: {density.container_name}. "
+                f"Max pipelines: {density.num_pipelines}, "
+                f"Met target FPS? {density.meets_target_fps}")
+    throttled = [manifest["num_pipelines"]
+                 for density in result.stream_density
+                 for manifest in density.iterations
+                 if manifest.get("throttled")]
+    if throttled:
+        print(f"WARN: the host throttled during the iterations with "
+              f"{throttled} pipeline(s), their FPS may be low")
+    return result
 
-        subprocess.run(parser_args,
-                       check=True, env=env_vars)  # nosec B404, B603
-    except subprocess.CalledProcessError:
-        print("Exception calling %s\n parser %s: %s" %
-              (parser_string, my_args.parser_script, traceback.format_exc()))
 
 if __name__ == '__main__':
     main()
@@ -5,10 +5,14 @@
 '''
 
 import unittest.mock as mock
+import json
 import subprocess  # nosec B404
+import shutil
+import tempfile
 import unittest
 import benchmark
 import os
+import stream_density
 
 
 class Testing(unittest.TestCase):
@@ -55,6 +59,92 @@ class Testing(unittest.TestCase):
         mock_popen.communicate.assert_called_once_with()
         mock_returncode.assert_called()
 
+    @mock.patch('time.sleep', return_value=None)
+    @mock.patch('benchmark.cgroup_stats.find_collector_cgroups',
+                return_value={})
+    @mock.patch('benchmark.cgroup_stats.find_pipeline_cgroups',
+                return_value={})
+    def test_benchmark_fixed_mode(self, mock_find_cgroups,
+                                  mock_find_collector_cgroups, mock_sleep):
+        results_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(results_dir, 'device_cpu.csv'), 'w') as f:
+                f.write("fps\n30.0\n")
+            compose_calls = []
+
+            def compose(command, compose_files=[], compose_pre_args="",
+                        compose_post_args="", env_vars=None):
+                compose_calls.append((command, env_vars))
+                return "", "", 0
+            config = benchmark.BenchmarkConfig(
+                compose_files=['pipeline.yml'], results_dir=results_dir,
+                pipelines=2, parser_script='parse_csv_to_json',
+                parser_args='-k device', env={"EXTRA": "1"})
+            self.assertEqual(config.mode, benchmark.FIXED_MODE)
+
+            result = benchmark.Benchmark(config, compose=compose).run()
+
+            self.assertEqual([call[0] for call in compose_calls],
+                             ["up", "down"])
+            up_env = compose_calls[0][1]
+            self.assertEqual(up_env["PIPELINE_COUNT"], "2")
+            self.assertEqual(up_env["RESULTS_DIR"], results_dir)
+            self.assertEqual(up_env["EXTRA"], "1")
+            self.assertEqual(result.resource_usage["num_pipelines"], 2)
+            self.assertEqual(
+                result.parsed[os.path.join(results_dir, 'device_cpu.json')],
+                [{"fps": "30.0"}])
+            self.assertTrue(os.path.isfile(os.path.join(
+                results_dir, benchmark.cgroup_stats.CGROUP_USAGE_FILE)))
+        finally:
+            shutil.rmtree(results_dir)
+
+    def test_benchmark_config(self):
+        config = benchmark.BenchmarkConfig(
+            compose_files=['a.yml'], pipeline_counts=[1, 2, 4])
+        self.assertEqual(config.mode, benchmark.SWEEP_MODE)
+        self.assertEqual(config.all_compose_files()[-1],
+                         os.path.abspath(benchmark.BENCHMARK_COMPOSE_FILE))
+        config = benchmark.BenchmarkConfig(
+            compose_files=['a.yml'], target_fps=[15.0, 10.0],
+            container_names=['gst'])
+        self.assertEqual(config.mode, benchmark.STREAM_DENSITY_MODE)
+        with self.assertRaises(ValueError):
+            config.validate()
+
+    @mock.patch('time.sleep', return_value=None)
+    @mock.patch('stream_density.measure_iteration')
+    def test_stream_density_api(self, mock_measure, mock_sleep):
+        results_dir = tempfile.mkdtemp()
+        try:
+            # 30 fps per stream up to 2 streams, then below the target
+            mock_measure.side_effect = lambda env_vars, results_dir, \
+                iteration_dir, container_name, num_pipelines, settle, \
+                window, target_fps=None: {
+                    "total_fps": 60.0,
+                    "fps_per_stream": 60.0 / num_pipelines}
+            compose = mock.Mock(return_value=("", "", 0))
+            iterations = []
+            density = stream_density.StreamDensity(
+                {stream_density.RESULTS_DIR_KEY: results_dir,
+                 stream_density.PIPELINE_INCR_KEY: "1"},
+                ['a.yml'], compose=compose, on_iteration=iterations.append)
+
+            results = density.run([25.0], ['gst'])
+
+            self.assertEqual(len(results), 1)
+            self.assertEqual(results[0].num_pipelines, 2)
+            self.assertTrue(results[0].meets_target_fps)
+            self.assertEqual([manifest["num_pipelines"]
+                              for manifest in iterations], [1, 2, 3, 2])
+            self.assertEqual(results[0].iterations, iterations)
+            self.assertEqual(compose.call_args[0][0], "down")
+            with open(os.path.join(results_dir,
+                                   'stream_density.log')) as f:
+                self.assertIn("stream_density done!", f.read())
+        finally:
+            shutil.rmtree(results_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,452 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+from dataclasses import asdict, dataclass, field
+import json
+import os
+import shlex
+import subprocess  # nosec B404
+import time
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+PROC_ROOT = "/proc"
+# the benchmark's own collector container is never a pipeline
+COLLECTOR_CONTAINER = "metrics-collector"
+# the collector's compose file is added to every run, so its compose
+# project is the one of the pipeline containers too
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+_INSPECT_FORMAT = ("'{{.Name}} {{.Id}} {{.State.Pid}} "
+                   "{{index .Config.Labels \"" + COMPOSE_PROJECT_LABEL +
+                   "\"}}'")
+CGROUP_WINDOW_KEY = "CGROUP_WINDOW"
+DEFAULT_CGROUP_WINDOW = 10
+CGROUP_USAGE_FILE = "cgroup_usage.json"
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+# cgroup v2 locations of a docker container with the systemd and the
+# cgroupfs cgroup drivers, used when the container pid cannot be mapped
+_DOCKER_CGROUP_PATTERNS = ("system.slice/docker-{}.scope", "docker/{}")
+
+
+@dataclass
+class CgroupSnapshot:
+    '''
+    cumulative counters of one cgroup at a point in time
+    '''
+    monotonic: float
+    cpu_usage_usec: int = 0
+    memory_current: int = 0
+    memory_peak: int = 0
+    io_read_bytes: int = 0
+    io_write_bytes: int = 0
+    # total stall time in usec keyed by e.g. "cpu_some" or "memory_full"
+    pressure_usec: dict = field(default_factory=dict)
+
+
+@dataclass
+class CgroupUsage:
+    '''
+    resources used by one cgroup between two snapshots
+    '''
+    name: str
+    cgroup: str
+    window_seconds: float
+    cpu_seconds: float
+    cpu_percent: float
+    memory_bytes: int
+    memory_peak_bytes: int
+    io_read_bytes: int
+    io_write_bytes: int
+    # share of the window in which some task of the cgroup was stalled
+    pressure_percent: dict = field(default_factory=dict)
+
+
+def _read_int(path, default=0):
+    try:
+        with open(path) as f:
+            return int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return default
+
+
+def read_flat_keyed(path):
+    '''
+    reads a flat keyed cgroup file such as cpu.stat
+    Args:
+        path: path to the cgroup file
+    Returns:
+        dict of key to integer value, empty if the file is missing
+    '''
+    values = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    values[parts[0]] = int(parts[1])
+    except (OSError, ValueError):
+        pass
+    return values
+
+
+def read_io_stat(path):
+    '''
+    sums the bytes read and written over all devices in io.stat
+    Args:
+        path: path to the io.stat file
+    Returns:
+        (read_bytes, write_bytes)
+    '''
+    read_bytes = 0
+    write_bytes = 0
+    try:
+        with open(path) as f:
+            for line in f:
+                # 8:0 rbytes=1 wbytes=2 rios=3 wios=4 dbytes=0 dios=0
+                for item in line.split()[1:]:
+                    key, _, value = item.partition("=")
+                    if key == "rbytes":
+                        read_bytes += int(value)
+                    elif key == "wbytes":
+                        write_bytes += int(value)
+    except (OSError, ValueError):
+        pass
+    return read_bytes, write_bytes
+
+
+def read_pressure(path):
+    '''
+    reads the cumulative stall times of a PSI pressure file
+    Args:
+        path: path to e.g. cpu.pressure
+    Returns:
+        dict of "some"/"full" to the total stall time in usec
+    '''
+    totals = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                # some avg10=0.00 avg60=0.00 avg300=0.00 total=12345
+                parts = line.split()
+                if not parts:
+                    continue
+                for item in parts[1:]:
+                    if item.startswith("total="):
+                        totals[parts[0]] = int(item[len("total="):])
+    except (OSError, ValueError):
+        pass
+    return totals
+
+
+def read_cgroup(cgroup_dir):
+    '''
+    snapshots the cpu, memory, io and pressure counters of a cgroup,
+    counters of controllers that are not enabled are left at 0
+    Args:
+        cgroup_dir: the cgroup v2 directory
+    Returns:
+        CgroupSnapshot or None if the cgroup no longer exists
+    '''
+    if not os.path.isdir(cgroup_dir):
+        return None
+    snapshot = CgroupSnapshot(monotonic=time.monotonic())
+    snapshot.cpu_usage_usec = read_flat_keyed(
+        os.path.join(cgroup_dir, "cpu.stat")).get("usage_usec", 0)
+    snapshot.memory_current = _read_int(
+        os.path.join(cgroup_dir, "memory.current"))
+    snapshot.memory_peak = _read_int(
+        os.path.join(cgroup_dir, "memory.peak"), snapshot.memory_current)
+    snapshot.io_read_bytes, snapshot.io_write_bytes = read_io_stat(
+        os.path.join(cgroup_dir, "io.stat"))
+    for resource in PRESSURE_RESOURCES:
+        totals = read_pressure(
+            os.path.join(cgroup_dir, resource + ".pressure"))
+        for kind, total in totals.items():
+            snapshot.pressure_usec[f"{resource}_{kind}"] = total
+    return snapshot
+
+
+def cgroup_of_pid(pid, proc_root=PROC_ROOT, cgroup_root=CGROUP_ROOT):
+    '''
+    maps a process to its cgroup v2 directory
+    Args:
+        pid: the process id
+    Returns:
+        the cgroup directory or None if the process has no v2 cgroup
+    '''
+    try:
+        with open(os.path.join(proc_root, str(pid), "cgroup")) as f:
+            for line in f:
+                # the unified hierarchy is the "0::<path>" entry
+                if line.startswith("0::"):
+                    path = line[3:].strip().lstrip("/")
+                    return os.path.join(cgroup_root, path)
+    except OSError:
+        pass
+    return None
+
+
+def container_cgroup_dir(container_id, pid=0, cgroup_root=CGROUP_ROOT):
+    '''
+    locates the cgroup v2 directory of a docker container
+    Args:
+        container_id: the full container id
+        pid: pid of the container's init process, 0 if unknown
+    Returns:
+        the cgroup directory or None if it cannot be found
+    '''
+    if pid:
+        cgroup_dir = cgroup_of_pid(pid, cgroup_root=cgroup_root)
+        if cgroup_dir and os.path.isdir(cgroup_dir):
+            return cgroup_dir
+    for pattern in _DOCKER_CGROUP_PATTERNS:
+        cgroup_dir = os.path.join(cgroup_root, pattern.format(container_id))
+        if os.path.isdir(cgroup_dir):
+            return cgroup_dir
+    return None
+
+
+def _docker(command):
+    try:
+        result = subprocess.run(shlex.split(command),
+                                capture_output=True, text=True,
+                                check=True)  # nosec B404, B603
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"WARN: '{command}' failed: {e}")
+        return []
+    return result.stdout.splitlines()
+
+
+def running_containers():
+    '''
+    lists the running docker containers
+    Returns:
+        list of (name, container id, pid of the init process, compose
+        project or "" outside of compose)
+    '''
+    container_ids = _docker("docker ps -q --no-trunc")
+    if not container_ids:
+        return []
+    containers = []
+    for line in _docker(f"docker inspect --format {_INSPECT_FORMAT} " +
+                        " ".join(container_ids)):
+        parts = line.split()
+        if len(parts) not in (3, 4):
+            continue
+        project = parts[3] if len(parts) == 4 else ""
+        if project == "<no value>":
+            project = ""
+        containers.append((parts[0].lstrip("/"), parts[1], int(parts[2]),
+                           project))
+    return containers
+
+
+def _cgroup_dirs(containers):
+    cgroups = {}
+    for name, container_id, pid, _ in containers:
+        cgroup_dir = container_cgroup_dir(container_id, pid)
+        if cgroup_dir:
+            cgroups[name] = cgroup_dir
+        else:
+            print(f"WARN: no cgroup v2 directory found for {name}")
+    return cgroups
+
+
+def find_pipeline_cgroups(name_filter=""):
+    '''
+    maps the running pipeline containers to their cgroups
+    Args:
+        name_filter: only containers whose name contains this string are
+                     used; when no container matches, the containers of
+                     the metrics collector's compose project are used
+    Returns:
+        dict of container name to cgroup directory, empty with a warning
+        when no pipeline container is found
+    '''
+    containers = running_containers()
+    project = next((container[3] for container in containers
+                    if container[0] == COLLECTOR_CONTAINER), "")
+    containers = [container for container in containers
+                  if container[0] != COLLECTOR_CONTAINER]
+    matching = [container for container in containers
+                if name_filter and name_filter in container[0]]
+    if not matching:
+        matching = [container for container in containers
+                    if project and container[3] == project]
+    if not matching:
+        print(f"WARN: no pipeline container matches '{name_filter}' or "
+              f"runs in the compose project of {COLLECTOR_CONTAINER}, "
+              f"the pipeline cgroup usage is not measured")
+    return _cgroup_dirs(matching)
+
+
+def find_collector_cgroups():
+    '''
+    maps the metrics-collector container, which runs every collector of
+    the benchmark, to its cgroup
+    Returns:
+        dict of container name to cgroup directory, empty if not running
+    '''
+    return _cgroup_dirs([container for container in running_containers()
+                         if container[0] == COLLECTOR_CONTAINER])
+
+
+def snapshot_cgroups(cgroups):
+    '''
+    snapshots every given cgroup
+    Args:
+        cgroups: dict of name to cgroup directory
+    Returns:
+        dict of name to (cgroup directory, CgroupSnapshot)
+    '''
+    snapshots = {}
+    for name, cgroup_dir in cgroups.items():
+        snapshot = read_cgroup(cgroup_dir)
+        if snapshot is not None:
+            snapshots[name] = (cgroup_dir, snapshot)
+    return snapshots
+
+
+def usage_between(start, end):
+    '''
+    computes the resources used by each cgroup between two snapshots
+    Args:
+        start: snapshots taken at the start of the window
+        end: snapshots taken at the end of the window
+    Returns:
+        list of CgroupUsage for cgroups present in both snapshots
+    '''
+    usages = []
+    for name, (cgroup_dir, end_snapshot) in end.items():
+        if name not in start:
+            continue
+        start_snapshot = start[name][1]
+        window = end_snapshot.monotonic - start_snapshot.monotonic
+        if window <= 0:
+            continue
+        cpu_seconds = (end_snapshot.cpu_usage_usec -
+                       start_snapshot.cpu_usage_usec) / 1e6
+        pressure_percent = {
+            key: (total - start_snapshot.pressure_usec.get(key, total)) /
+            1e6 / window * 100
+            for key, total in end_snapshot.pressure_usec.items()}
+        usages.append(CgroupUsage(
+            name=name,
+            cgroup=cgroup_dir,
+            window_seconds=window,
+            cpu_seconds=cpu_seconds,
+            # in units of one core like top, may exceed 100
+            cpu_percent=cpu_seconds / window * 100,
+            memory_bytes=end_snapshot.memory_current,
+            memory_peak_bytes=end_snapshot.memory_peak,
+            io_read_bytes=(end_snapshot.io_read_bytes -
+                           start_snapshot.io_read_bytes),
+            io_write_bytes=(end_snapshot.io_write_bytes -
+                            start_snapshot.io_write_bytes),
+            pressure_percent=pressure_percent))
+    return usages
+
+
+def summarize_usage(usages, num_pipelines, total_fps=None,
+                    collector_usages=()):
+    '''
+    turns per container usage into per pipeline costs; when several
+    pipelines share a container its cost is split evenly between them
+    Args:
+        usages: list of CgroupUsage of the pipeline containers
+        num_pipelines: number of running pipelines
+        total_fps: total fps of all pipelines over the window, if known
+        collector_usages: list of CgroupUsage of the metrics collector,
+                          reported as the benchmark's own overhead
+    Returns:
+        dict with the per stream costs and the per container usage
+    '''
+    summary = {"num_pipelines": num_pipelines, "total_fps": total_fps,
+               "containers": [asdict(usage) for usage in usages]}
+    if collector_usages:
+        collector_cpu_seconds = sum(
+            usage.cpu_seconds for usage in collector_usages)
+        summary["collector"] = {
+            "window_seconds": max(
+                usage.window_seconds for usage in collector_usages),
+            "cpu_seconds": collector_cpu_seconds,
+            "cpu_percent": sum(
+                usage.cpu_percent for usage in collector_usages),
+            "memory_mb": sum(usage.memory_bytes
+                             for usage in collector_usages) / (1024 * 1024),
+            # share of the cpu time spent by pipelines and collectors
+            # together that went to the collectors
+            "cpu_share_percent": None,
+        }
+        total_cpu_seconds = collector_cpu_seconds + sum(
+            usage.cpu_seconds for usage in usages)
+        if total_cpu_seconds > 0:
+            summary["collector"]["cpu_share_percent"] = (
+                collector_cpu_seconds / total_cpu_seconds * 100)
+    if not usages or num_pipelines <= 0:
+        return summary
+    window = max(usage.window_seconds for usage in usages)
+    cpu_seconds = sum(usage.cpu_seconds for usage in usages)
+    memory_bytes = sum(usage.memory_bytes for usage in usages)
+    summary.update({
+        "window_seconds": window,
+        "cpu_seconds": cpu_seconds,
+        "cpu_percent_per_stream": cpu_seconds / window * 100 / num_pipelines,
+        "memory_per_stream_mb": memory_bytes / num_pipelines / (1024 * 1024),
+        "cpu_seconds_per_frame": None,
+        # the worst stall among the pipeline containers
+        "pressure_percent": {},
+    })
+    if total_fps:
+        summary["cpu_seconds_per_frame"] = cpu_seconds / (total_fps * window)
+    for usage in usages:
+        for key, percent in usage.pressure_percent.items():
+            summary["pressure_percent"][key] = max(
+                percent, summary["pressure_percent"].get(key, 0.0))
+    return summary
+
+
+def measurement_window(env_vars, duration):
+    '''
+    returns how many seconds at the end of duration are used to measure
+    cgroup usage, at most half of it so the pipelines have settled
+    Args:
+        env_vars: dict of current environment variables
+        duration: the seconds the pipelines are left running
+    '''
+    window = float(env_vars.get(CGROUP_WINDOW_KEY) or DEFAULT_CGROUP_WINDOW)
+    return max(0.0, min(window, duration / 2))
+
+
+def write_usage(results_dir, summary):
+    '''
+    writes a usage summary to cgroup_usage.json under results_dir
+    '''
+    path = os.path.join(results_dir, CGROUP_USAGE_FILE)
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    return path
+
+
+def format_summary(summary):
+    '''
+    returns a one line description of a usage summary for the logs
+    '''
+    if "cpu_seconds" not in summary:
+        text = "no pipeline cgroup usage available"
+    else:
+        cpu_per_frame = summary["cpu_seconds_per_frame"]
+        text = (f"CPU per stream: {summary['cpu_percent_per_stream']:.1f}%, "
+                f"memory per stream: "
+                f"{summary['memory_per_stream_mb']:.1f} MB")
+        if cpu_per_frame is not None:
+            text += f", CPU seconds per frame: {cpu_per_frame:.4f}"
+        for key, percent in sorted(summary["pressure_percent"].items()):
+            text += f", {key} pressure: {percent:.1f}%"
+    collector = summary.get("collector")
+    if collector:
+        text += (f"; collector overhead CPU: {collector['cpu_percent']:.1f}%, "
+                 f"memory: {collector['memory_mb']:.1f} MB")
+    return text
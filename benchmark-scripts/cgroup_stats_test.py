@@ -0,0 +1,152 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import cgroup_stats
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_cgroup(self, cgroup_dir, usage_usec, memory, rbytes, wbytes,
+                     cpu_pressure_usec):
+        os.makedirs(cgroup_dir, exist_ok=True)
+        files = {
+            "cpu.stat": (f"usage_usec {usage_usec}\n"
+                         "user_usec 1\nsystem_usec 2\n"),
+            "memory.current": f"{memory}\n",
+            "io.stat": (f"8:0 rbytes={rbytes} wbytes={wbytes} rios=1 "
+                        "wios=1 dbytes=0 dios=0\n"
+                        "253:0 rbytes=0 wbytes=0 rios=0 wios=0\n"),
+            "cpu.pressure": (
+                "some avg10=0.00 avg60=0.00 avg300=0.00 "
+                f"total={cpu_pressure_usec}\n"
+                "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"),
+        }
+        for name, content in files.items():
+            with open(os.path.join(cgroup_dir, name), 'w') as f:
+                f.write(content)
+
+    def test_read_cgroup(self):
+        cgroup_dir = os.path.join(self.test_dir, 'docker', 'abc')
+        self.write_cgroup(cgroup_dir, 5000000, 1048576, 4096, 8192, 250)
+        snapshot = cgroup_stats.read_cgroup(cgroup_dir)
+        self.assertEqual(snapshot.cpu_usage_usec, 5000000)
+        self.assertEqual(snapshot.memory_current, 1048576)
+        # memory.peak is missing on older kernels
+        self.assertEqual(snapshot.memory_peak, 1048576)
+        self.assertEqual(snapshot.io_read_bytes, 4096)
+        self.assertEqual(snapshot.io_write_bytes, 8192)
+        self.assertEqual(snapshot.pressure_usec,
+                         {"cpu_some": 250, "cpu_full": 0})
+        self.assertIsNone(cgroup_stats.read_cgroup(
+            os.path.join(self.test_dir, 'missing')))
+
+    def test_usage_and_summary(self):
+        start = {
+            "gst0": ("/cg/gst0", cgroup_stats.CgroupSnapshot(
+                monotonic=100.0, cpu_usage_usec=1000000,
+                memory_current=100 * 1024 * 1024,
+                pressure_usec={"cpu_some": 0})),
+            "gone": ("/cg/gone", cgroup_stats.CgroupSnapshot(
+                monotonic=100.0)),
+        }
+        end = {
+            "gst0": ("/cg/gst0", cgroup_stats.CgroupSnapshot(
+                monotonic=110.0, cpu_usage_usec=21000000,
+                memory_current=200 * 1024 * 1024,
+                io_read_bytes=10, pressure_usec={"cpu_some": 1000000})),
+        }
+        usages = cgroup_stats.usage_between(start, end)
+        self.assertEqual(len(usages), 1)
+        usage = usages[0]
+        self.assertAlmostEqual(usage.cpu_seconds, 20.0)
+        self.assertAlmostEqual(usage.cpu_percent, 200.0)
+        self.assertAlmostEqual(usage.pressure_percent["cpu_some"], 10.0)
+
+        summary = cgroup_stats.summarize_usage(usages, 4, total_fps=60.0)
+        self.assertAlmostEqual(summary["cpu_percent_per_stream"], 50.0)
+        self.assertAlmostEqual(summary["memory_per_stream_mb"], 50.0)
+        self.assertAlmostEqual(summary["cpu_seconds_per_frame"],
+                               20.0 / (60.0 * 10.0))
+        self.assertIn("CPU seconds per frame",
+                      cgroup_stats.format_summary(summary))
+
+        summary = cgroup_stats.summarize_usage(usages, 4)
+        self.assertIsNone(summary["cpu_seconds_per_frame"])
+        self.assertNotIn("collector", summary)
+
+        collector = cgroup_stats.CgroupUsage(
+            name=cgroup_stats.COLLECTOR_CONTAINER, cgroup="/cg/collector",
+            window_seconds=10.0, cpu_seconds=5.0, cpu_percent=50.0,
+            memory_bytes=64 * 1024 * 1024, memory_peak_bytes=0,
+            io_read_bytes=0, io_write_bytes=0)
+        summary = cgroup_stats.summarize_usage(
+            usages, 4, collector_usages=[collector])
+        self.assertAlmostEqual(summary["collector"]["memory_mb"], 64.0)
+        self.assertAlmostEqual(
+            summary["collector"]["cpu_share_percent"], 5.0 / 25.0 * 100)
+        self.assertIn("collector overhead",
+                      cgroup_stats.format_summary(summary))
+        self.assertNotIn("cpu_seconds",
+                         cgroup_stats.summarize_usage([], 4))
+
+    def test_container_cgroup_dir(self):
+        cgroup_root = os.path.join(self.test_dir, 'cgroup')
+        cgroupfs_dir = os.path.join(cgroup_root, 'docker', 'abc')
+        os.makedirs(cgroupfs_dir)
+        self.assertEqual(
+            cgroup_stats.container_cgroup_dir('abc', cgroup_root=cgroup_root),
+            cgroupfs_dir)
+        self.assertIsNone(
+            cgroup_stats.container_cgroup_dir('def', cgroup_root=cgroup_root))
+
+        proc_root = os.path.join(self.test_dir, 'proc')
+        os.makedirs(os.path.join(proc_root, '42'))
+        with open(os.path.join(proc_root, '42', 'cgroup'), 'w') as f:
+            f.write("0::/system.slice/docker-abc.scope\n")
+        self.assertEqual(
+            cgroup_stats.cgroup_of_pid(42, proc_root, cgroup_root),
+            os.path.join(cgroup_root, 'system.slice', 'docker-abc.scope'))
+
+    def test_find_pipeline_cgroups(self):
+        containers = [("metrics-collector", "c0", 10, "run"),
+                      ("pipeline-1", "c1", 11, "run"),
+                      ("gst-2", "c2", 12, "run"),
+                      ("unrelated-db", "c3", 13, "other"),
+                      ("standalone", "c4", 14, "")]
+        with patch('cgroup_stats.running_containers',
+                   return_value=containers), \
+                patch('cgroup_stats.container_cgroup_dir',
+                      side_effect=lambda container_id, pid: "/cg/" +
+                      container_id):
+            self.assertEqual(cgroup_stats.find_pipeline_cgroups("gst"),
+                             {"gst-2": "/cg/c2"})
+            # without a match only the collector's compose project counts
+            self.assertEqual(cgroup_stats.find_pipeline_cgroups(),
+                             {"pipeline-1": "/cg/c1", "gst-2": "/cg/c2"})
+        with patch('cgroup_stats.running_containers',
+                   return_value=containers[1:]):
+            self.assertEqual(cgroup_stats.find_pipeline_cgroups("none"), {})
+
+    def test_measurement_window(self):
+        self.assertEqual(cgroup_stats.measurement_window({}, 120), 10)
+        self.assertEqual(cgroup_stats.measurement_window(
+            {cgroup_stats.CGROUP_WINDOW_KEY: "30"}, 120), 30)
+        self.assertEqual(cgroup_stats.measurement_window({}, 10), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,319 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import stream_density
+import trials
+
+# consolidated summaries, one per run: summary.csv, summary_run2.csv, ...
+SUMMARY_PATTERN = re.compile(r'^summary.*\.csv$')
+TRIALS_KPI = "Total FPS Mean"
+DENSITY_KPI = "Stream Density {}"
+# KPIs that describe the run rather than its performance, the element
+# latency rank and share move with any other element
+IGNORED_KPI_PATTERN = re.compile(
+    r'Last log update|Steady Window|Trials|\bCI\b|Bottleneck|Power Source|'
+    r'Latency Rank|Latency Share %')
+# per-stream KPI keys hold the start timestamp of the pipeline logs,
+# e.g. Camera_20240405141414071831277 FPS
+STREAM_KEY_PATTERN = re.compile(r'^(Camera|Pipeline)_(\d+)\b')
+# KPI category, key pattern and whether higher values are better, the
+# first matching category applies
+KPI_CATEGORIES = (
+    ("density", re.compile(r'Density'), True),
+    ("energy", re.compile(r'per Watt'), True),
+    ("energy", re.compile(r'Energy per Frame|Average Power'), False),
+    ("stability", re.compile(
+        r'FPS CV|Stall|Below Target|Warm-up|Unstable Streams'), False),
+    ("fps", re.compile(r'\bFPS\b'), True),
+    ("latency", re.compile(r'Latency'), False),
+    ("utilization", re.compile(
+        r'Utilization|Memory|Bandwidth|CPU Seconds|Pressure'), False),
+)
+# default regression thresholds in percent of the baseline
+DEFAULT_THRESHOLDS = {"fps": 3.0, "latency": 5.0, "density": 0.0,
+                      "utilization": 5.0, "energy": 5.0,
+                      "stability": 10.0}
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+
+
+def kpi_category(key):
+    '''
+    returns the (category, higher_is_better) of a KPI key, or None for
+    KPIs that are not compared
+    '''
+    if IGNORED_KPI_PATTERN.search(key):
+        return None
+    for category, pattern, higher_is_better in KPI_CATEGORIES:
+        if pattern.search(key):
+            return category, higher_is_better
+    return None
+
+
+def index_streams(kpis):
+    '''
+    replaces the stream ids of the per-stream KPI keys by the index of
+    the stream in start order, so that runs started at different times
+    share their keys
+    Args:
+        kpis: dict of KPI key to value
+    Returns:
+        dict with Camera_<index> and Pipeline_<index> keys
+    '''
+    ids = sorted({int(match.group(2)) for match in
+                  map(STREAM_KEY_PATTERN.match, kpis) if match})
+    index = {stream_id: position
+             for position, stream_id in enumerate(ids, start=1)}
+    return {STREAM_KEY_PATTERN.sub(
+        lambda match: f"{match.group(1)}_{index[int(match.group(2))]}",
+        key): value for key, value in kpis.items()}
+
+
+def read_summary(path):
+    '''
+    reads the numeric KPIs of a consolidated key,value summary csv
+    Args:
+        path: summary csv file path
+    Returns:
+        dict of KPI key to float value, keyed by stream index
+    '''
+    kpis = {}
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 2:
+                continue
+            try:
+                value = float(row[1])
+            except ValueError:
+                continue
+            if math.isfinite(value):
+                kpis[row[0]] = value
+    return index_streams(kpis)
+
+
+def read_trial_samples(path):
+    '''
+    returns the total fps of the trials kept in a trials.json
+    '''
+    with open(path) as f:
+        summary = json.load(f)
+    return [trial["total_fps"] for trial in summary["trial_results"]
+            if not trial.get("outlier")]
+
+
+def density_kpis(results_dir):
+    '''
+    returns the stream density found per container from the iteration
+    manifests, the most pipelines that met the target fps
+    '''
+    kpis = {}
+    for manifest in stream_density.load_density_trace(results_dir):
+        if manifest.get("meets_target_fps"):
+            key = DENSITY_KPI.format(manifest["container_name"])
+            kpis[key] = max(kpis.get(key, 0), manifest["num_pipelines"])
+    return kpis
+
+
+def collect_results(root):
+    '''
+    collects the KPI samples of a result tree, every directory holding
+    a summary csv is one config and every summary csv in it one sample
+    Args:
+        root: a summary csv file or a directory of results
+    Returns:
+        dict of config (directory relative to root) to a dict of KPI key
+        to the list of its samples
+    '''
+    if os.path.isfile(root):
+        return {"": {key: [value] for key, value in
+                     read_summary(root).items()}}
+    results = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            d for d in dirnames
+            if not d.startswith(stream_density.ITERATION_DIR_PREFIX)]
+        summaries = sorted(name for name in filenames
+                           if SUMMARY_PATTERN.match(name))
+        if not summaries:
+            continue
+        config = os.path.relpath(dirpath, root)
+        config = "" if config == os.curdir else config
+        samples = results.setdefault(config, {})
+        for name in summaries:
+            for key, value in read_summary(
+                    os.path.join(dirpath, name)).items():
+                samples.setdefault(key, []).append(value)
+        if trials.TRIALS_FILE in filenames:
+            # the individual trials say more than their mean
+            samples[TRIALS_KPI] = read_trial_samples(
+                os.path.join(dirpath, trials.TRIALS_FILE))
+        for key, value in density_kpis(dirpath).items():
+            samples.setdefault(key, []).append(value)
+    return results
+
+
+def welch_test(baseline, candidate):
+    '''
+    tests whether the means of two sample lists differ at the 95% level
+    with Welch's t-test, which does not assume equal variances
+    Args:
+        baseline: list of baseline samples
+        candidate: list of candidate samples
+    Returns:
+        (t statistic, degrees of freedom, significant), all None when
+        either side has less than two samples
+    '''
+    if len(baseline) < 2 or len(candidate) < 2:
+        return None, None, None
+    difference = statistics.mean(candidate) - statistics.mean(baseline)
+    baseline_error = statistics.variance(baseline) / len(baseline)
+    candidate_error = statistics.variance(candidate) / len(candidate)
+    error = baseline_error + candidate_error
+    if error == 0:
+        return None, None, difference != 0
+    t = difference / math.sqrt(error)
+    df = error ** 2 / (baseline_error ** 2 / (len(baseline) - 1) +
+                       candidate_error ** 2 / (len(candidate) - 1))
+    return t, df, abs(t) > trials.t_critical(max(1, int(df)))
+
+
+def compare_kpi(key, baseline, candidate, thresholds):
+    '''
+    compares the samples of one KPI
+    Args:
+        key: KPI key
+        baseline: list of baseline samples
+        candidate: list of candidate samples
+        thresholds: dict of category to regression threshold in percent
+    Returns:
+        comparison dict, or None for KPIs that are not compared
+    '''
+    category = kpi_category(key)
+    if category is None:
+        return None
+    category, higher_is_better = category
+    baseline_mean = statistics.mean(baseline)
+    candidate_mean = statistics.mean(candidate)
+    change = None
+    if baseline_mean != 0:
+        change = (candidate_mean - baseline_mean) / abs(baseline_mean) * 100
+    t, df, significant = welch_test(baseline, candidate)
+    status = UNCHANGED
+    # single runs have no spread to test, the threshold alone decides
+    if change is not None and significant is not False:
+        worse = -change if higher_is_better else change
+        if worse > thresholds[category]:
+            status = REGRESSION
+        elif -worse > thresholds[category]:
+            status = IMPROVEMENT
+    return {"kpi": key, "category": category,
+            "baseline": baseline_mean, "candidate": candidate_mean,
+            "change_percent": change, "baseline_samples": len(baseline),
+            "candidate_samples": len(candidate), "t": t,
+            "significant": significant, "status": status}
+
+
+def compare_results(baseline_results, candidate_results, thresholds):
+    '''
+    aligns two collected result trees by config and KPI key and compares
+    every KPI both sides have
+    Args:
+        baseline_results: dict returned by collect_results
+        candidate_results: dict returned by collect_results
+        thresholds: dict of category to regression threshold in percent
+    Returns:
+        (list of comparison dicts with their config, list of configs
+        only found on one side)
+    '''
+    rows = []
+    for config in sorted(set(baseline_results) & set(candidate_results)):
+        baseline = baseline_results[config]
+        candidate = candidate_results[config]
+        for key in sorted(set(baseline) & set(candidate)):
+            row = compare_kpi(key, baseline[key], candidate[key], thresholds)
+            if row is not None:
+                row["config"] = config
+                rows.append(row)
+    unmatched = sorted(set(baseline_results) ^ set(candidate_results))
+    return rows, unmatched
+
+
+def write_comparison(path, rows):
+    columns = ["config", "kpi", "category", "baseline", "candidate",
+               "change_percent", "baseline_samples", "candidate_samples",
+               "t", "significant", "status"]
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_row(row):
+    config = f"{row['config']}: " if row["config"] else ""
+    significance = ""
+    if row["significant"] is not None:
+        significance = (" (significant)" if row["significant"]
+                        else " (not significant)")
+    return (f"{row['status'].upper()} {config}{row['kpi']}: "
+            f"{row['baseline']:.4g} -> {row['candidate']:.4g} "
+            f"({row['change_percent']:+.1f}%){significance}")
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog='compare_results',
+        description='compares benchmark results against a baseline and '
+                    'fails on performance regressions')
+    parser.add_argument('--baseline', required=True,
+                        help='baseline summary csv or results directory')
+    parser.add_argument('--candidate', required=True,
+                        help='candidate summary csv or results directory')
+    for category, threshold in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f'--{category}_threshold', type=float,
+                            default=threshold,
+                            help=f'allowed {category} regression in '
+                                 f'percent, default {threshold:g}')
+    parser.add_argument('--output', default=None,
+                        help='csv file to write every comparison to')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    '''
+    compares the results and returns the exit code, 1 on a regression
+    '''
+    args = parse_args(args)
+    thresholds = {category: getattr(args, f'{category}_threshold')
+                  for category in DEFAULT_THRESHOLDS}
+    rows, unmatched = compare_results(collect_results(args.baseline),
+                                      collect_results(args.candidate),
+                                      thresholds)
+    if args.output:
+        write_comparison(args.output, rows)
+    for config in unmatched:
+        print(f"WARN: {config or 'top level results'} only found on "
+              f"one side, not compared")
+    for row in rows:
+        if row["status"] != UNCHANGED:
+            print(format_row(row))
+    regressions = sum(row["status"] == REGRESSION for row in rows)
+    print(f"compared {len(rows)} KPIs: {regressions} regression(s), "
+          f"{sum(row['status'] == IMPROVEMENT for row in rows)} "
+          f"improvement(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
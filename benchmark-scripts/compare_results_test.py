@@ -0,0 +1,148 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import compare_results
+import trials
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_summary(self, path, kpis):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            for key, value in kpis.items():
+                f.write(f"{key},{value}\n")
+
+    def test_kpi_category(self):
+        self.assertEqual(compare_results.kpi_category("Camera_1 FPS"),
+                         ("fps", True))
+        self.assertEqual(compare_results.kpi_category("Pipeline_1 Latency"),
+                         ("latency", False))
+        self.assertEqual(compare_results.kpi_category("CPU Utilization %"),
+                         ("utilization", False))
+        self.assertEqual(compare_results.kpi_category("Stream Density gst"),
+                         ("density", True))
+        self.assertEqual(compare_results.kpi_category("FPS per Watt"),
+                         ("energy", True))
+        self.assertEqual(compare_results.kpi_category("Energy per Frame J"),
+                         ("energy", False))
+        self.assertEqual(compare_results.kpi_category("Camera_1 FPS CV"),
+                         ("stability", False))
+        self.assertEqual(compare_results.kpi_category("Unstable Streams"),
+                         ("stability", False))
+        for key in ("Camera_1 Last log update", "Total FPS CI 95% +/-",
+                    "Element queue Latency Rank",
+                    "Element queue Latency Share %",
+                    "Steady Window Seconds", "Disk Read MB/s"):
+            with self.subTest(key=key):
+                self.assertIsNone(compare_results.kpi_category(key))
+
+    def test_welch_test(self):
+        baseline = [100.0, 101.0, 99.0, 100.5, 99.5]
+        self.assertTrue(compare_results.welch_test(
+            baseline, [95.0, 96.0, 94.0, 95.5, 94.5])[2])
+        self.assertFalse(compare_results.welch_test(
+            baseline, [100.5, 99.0, 101.0, 99.5, 100.0])[2])
+        self.assertEqual(compare_results.welch_test([100.0], baseline),
+                         (None, None, None))
+
+    def test_compare_kpi(self):
+        thresholds = compare_results.DEFAULT_THRESHOLDS
+        row = compare_results.compare_kpi(
+            "Camera_1 FPS", [30.0], [28.0], thresholds)
+        self.assertEqual(row["status"], compare_results.REGRESSION)
+        self.assertAlmostEqual(row["change_percent"], -100 / 15)
+        # within the threshold
+        self.assertEqual(compare_results.compare_kpi(
+            "Camera_1 FPS", [30.0], [29.5], thresholds)["status"],
+            compare_results.UNCHANGED)
+        # latency is better when lower
+        self.assertEqual(compare_results.compare_kpi(
+            "Pipeline_1 Latency", [50.0], [40.0], thresholds)["status"],
+            compare_results.IMPROVEMENT)
+        # a drop within the trial noise is no regression
+        self.assertEqual(compare_results.compare_kpi(
+            "Total FPS Mean", [100.0, 80.0, 120.0], [90.0, 70.0, 110.0],
+            thresholds)["status"], compare_results.UNCHANGED)
+        self.assertIsNone(compare_results.compare_kpi(
+            "Camera_1 Last log update", [1.0], [2.0], thresholds))
+
+    def test_stream_timestamps(self):
+        baseline = os.path.join(self.test_dir, 'baseline', 'summary.csv')
+        candidate = os.path.join(self.test_dir, 'candidate', 'summary.csv')
+        for path, first, second, fps in (
+                (baseline, "20240405141414071831277",
+                 "20240405141713198120407", 30.0),
+                (candidate, "20250101090000000000001",
+                 "20250101090000000000002", 25.0)):
+            self.write_summary(path, {f"Camera_{second} FPS": fps,
+                                      f"Camera_{first} FPS": fps,
+                                      f"Pipeline_{first} Latency": 50.0})
+        self.assertEqual(sorted(compare_results.read_summary(candidate)),
+                         ["Camera_1 FPS", "Camera_2 FPS",
+                          "Pipeline_1 Latency"])
+        rows, _ = compare_results.compare_results(
+            compare_results.collect_results(baseline),
+            compare_results.collect_results(candidate),
+            compare_results.DEFAULT_THRESHOLDS)
+        self.assertEqual({row["kpi"]: row["status"] for row in rows},
+                         {"Camera_1 FPS": compare_results.REGRESSION,
+                          "Camera_2 FPS": compare_results.REGRESSION,
+                          "Pipeline_1 Latency": compare_results.UNCHANGED})
+
+    def test_main(self):
+        baseline = os.path.join(self.test_dir, 'baseline')
+        candidate = os.path.join(self.test_dir, 'candidate')
+        for root, fps, latency in ((baseline, 30.0, 50.0),
+                                   (candidate, 30.1, 60.0)):
+            self.write_summary(
+                os.path.join(root, 'cpu', 'summary.csv'),
+                {"Camera_1 FPS": fps, "Camera_1 Last log update": "now",
+                 "CPU Utilization %": 40.0})
+            self.write_summary(
+                os.path.join(root, 'gpu', 'summary.csv'),
+                {"Pipeline_1 Latency": latency, "GPU Utilization %": 50.0})
+        self.write_summary(os.path.join(baseline, 'npu', 'summary.csv'),
+                           {"Camera_1 FPS": 10.0})
+        with open(os.path.join(candidate, 'cpu', trials.TRIALS_FILE),
+                  'w') as f:
+            json.dump({"trial_results": [
+                {"total_fps": 30.0}, {"total_fps": 31.0},
+                {"total_fps": 5.0, "outlier": True}]}, f)
+
+        results = compare_results.collect_results(candidate)
+        self.assertEqual(results["cpu"][compare_results.TRIALS_KPI],
+                         [30.0, 31.0])
+
+        output = os.path.join(self.test_dir, 'compare.csv')
+        self.assertEqual(compare_results.main(
+            ['--baseline', baseline, '--candidate', candidate,
+             '--output', output]), 1)
+        with open(output) as f:
+            self.assertEqual(len(f.readlines()), 5)
+        # a looser latency threshold lets the candidate pass
+        self.assertEqual(compare_results.main(
+            ['--baseline', baseline, '--candidate', candidate,
+             '--latency_threshold', '25']), 0)
+        self.assertEqual(compare_results.main(
+            ['--baseline', os.path.join(baseline, 'cpu', 'summary.csv'),
+             '--candidate', os.path.join(candidate, 'cpu', 'summary.csv')]),
+            0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,15 @@ from natsort import natsorted
 from operator import add
 import json
 import csv
+import cgroup_stats
+import gst_tracer_parser
+import log_io
+import stream_stability
+import thermal
+import timeline
+import trials
+import stream_density
+from stream_density import ITERATION_DIR_PREFIX
 
 # constants
 AVG_CPU_USAGE_CONSTANT = "CPU Utilization %"
@@ -38,6 +47,26 @@ LAST_MODIFIED_LOG = "Last log update"
 TEXT_COUNT_CONSTANT = "Total Text count"
 BARCODE_COUNT_CONSTANT = "Total Barcode count"
 PIPELINE_LATENCY_CONSTANT = "Latency"
+LATENCY_BOTTLENECK_CONSTANT = "Latency Bottleneck Element"
+WINDOW_START_CONSTANT = "Steady Window Start"
+WINDOW_END_CONSTANT = "Steady Window End"
+WINDOW_DURATION_CONSTANT = "Steady Window Seconds"
+CPU_SECONDS_PER_FRAME_CONSTANT = "CPU Seconds per Frame"
+STREAM_CPU_USAGE_CONSTANT = "CPU Utilization % per Stream"
+STREAM_MEM_USAGE_CONSTANT = "Memory per Stream MB"
+PRESSURE_CONSTANT = "Pressure %"
+TRIALS_FPS_CONSTANT = "Total FPS"
+CPU_FREQUENCY_CONSTANT = "CPU Frequency MHz"
+MIN_CPU_FREQUENCY_CONSTANT = "Min CPU Frequency MHz"
+TEMPERATURE_CONSTANT = "Peak Temperature C"
+THROTTLED_SECONDS_CONSTANT = "Throttled Seconds"
+THROTTLED_PERCENT_CONSTANT = "Throttled %"
+THROTTLE_INTERVALS_CONSTANT = "Throttle Intervals"
+FPS_CV_CONSTANT = "FPS CV"
+LONGEST_STALL_CONSTANT = "Longest Stall s"
+BELOW_TARGET_CONSTANT = "Below Target %"
+WARMUP_CONSTANT = "Warm-up s"
+UNSTABLE_STREAMS_CONSTANT = "Unstable Streams"
 
 class KPIExtractor(ABC):
     @abstractmethod
@@ -60,7 +89,7 @@ class CPUUsageExtractor(KPIExtractor):
         print("parsing CPU usages")
         sar_cpu_usage_row_p = re.compile(self._SAR_CPU_USAGE_PATTERN)
         cpu_usages = []
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             for line in f:
                 sar_cpu_usage_row_m= sar_cpu_usage_row_p.match(line)
                 if sar_cpu_usage_row_m:
@@ -78,7 +107,14 @@ class NPUUsageExtractor(KPIExtractor):
     #overriding abstract method
     def extract_data(self, log_file_path):
         print("parsing NPU csv")
-        npu_df = pd.read_csv(log_file_path)
+        with log_io.open_log(log_file_path) as f:
+            npu_df = pd.read_csv(f)
+        if 'device' in npu_df.columns and npu_df['device'].nunique() > 1:
+            # one utilization per NPU when the sampler found several
+            usages_by_device = npu_df.groupby('device')['percent_usage']
+            return {"NPU_{} {}".format(device, AVG_NPU_USAGE_CONSTANT):
+                    mean(usages)
+                    for device, usages in usages_by_device}
         if len(npu_df['percent_usage']) > 0:
             return {AVG_NPU_USAGE_CONSTANT: mean(npu_df['percent_usage'])}
         else:
@@ -88,18 +124,20 @@ class NPUUsageExtractor(KPIExtractor):
         return {AVG_NPU_USAGE_CONSTANT: "NA"}
 
 class GPUUsageExtractor(KPIExtractor):
+    _DESC_MAP = {
+        'CCS %': 'Compute[CCS] Utilization %',
+        'RCS %': 'Render/3D[RCS] Utilization %',
+        'VCS %': 'Video[VCS] Utilization %',
+        'VECS %': 'VideoEnhance[VECS] Utilization %',
+        'Power W pkg': 'GPU Power (W)',
+        'RC6 %': 'GPU Idle Time (RC6 %)'
+    }
+
     #overriding abstract method
     def extract_data(self, log_file_path):
         print("parsing GPU usages")
         device = re.findall(r'\d+', os.path.basename(log_file_path))
-        desc_map = {
-            'CCS %': 'Compute[CCS] Utilization %',
-            'RCS %': 'Render/3D[RCS] Utilization %',
-            'VCS %': 'Video[VCS] Utilization %',
-            'VECS %': 'VideoEnhance[VECS] Utilization %',
-            'Power W pkg': 'GPU Power (W)',
-            'RC6 %': 'GPU Idle Time (RC6 %)'
-        }
+        desc_map = self._DESC_MAP
 
         device_prefix = f"GPU_{device[0]}"
         gpu_device_usage = {
@@ -108,7 +146,7 @@ class GPUUsageExtractor(KPIExtractor):
 
         if os.path.isfile(log_file_path) and os.path.getsize(log_file_path) > 0:
             try:
-                with open(log_file_path, 'r') as f:
+                with log_io.open_log(log_file_path) as f:
                     data = json.load(f)
 
                 if isinstance(data, list) and data:
@@ -152,7 +190,7 @@ class XPUMUsageExtractor(KPIExtractor):
         device_vdbox0_usage_key = "GPU_{} VDBOX0 {}".format(device[0], AVG_GPU_VDBOX_USAGE_CONSTANT)
         device_vdbox1_usage_key = "GPU_{} VDBOX1 {}".format(device[0], AVG_GPU_VDBOX_USAGE_CONSTANT)
         #print("{}".format(device_usage_key))
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             gpu_samples = []
             mem_samples = []
             compute_samples = []
@@ -204,7 +242,7 @@ class MetaExtractor(KPIExtractor):
         print("parsing text and barcode data")
         #text_count = 0
         #barcode_count = 0
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             for line in f:
                 if self._TEXT_PATTERN in line:
                     print("got text pattern")
@@ -238,7 +276,7 @@ class MemUsageExtractor(KPIExtractor):
         print("parsing memory usage")
         mem_usages = []
         mem_usage_p = re.compile(self._MEM_USAGE_PATTERN)
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             for line in f:
                 mem_usage_m = mem_usage_p.match(line)
                 if mem_usage_m:
@@ -265,7 +303,7 @@ class PowerUsageExtractor(KPIExtractor):
         power_dict = defaultdict(list)
         power_usage_p = re.compile(self._POWER_USAGE_PATTERN)
         print("parsing power usage")
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             for line in f:
                 power_usage_m = power_usage_p.match(line)
                 if power_usage_m:
@@ -299,7 +337,7 @@ class DiskBandwidthExtractor(KPIExtractor):
         disk_read_bytes_per_second = []
         disk_write_bytes_per_second = []
         disk_bandwidth_p = re.compile(self._DISK_BANDWIDTH_PATTERN)
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             for line in f:
                 disk_bandwidth_m = disk_bandwidth_p.match(line)
                 if disk_bandwidth_m:
@@ -323,6 +361,170 @@ class DiskBandwidthExtractor(KPIExtractor):
     def return_blank(self):
         return {AVG_DISK_READ_BANDWIDTH_CONSTANT: "NA", AVG_DISK_WRITE_BANDWIDTH_CONSTANT: "NA"}
 
+
+class PlatformUsageExtractor(KPIExtractor):
+    _COLUMNS = ["cpu_percent", "mem_percent",
+                "disk_read_bps", "disk_write_bps"]
+
+    # overriding abstract method
+    def extract_data(self, log_file_path):
+        if os.path.getsize(log_file_path) == 0:
+            return self.return_blank()
+
+        # one numeric csv record per sample written by collect_proc.py,
+        # read in a single vectorised pass instead of regex matching
+        print("parsing platform usage")
+        with log_io.open_log(log_file_path) as f:
+            df = pd.read_csv(f, usecols=self._COLUMNS)
+        df = df.apply(pd.to_numeric, errors='coerce').dropna()
+        if len(df) == 0:
+            return self.return_blank()
+
+        megabytes_to_bytes = 1000000
+        return {AVG_CPU_USAGE_CONSTANT: float(df["cpu_percent"].mean()),
+                AVG_MEM_USAGE_CONSTANT: float(df["mem_percent"].mean()),
+                AVG_DISK_READ_BANDWIDTH_CONSTANT:
+                    float(df["disk_read_bps"].mean()) / megabytes_to_bytes,
+                AVG_DISK_WRITE_BANDWIDTH_CONSTANT:
+                    float(df["disk_write_bps"].mean()) / megabytes_to_bytes}
+
+    def return_blank(self):
+        return {AVG_CPU_USAGE_CONSTANT: "NA", AVG_MEM_USAGE_CONSTANT: "NA",
+                AVG_DISK_READ_BANDWIDTH_CONSTANT: "NA",
+                AVG_DISK_WRITE_BANDWIDTH_CONSTANT: "NA"}
+
+
+class ThermalExtractor(KPIExtractor):
+    # overriding abstract method
+    def extract_data(self, log_file_path):
+        if os.path.getsize(log_file_path) == 0:
+            return self.return_blank()
+
+        print("parsing thermal throttling")
+        summary = thermal.throttle_summary(
+            thermal.read_thermal(log_file_path))
+        if summary is None:
+            return self.return_blank()
+        if summary["throttled"]:
+            print("WARN: the host throttled for {:.0f}s of the run".format(
+                summary["throttled_seconds"]))
+        thermal_kpi_dict = {
+            CPU_FREQUENCY_CONSTANT: summary["cpu_mhz_mean"] or "NA",
+            MIN_CPU_FREQUENCY_CONSTANT: summary["cpu_mhz_min"] or "NA",
+            TEMPERATURE_CONSTANT: summary["temp_c_max"] or "NA",
+            THROTTLED_SECONDS_CONSTANT: summary["throttled_seconds"],
+            THROTTLED_PERCENT_CONSTANT: summary["throttled_percent"] or 0.0,
+            # epochs like the steady window, so they can be cut out
+            # with --window
+            THROTTLE_INTERVALS_CONSTANT: " ".join(
+                "{:.0f}-{:.0f}".format(start, end)
+                for start, end in summary["intervals"]) or "-"}
+        for device, frequency in summary["gpu_mhz_mean"].items():
+            thermal_kpi_dict["GPU_{} {}".format(
+                device, timeline.GPU_FREQUENCY_SERIES)] = \
+                frequency if frequency is not None else "NA"
+        return thermal_kpi_dict
+
+    def return_blank(self):
+        return {CPU_FREQUENCY_CONSTANT: "NA", THROTTLED_SECONDS_CONSTANT: "NA"}
+
+
+class CgroupUsageExtractor(KPIExtractor):
+    # overriding abstract method
+    def extract_data(self, log_file_path):
+        print("parsing pipeline cgroup usage")
+        with log_io.open_log(log_file_path) as f:
+            summary = json.load(f)
+        collector_kpi_dict = self._collector_overhead(
+            summary.get("collector"))
+        if "cpu_seconds" not in summary:
+            blank = self.return_blank()
+            blank.update(collector_kpi_dict)
+            return blank
+
+        cpu_seconds_per_frame = summary.get("cpu_seconds_per_frame")
+        if cpu_seconds_per_frame is None:
+            # fixed pipeline runs do not know their fps when the usage
+            # is written, take it from the pipeline fps logs next to it
+            total_fps = self._total_fps(os.path.dirname(log_file_path))
+            if total_fps > 0:
+                cpu_seconds_per_frame = summary["cpu_seconds"] / (
+                    total_fps * summary["window_seconds"])
+        cgroup_kpi_dict = {
+            "Pipeline {}".format(CPU_SECONDS_PER_FRAME_CONSTANT):
+                cpu_seconds_per_frame
+                if cpu_seconds_per_frame is not None else "NA",
+            "Pipeline {}".format(STREAM_CPU_USAGE_CONSTANT):
+                summary["cpu_percent_per_stream"],
+            "Pipeline {}".format(STREAM_MEM_USAGE_CONSTANT):
+                summary["memory_per_stream_mb"]}
+        for key, percent in sorted(summary["pressure_percent"].items()):
+            resource, kind = key.split("_", 1)
+            cgroup_kpi_dict["Pipeline {} {} {}".format(
+                resource.upper(), kind, PRESSURE_CONSTANT)] = percent
+        for container in summary["containers"]:
+            container_key = "Container_{} {}"
+            cgroup_kpi_dict[container_key.format(
+                container["name"], AVG_CPU_USAGE_CONSTANT)] = \
+                container["cpu_percent"]
+            cgroup_kpi_dict[container_key.format(
+                container["name"], "Memory MB")] = \
+                container["memory_bytes"] / (1024 * 1024)
+        cgroup_kpi_dict.update(collector_kpi_dict)
+        return cgroup_kpi_dict
+
+    def _collector_overhead(self, collector):
+        # the metrics-collector container's own cost during the run
+        if not collector:
+            return {}
+        share = collector["cpu_share_percent"]
+        cpu_key = "Collector {}".format(AVG_CPU_USAGE_CONSTANT)
+        return {cpu_key: collector["cpu_percent"],
+                "Collector Memory MB": collector["memory_mb"],
+                "Collector CPU Share %": share if share is not None else "NA"}
+
+    def _total_fps(self, results_dir):
+        total_fps = 0
+        for pipeline_file in log_io.glob_logs(
+                os.path.join(results_dir, "pipeline*.log")):
+            fps_list = []
+            with log_io.open_log(pipeline_file) as f:
+                for line in f:
+                    try:
+                        fps_list.append(float(line))
+                    except ValueError:
+                        continue
+            if fps_list:
+                total_fps += mean(fps_list)
+        return total_fps
+
+    def return_blank(self):
+        return {"Pipeline {}".format(CPU_SECONDS_PER_FRAME_CONSTANT): "NA",
+                "Pipeline {}".format(STREAM_MEM_USAGE_CONSTANT): "NA"}
+
+
+class TrialsExtractor(KPIExtractor):
+    # overriding abstract method
+    def extract_data(self, log_file_path):
+        print("parsing repeated trials")
+        with open(log_file_path) as f:
+            summary = json.load(f)
+        confidence = "{:g}%".format(summary["confidence"] * 100)
+        half_width = summary["ci_half_width"]
+        relative_ci = summary["relative_ci"]
+        return {"{} Mean".format(TRIALS_FPS_CONSTANT): summary["mean"],
+                "{} CI {} +/-".format(TRIALS_FPS_CONSTANT, confidence):
+                    half_width if half_width is not None else "NA",
+                "{} CI {} +/- %".format(TRIALS_FPS_CONSTANT, confidence):
+                    relative_ci * 100 if relative_ci is not None else "NA",
+                "Trials": summary["trials"],
+                "Rejected Trials": len(summary["rejected"])}
+
+    def return_blank(self):
+        return {"{} Mean".format(TRIALS_FPS_CONSTANT): "NA",
+                "Trials": "NA",
+                "Rejected Trials": "NA"}
+
 class MemBandwidthExtractor(KPIExtractor):
     #overriding abstract method
     def extract_data(self, log_file_path):
@@ -331,7 +533,8 @@ class MemBandwidthExtractor(KPIExtractor):
 
         print("parsing memory bandwidth")
         socket_memory_bandwidth = {}
-        df = pd.read_csv(log_file_path, header=1, on_bad_lines='skip')
+        with log_io.open_log(log_file_path) as f:
+            df = pd.read_csv(f, header=1, on_bad_lines='skip')
         socket_count = 0
         for column in df.columns:
             if 'Memory (MB/s)' in column:
@@ -359,7 +562,7 @@ class PIPELINEFPSExtractor(KPIExtractor):
         camera_fps = {}
         cam = re.findall(r'\d+', os.path.basename(log_file_path))
         camera_key = "Camera_{} {}".format(cam[0], AVG_FPS_CONSTANT)
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             for line in f:
               average_fps_list.append(float(line))
 
@@ -383,7 +586,7 @@ class FPSExtractor(KPIExtractor):
         camera_fps = {}
         cam = re.findall(r'\d+', os.path.basename(log_file_path))
         camera_key = "Camera_{} {}".format(cam[0], AVG_FPS_CONSTANT)
-        with open(log_file_path) as f:
+        with log_io.open_log(log_file_path) as f:
             for line in f:
                 if self._FPS_KEYWORD in line:
                     average_fps_list.append(float((line.split(":"))[1].replace(",", "")))
@@ -427,23 +630,24 @@ class PIPELINLastModifiedExtractor(KPIExtractor):
         return {LAST_MODIFIED_LOG: "NA"}
 
 class PipelineLatencyExtractor(KPIExtractor):
+    def __init__(self):
+        # parsed tracer logs of every extracted file, kept for the
+        # element latency breakdown across all pipelines
+        self.tracer_logs = []
+
     #overriding abstract method
     def extract_data(self, log_file_path):
         
         print("parsing latency")
-        average_latency_value = ""
         latency = {}
         lat = re.findall(r'\d+', os.path.basename(log_file_path))
         lat_filename = lat[0] if len(lat) > 0 else "UNKNOWN"
         latency_key = "Pipeline_{} {}".format(lat_filename, PIPELINE_LATENCY_CONSTANT)
-        with open(log_file_path) as f:
-            for line in f:
-              if "latency_tracer_pipeline" in line:
-                match = re.search(r'avg=\(double\)([0-9]*\.?[0-9]+)', line)
-                if match:
-                    average_latency_value=match.group(1)
-        if len(average_latency_value) > 0:
-            latency[latency_key] = average_latency_value
+        tracer_log = gst_tracer_parser.parse_tracer_log(log_file_path)
+        self.tracer_logs.append(tracer_log)
+        if len(tracer_log.pipeline) > 0:
+            latency[latency_key] = \
+                gst_tracer_parser.last_average_latency(tracer_log)
         else:
             latency[latency_key] = "NA"
 
@@ -460,7 +664,8 @@ class PCMExtractor(KPIExtractor):
 
         socket_memory_and_power = {}
         print("parsing memory bandwidth")
-        df = pd.read_csv(log_file_path, header=1, on_bad_lines='skip')
+        with log_io.open_log(log_file_path) as f:
+            df = pd.read_csv(f, header=1, on_bad_lines='skip')
         socket_count = 0
         for column in df.columns:
             if 'READ' in column:
@@ -482,7 +687,8 @@ class PCMExtractor(KPIExtractor):
                 socket_count = socket_count + 1
 
         print("parsing power usage")
-        df = pd.read_csv(log_file_path, on_bad_lines='skip')
+        with log_io.open_log(log_file_path) as f:
+            df = pd.read_csv(f, on_bad_lines='skip')
         socket_power_usage = {}
         socket_count = 0
         for column in df.columns:
@@ -510,25 +716,205 @@ class PCMExtractor(KPIExtractor):
     def return_blank(self):
         return {AVG_POWER_USAGE_CONSTANT: "-", AVG_MEM_BANDWIDTH_CONSTANT: "-"}
 
+
+def element_latency_breakdown(tracer_logs):
+    '''
+    ranks the pipeline elements by their share of the element latency
+    aggregated across all pipelines
+    Args:
+        tracer_logs: parsed gst-launch tracer logs
+    Returns:
+        dict of KPI keys to values for the summary
+    '''
+    ranking = gst_tracer_parser.aggregate_element_latency(tracer_logs)
+    element_kpi_dict = {}
+    for rank, element in enumerate(ranking, start=1):
+        element_key = "Element {} {}".format(
+            element.name, PIPELINE_LATENCY_CONSTANT)
+        element_kpi_dict[element_key + " ms"] = element.mean_latency
+        element_kpi_dict[element_key + " Share %"] = element.share
+        element_kpi_dict[element_key + " Rank"] = rank
+    if ranking:
+        element_kpi_dict[LATENCY_BOTTLENECK_CONSTANT] = ranking[0].name
+    return element_kpi_dict
+
+
+def stream_stability_kpis(root_directory, target_fps=None):
+    '''
+    analyzes the stability of every pipeline fps log of a run together
+    Args:
+        root_directory: directory holding the pipeline logs
+        target_fps: optional target FPS for the time below target
+    Returns:
+        dict of KPI keys to values for the summary
+    '''
+    paths = natsorted(log_io.glob_logs(
+        os.path.join(root_directory, "pipeline*.log")))
+    if not paths:
+        return {}
+    print("parsing fps stability")
+    report = stream_stability.analyze_logs(paths, target_fps)
+    stability_kpi_dict = {}
+    for path, stream in zip(paths, report.streams()):
+        cam = re.findall(r'\d+', os.path.basename(path))
+        camera_key = "Camera_{}".format(cam[0] if cam else 0)
+        stability_kpi_dict["{} {}".format(camera_key, FPS_CV_CONSTANT)] = \
+            stream["cv"] if stream["cv"] is not None else "NA"
+        stability_kpi_dict["{} {}".format(
+            camera_key, LONGEST_STALL_CONSTANT)] = \
+            stream["longest_stall_seconds"]
+        if target_fps:
+            below_target = stream["below_target_percent"]
+            stability_kpi_dict["{} {}".format(
+                camera_key, BELOW_TARGET_CONSTANT)] = \
+                below_target if below_target is not None else "NA"
+        stability_kpi_dict["{} {}".format(camera_key, WARMUP_CONSTANT)] = \
+            stream["warmup_seconds"]
+    stability_kpi_dict[UNSTABLE_STREAMS_CONSTANT] = \
+        int(report.unstable().sum())
+    return stability_kpi_dict
+
+
+def steady_window_kpis(metric_timeline, window, kpi_dict):
+    '''
+    recomputes the KPIs that have a timeline over the steady window only
+    Args:
+        metric_timeline: series loaded by timeline.load_timeline
+        window: (start, end) epochs of the steady window
+        kpi_dict: the whole-run KPIs, only these keys are overridden
+    Returns:
+        dict of windowed KPI keys to values for the summary
+    '''
+    start, end = window
+    window_kpi_dict = {}
+    window_means = timeline.window_means(metric_timeline, start, end)
+    for name, value in window_means.items():
+        # timeline names the GPU series after the raw igt columns
+        gpu_series = re.match(r'(GPU_\d+) (.+)$', name)
+        if gpu_series and gpu_series.group(2) in GPUUsageExtractor._DESC_MAP:
+            name = "{} {}".format(
+                gpu_series.group(1),
+                GPUUsageExtractor._DESC_MAP[gpu_series.group(2)])
+        if name in kpi_dict:
+            window_kpi_dict[name] = value
+    if window_kpi_dict:
+        window_kpi_dict[WINDOW_START_CONSTANT] = start
+        window_kpi_dict[WINDOW_END_CONSTANT] = end
+        window_kpi_dict[WINDOW_DURATION_CONSTANT] = end - start
+    return window_kpi_dict
+
+
 KPIExtractor_OPTION = {"meta_summary.txt":MetaExtractor,
                        "camera":FPSExtractor,
                        "pipeline":PIPELINEFPSExtractor,
-                       r"(?:^r).*\.jsonl$": PIPELINLastModifiedExtractor,
+                       r"(?:^r).*\.jsonl(?:\.gz|\.zst)?$":
+                           PIPELINLastModifiedExtractor,
                        "gst-launch":PipelineLatencyExtractor,
                        "cpu_usage.log":CPUUsageExtractor,
+                       "platform_usage.csv": PlatformUsageExtractor,
+                       thermal.THERMAL_FILE_PATTERN: ThermalExtractor,
+                       cgroup_stats.CGROUP_USAGE_FILE: CgroupUsageExtractor,
+                       trials.TRIALS_FILE: TrialsExtractor,
                        "npu_usage.csv":NPUUsageExtractor,
                        "memory_usage.log":MemUsageExtractor, 
                        "memory_bandwidth.csv":MemBandwidthExtractor,
                        "disk_bandwidth.log":DiskBandwidthExtractor,
                        "power_usage.log":PowerUsageExtractor,
                        "pcm.csv":PCMExtractor,
-                       r"(?:^xpum).*\.json$": XPUMUsageExtractor,
-                       r"(?:^igt).*\.json$": GPUUsageExtractor, }
+                       r"(?:^xpum).*\.json(?:\.gz|\.zst)?$":
+                           XPUMUsageExtractor,
+                       r"(?:^igt).*\.json(?:\.gz|\.zst)?$":
+                           GPUUsageExtractor, }
+
+
+def extract_kpis(directory, target_fps=None):
+    '''
+    runs every KPI extractor on the logs of a directory, leaving out the
+    stream density iteration directories below it
+    Args:
+        directory: directory holding the logs
+        target_fps: optional target FPS for the stream stability
+    Returns:
+        dict of KPI keys to values for the summary
+    '''
+    kpi_dicts = {}
+    tracer_logs = []
+    for kpiExtractor in KPIExtractor_OPTION:
+        for dirpath, dirname, filename in os.walk(directory):
+            # stream density iterations keep their own logs and manifest
+            dirname[:] = [d for d in dirname
+                          if not d.startswith(ITERATION_DIR_PREFIX)]
+            for file in filename:
+                if re.search(kpiExtractor, file):
+                    extractor = KPIExtractor_OPTION.get(kpiExtractor)()
+                    kpi_dict = extractor.extract_data(
+                        os.path.join(directory, file))
+                    if kpi_dict:
+                        kpi_dicts.update(kpi_dict)
+                    if isinstance(extractor, PipelineLatencyExtractor):
+                        tracer_logs.extend(extractor.tracer_logs)
+
+    kpi_dicts.update(element_latency_breakdown(tracer_logs))
+    kpi_dicts.update(stream_stability_kpis(directory, target_fps))
+    return kpi_dicts
+
+
+def density_iterations(root_directory):
+    '''
+    picks the stream density iteration with the most pipelines that met
+    the target FPS for every container, its pipeline logs stand for the
+    run in the summary
+    Returns:
+        list of (iteration directory, manifest)
+    '''
+    best = {}
+    for manifest in stream_density.load_density_trace(root_directory):
+        name = manifest.get("container_name", "")
+        if manifest.get("meets_target_fps") and (
+                name not in best or
+                manifest["num_pipelines"] > best[name]["num_pipelines"]):
+            best[name] = manifest
+    return [(stream_density.iteration_dir_path(
+                root_directory, name, manifest["iteration"]), manifest)
+            for name, manifest in sorted(best.items())]
+
+
+def consolidate(root_directory, target_fps=None):
+    '''
+    extracts the KPIs of a run, for a stream density run those of the
+    logs of its chosen iterations too
+    Args:
+        root_directory: results directory of the run
+        target_fps: optional target FPS for the stream stability,
+                    the target of the density iteration by default
+    Returns:
+        dict of KPI keys to values for the summary
+    '''
+    full_kpi_dict = extract_kpis(root_directory, target_fps)
+    for iteration_dir, manifest in density_iterations(root_directory):
+        print("consolidating the density iteration {}".format(
+            os.path.basename(iteration_dir)))
+        full_kpi_dict.update(extract_kpis(
+            iteration_dir, target_fps or manifest.get("target_fps")))
+    return full_kpi_dict
+
 
 def add_parser():
     parser = argparse.ArgumentParser(description='Consolidate data')
     parser.add_argument('--root_directory', nargs=1, help='Root directory that consists all log directory that store log file', required=True)
     parser.add_argument('--output', nargs=1, help='Output file to store consolidate data', required=True)
+    parser.add_argument('--target_fps', nargs=1, type=float,
+                        help='target FPS of every stream for the share ' +
+                        'of time below it')
+    window_group = parser.add_mutually_exclusive_group()
+    window_group.add_argument('--window', nargs=1,
+                              help='start,end seconds from the first sample '
+                              '(or epochs) to average the timeline KPIs '
+                              'over, e.g. 60,300 or 60, for the rest of '
+                              'the run')
+    window_group.add_argument('--auto-window', action='store_true',
+                              help='average the timeline KPIs over the '
+                              'detected steady FPS plateau only')
     return parser
 
 if __name__ == '__main__':
@@ -538,23 +924,45 @@ if __name__ == '__main__':
     root_directory = args['root_directory'][0]
     output = args['output'][0]
 
-    n = 0
-    df = pd.DataFrame()
-    full_kpi_dict = {}
-    for kpiExtractor in KPIExtractor_OPTION:
-        fileFound = False
-        for dirpath, dirname, filename in os.walk(root_directory):
-            for file in filename:
-                if re.search(kpiExtractor, file):
-                    fileFound = True
-                    extractor = KPIExtractor_OPTION.get(kpiExtractor)()
-                    kpi_dict = extractor.extract_data(
-                        os.path.join(root_directory, file))
-                    if kpi_dict:
-                        full_kpi_dict.update(kpi_dict)
+    full_kpi_dict = consolidate(
+        root_directory, args['target_fps'][0] if args['target_fps'] else None)
+
+    # all metric samples resampled onto one common epoch grid
+    metric_timeline = timeline.load_timeline(root_directory)
+    grid, columns = timeline.resample(metric_timeline)
+    window = None
+    if args['window']:
+        window = timeline.parse_window(
+            args['window'][0], grid[0] if len(grid) else 0.0)
+    elif args['auto_window']:
+        window = timeline.detect_plateau(grid, columns)
+        if window is None:
+            print("WARN: no steady FPS plateau found, "
+                  "averaging the whole run")
+    if window:
+        print("averaging over the steady window {} - {}".format(*window))
+        full_kpi_dict.update(
+            steady_window_kpis(metric_timeline, window, full_kpi_dict))
+    # energy per frame over the steady window when there is one
+    energy_grid, energy_columns = (
+        timeline.trim(grid, columns, *window) if window else (grid, columns))
+    full_kpi_dict.update(timeline.energy_kpis(energy_grid, energy_columns))
 
     # Write out summary csv file from dictionary
     with open(output, 'w') as csv_file:
         writer = csv.writer(csv_file)
         for key, value in full_kpi_dict.items():
             writer.writerow([key, value])
+
+    if columns:
+        output_directory = os.path.dirname(os.path.abspath(output))
+        timeline_path = timeline.write_timeline(
+            os.path.join(output_directory, timeline.TIMELINE_FILE),
+            grid, columns)
+        print("wrote metrics timeline to {}".format(timeline_path))
+        if window:
+            # the steady samples alone, a fraction of the raw logs to re-read
+            window_path = timeline.write_timeline(
+                os.path.join(output_directory, timeline.WINDOW_FILE),
+                *timeline.trim(grid, columns, *window))
+            print("wrote steady window timeline to {}".format(window_path))
@@ -0,0 +1,283 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+import stream_density
+
+# simulated seconds of pipeline logs written for every iteration
+DEFAULT_SIMULATED_DURATION = 120
+SIMULATED_ELEMENTS = (("decode", 0.3), ("detect", 0.6), ("sink", 0.1))
+
+
+@dataclass
+class ThroughputModel:
+    '''
+    the throughput of a device running num_pipelines streams
+
+    Every stream asks for stream_fps frames per second. The device
+    delivers up to capacity frames per second in total, less the
+    contention loss of every added stream, shared by the streams.
+    Straggler streams get straggler_factor of the fair share. Samples
+    ramp up with the warm-up time constant and carry gaussian noise of
+    noise times their fps.
+    '''
+    capacity: float = 240.0
+    stream_fps: float = 30.0
+    contention: float = 0.02
+    noise: float = 0.02
+    warmup_seconds: float = 5.0
+    stragglers: float = 0.0
+    straggler_factor: float = 0.7
+    base_latency: float = 30.0
+    # pipelines above this count fail to start and write no logs
+    max_pipelines: int = 0
+    seed: int = 1
+
+    def effective_capacity(self, num_pipelines):
+        return self.capacity / (1.0 + self.contention *
+                                max(0, num_pipelines - 1))
+
+    def stream_rates(self, num_pipelines):
+        '''
+        returns the steady fps of every stream
+        '''
+        share = min(self.stream_fps,
+                    self.effective_capacity(num_pipelines) / num_pipelines)
+        stragglers = int(num_pipelines * self.stragglers + 0.5)
+        return [share * (self.straggler_factor
+                         if stream >= num_pipelines - stragglers else 1.0)
+                for stream in range(num_pipelines)]
+
+    def latency(self, num_pipelines):
+        '''
+        returns the steady frame latency in ms, growing with the load
+        beyond the capacity
+        '''
+        load = (num_pipelines * self.stream_fps /
+                self.effective_capacity(num_pipelines))
+        return self.base_latency * max(1.0, load)
+
+    def max_density(self, target_fps, limit=1024):
+        '''
+        returns the largest pipeline count whose noise free mean fps per
+        stream meets target_fps, 0 when a single stream misses it
+        '''
+        best = 0
+        for num_pipelines in range(1, limit + 1):
+            if (self.max_pipelines
+                    and num_pipelines > self.max_pipelines):
+                break
+            rates = self.stream_rates(num_pipelines)
+            if sum(rates) / num_pipelines >= target_fps:
+                best = num_pipelines
+        return best
+
+
+def _tracer_line(seconds, record):
+    return ("%d:%02d:%02d.%09d  10 0x55 TRACE GST_TRACER :0:: %s;\n" % (
+        seconds // 3600, seconds // 60 % 60, seconds % 60, 0, record))
+
+
+class DensitySimulator:
+    '''
+    stands in for benchmark.docker_compose_containers: "up" writes the
+    pipeline and gst-launch logs the model predicts for PIPELINE_COUNT
+    streams into RESULTS_DIR instead of starting containers, so a
+    stream density search runs in seconds without Docker
+    Args:
+        model: the ThroughputModel of the simulated device
+        duration: simulated seconds of logs per iteration
+    '''
+    def __init__(self, model=None, duration=DEFAULT_SIMULATED_DURATION):
+        self.model = model or ThroughputModel()
+        self.duration = max(1, int(duration))
+        self.rng = random.Random(self.model.seed)
+        self.calls = []
+        self._sequence = 0
+
+    def __call__(self, command, compose_files=[], compose_pre_args="",
+                 compose_post_args="", env_vars=None):
+        env_vars = env_vars or {}
+        num_pipelines = int(env_vars.get("PIPELINE_COUNT") or 1)
+        self.calls.append((command, num_pipelines))
+        if command == "up":
+            self.write_logs(
+                env_vars[stream_density.RESULTS_DIR_KEY], num_pipelines,
+                env_vars.get(stream_density.CONTAINER_NAME_KEY, ""))
+        return "", "", 0
+
+    def write_logs(self, results_dir, num_pipelines, container_name):
+        '''
+        writes one fps sample and one latency tracer frame per simulated
+        second for every stream
+        '''
+        model = self.model
+        if model.max_pipelines and num_pipelines > model.max_pipelines:
+            return
+        os.makedirs(results_dir, exist_ok=True)
+        latency = model.latency(num_pipelines)
+        suffix = f"_{container_name}" if container_name else ""
+        for rate in model.stream_rates(num_pipelines):
+            self._sequence += 1
+            timestamp = "%d%06d" % (time.time_ns() // 1000, self._sequence)
+            fps_path = os.path.join(
+                results_dir, f"pipeline{timestamp}{suffix}.log")
+            tracer_path = os.path.join(
+                results_dir, f"gst-launch_{timestamp}{suffix}.log")
+            average = 0.0
+            with open(fps_path, 'w') as fps_log, \
+                    open(tracer_path, 'w') as tracer_log:
+                for second in range(1, self.duration + 1):
+                    ramp = (1.0 - math.exp(-second / model.warmup_seconds)
+                            if model.warmup_seconds > 0 else 1.0)
+                    fps = max(0.0, rate * ramp *
+                              (1.0 + self.rng.gauss(0.0, model.noise)))
+                    fps_log.write("%.2f\n" % fps)
+                    frame_latency = max(0.1, latency * (
+                        1.0 + self.rng.gauss(0.0, model.noise)))
+                    average += (frame_latency - average) / second
+                    for name, share in SIMULATED_ELEMENTS:
+                        tracer_log.write(_tracer_line(second, (
+                            "latency_tracer_element, name=(string)%s, "
+                            "frame_latency=(double)%f, avg=(double)%f, "
+                            "min=(double)%f, max=(double)%f, "
+                            "frame_num=(uint)%d, is_bin=(boolean)0") % (
+                                name, frame_latency * share,
+                                frame_latency * share, frame_latency * share,
+                                frame_latency * share, second)))
+                    tracer_log.write(_tracer_line(second, (
+                        "latency_tracer_pipeline, frame_latency=(double)%f, "
+                        "avg=(double)%f, min=(double)%f, max=(double)%f, "
+                        "latency=(double)%f, fps=(double)%f, "
+                        "frame_num=(uint)%d") % (
+                            frame_latency, average, frame_latency,
+                            frame_latency, frame_latency, fps, second)))
+
+
+def simulate_stream_density(model, target_fps_list, container_names,
+                            results_dir, increment=None,
+                            duration=DEFAULT_SIMULATED_DURATION):
+    '''
+    runs the stream density search against a simulated device
+    Args:
+        model: the ThroughputModel of the simulated device
+        target_fps_list: list of target FPS values
+        container_names: the container name of every target FPS
+        results_dir: directory for the simulated logs and results
+        increment: optional fixed PIPELINE_INC of the search
+        duration: simulated seconds of logs per iteration
+    Returns:
+        (list of stream_density.StreamDensityResult, DensitySimulator)
+    '''
+    simulator = DensitySimulator(model, duration)
+    env_vars = {
+        stream_density.RESULTS_DIR_KEY: results_dir,
+        # the logs are complete once written, nothing to wait for
+        stream_density.INIT_DURATION_KEY: "0",
+        stream_density.TEARDOWN_DURATION_KEY: "0",
+        # pipelines beyond max_pipelines never write their logs
+        stream_density.LOG_WAIT_DURATION_KEY: "1",
+    }
+    if increment:
+        env_vars[stream_density.PIPELINE_INCR_KEY] = str(increment)
+    results = stream_density.StreamDensity(
+        env_vars, [], compose=simulator).run(target_fps_list,
+                                             container_names)
+    return results, simulator
+
+
+def parse_args(args=None):
+    defaults = ThroughputModel()
+    parser = argparse.ArgumentParser(
+        prog='density_simulator',
+        description='runs the stream density search against a simulated '
+                    'device instead of docker compose')
+    parser.add_argument('--target_fps', '--target-fps', type=float,
+                        nargs='+', default=[stream_density.DEFAULT_TARGET_FPS],
+                        help='stream density target FPS values')
+    parser.add_argument('--container_names', '--container-names', nargs='+',
+                        default=None,
+                        help='container name of every target FPS')
+    parser.add_argument('--density_increment', '--density-increment',
+                        type=int, default=None,
+                        help='fixed pipeline increment of the search')
+    parser.add_argument('--results_dir', '--results-dir', default=None,
+                        help='keeps the simulated logs in this directory')
+    parser.add_argument('--duration', type=int,
+                        default=DEFAULT_SIMULATED_DURATION,
+                        help='simulated seconds of logs per iteration')
+    parser.add_argument('--capacity', type=float, default=defaults.capacity,
+                        help='total fps of the device')
+    parser.add_argument('--stream_fps', '--stream-fps', type=float,
+                        default=defaults.stream_fps,
+                        help='fps every stream asks for')
+    parser.add_argument('--contention', type=float,
+                        default=defaults.contention,
+                        help='capacity loss per added stream')
+    parser.add_argument('--noise', type=float, default=defaults.noise,
+                        help='relative standard deviation of the samples')
+    parser.add_argument('--warmup', type=float,
+                        default=defaults.warmup_seconds,
+                        help='warm-up time constant in seconds')
+    parser.add_argument('--stragglers', type=float,
+                        default=defaults.stragglers,
+                        help='fraction of streams running slower')
+    parser.add_argument('--straggler_factor', '--straggler-factor',
+                        type=float, default=defaults.straggler_factor,
+                        help='fraction of the fair share stragglers get')
+    parser.add_argument('--max_pipelines', '--max-pipelines', type=int,
+                        default=defaults.max_pipelines,
+                        help='pipelines above this count fail to start')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    container_names = args.container_names or [
+        f"sim{index}" for index in range(len(args.target_fps))]
+    if len(container_names) != len(args.target_fps):
+        print("ERROR: expected one container name per target FPS")
+        return 2
+    model = ThroughputModel(
+        capacity=args.capacity, stream_fps=args.stream_fps,
+        contention=args.contention, noise=args.noise,
+        warmup_seconds=args.warmup, stragglers=args.stragglers,
+        straggler_factor=args.straggler_factor,
+        max_pipelines=args.max_pipelines, seed=args.seed)
+    results_dir = args.results_dir or tempfile.mkdtemp(
+        prefix="density_simulator_")
+    os.makedirs(results_dir, exist_ok=True)
+    start = time.perf_counter()
+    try:
+        results, simulator = simulate_stream_density(
+            model, args.target_fps, container_names, results_dir,
+            args.density_increment, args.duration)
+    finally:
+        if not args.results_dir:
+            shutil.rmtree(results_dir)
+    elapsed = time.perf_counter() - start
+    print("target fps,container,found,expected,met,iterations")
+    for result in results:
+        print(f"{result.target_fps},{result.container_name},"
+              f"{result.num_pipelines},"
+              f"{model.max_density(result.target_fps)},"
+              f"{result.meets_target_fps},{len(result.iterations)}")
+    iterations = sum(1 for command, _ in simulator.calls if command == "up")
+    print(f"simulated {iterations} iteration(s) in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
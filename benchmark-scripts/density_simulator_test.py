@@ -0,0 +1,107 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import consolidate_multiple_run_of_metrics as consolidate
+import density_simulator
+import stream_density
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_throughput_model(self):
+        model = density_simulator.ThroughputModel(
+            capacity=100.0, stream_fps=30.0, contention=0.0,
+            stragglers=0.25, straggler_factor=0.5)
+        self.assertEqual(model.stream_rates(2), [30.0, 15.0])
+        self.assertEqual(model.stream_rates(4), [25.0, 25.0, 25.0, 12.5])
+        self.assertEqual(model.latency(2), model.base_latency)
+        self.assertGreater(model.latency(8), model.base_latency)
+        self.assertEqual(density_simulator.ThroughputModel(
+            capacity=100.0, contention=0.0).max_density(20.0), 5)
+        self.assertEqual(density_simulator.ThroughputModel(
+            capacity=100.0, contention=0.0, max_pipelines=3
+        ).max_density(20.0), 3)
+
+    def test_simulator_logs(self):
+        simulator = density_simulator.DensitySimulator(
+            density_simulator.ThroughputModel(noise=0.0, warmup_seconds=0),
+            duration=30)
+        simulator("up", env_vars={
+            stream_density.RESULTS_DIR_KEY: self.test_dir,
+            stream_density.CONTAINER_NAME_KEY: "sim",
+            "PIPELINE_COUNT": "2"})
+        self.assertEqual(simulator.calls, [("up", 2)])
+        total_fps, fps_per_stream = stream_density.calculate_total_fps(
+            2, self.test_dir, "sim")
+        self.assertAlmostEqual(total_fps, 60.0)
+        tracer_logs = stream_density.parse_latest_tracer_logs(
+            2, self.test_dir, "sim")
+        self.assertEqual(len(tracer_logs), 2)
+        self.assertEqual(len(tracer_logs[0].pipeline), 30)
+        self.assertEqual(sorted(tracer_logs[0].elements),
+                         ["decode", "detect", "sink"])
+
+    @mock.patch('cgroup_stats.running_containers', return_value=[])
+    def test_simulate_stream_density(self, mock_containers):
+        model = density_simulator.ThroughputModel(noise=0.0)
+        results, simulator = density_simulator.simulate_stream_density(
+            model, [14.95], ["sim"], self.test_dir, duration=30)
+        self.assertEqual(results[0].num_pipelines, model.max_density(14.95))
+        self.assertTrue(results[0].meets_target_fps)
+        self.assertEqual(simulator.calls[-1][0], "down")
+        self.assertEqual(len(results[0].iterations),
+                         sum(1 for call in simulator.calls
+                             if call[0] == "up"))
+
+    @mock.patch('cgroup_stats.running_containers', return_value=[])
+    def test_consolidate_density_run(self, mock_containers):
+        model = density_simulator.ThroughputModel(noise=0.0)
+        results, _ = density_simulator.simulate_stream_density(
+            model, [14.95], ["sim"], self.test_dir, duration=30)
+        iterations = consolidate.density_iterations(self.test_dir)
+        self.assertEqual(len(iterations), 1)
+        self.assertEqual(iterations[0][1]["num_pipelines"],
+                         results[0].num_pipelines)
+        kpis = consolidate.consolidate(self.test_dir)
+        keys = " ".join(kpis)
+        # one set of stream KPIs per pipeline of the chosen iteration
+        for suffix in (consolidate.AVG_FPS_CONSTANT,
+                       consolidate.PIPELINE_LATENCY_CONSTANT,
+                       consolidate.FPS_CV_CONSTANT):
+            with self.subTest(suffix=suffix):
+                self.assertEqual(
+                    sum(1 for key in kpis if key.endswith(" " + suffix)),
+                    results[0].num_pipelines)
+        self.assertIn("Element detect", keys)
+        self.assertEqual(kpis[consolidate.UNSTABLE_STREAMS_CONSTANT], 0)
+
+    @mock.patch('cgroup_stats.running_containers', return_value=[])
+    @mock.patch('time.sleep', return_value=None)
+    def test_simulate_failing_pipelines(self, mock_sleep, mock_containers):
+        model = density_simulator.ThroughputModel(noise=0.0, max_pipelines=4)
+        results, _ = density_simulator.simulate_stream_density(
+            model, [14.95], ["sim"], self.test_dir, increment=3,
+            duration=30)
+        self.assertFalse(results[0].meets_target_fps)
+        self.assertEqual(results[0].num_pipelines, 4)
+        self.assertIn("error", results[0].iterations[-1])
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.test_dir, 'stream_density.log')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,301 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+from array import array
+from dataclasses import dataclass, field
+import re
+
+import numpy as np
+
+import log_io
+
+# record names emitted by the DL Streamer latency_tracer
+PIPELINE_RECORD = "latency_tracer_pipeline"
+ELEMENT_RECORD = "latency_tracer_element"
+
+PIPELINE_FIELDS = ("frame_latency", "avg", "min", "max", "latency", "fps")
+ELEMENT_FIELDS = ("frame_latency", "avg", "min", "max")
+
+# the record name is followed directly by a comma, this keeps the
+# *_interval and *.class records out of the match
+_PIPELINE_MARKER = PIPELINE_RECORD + ","
+_ELEMENT_MARKER = ELEMENT_RECORD + ","
+# key=(type)value where value may be a quoted GstStructure string
+_FIELD_PATTERN = re.compile(
+    r'(\w+)=\((\w+)\)("(?:[^"\\]|\\.)*"|[^,;]*)')
+# GST debug timestamp at the start of the line, e.g. 0:00:34.139213682
+_TIMESTAMP_PATTERN = re.compile(r'(\d+):(\d\d):(\d\d)\.(\d+)')
+
+
+@dataclass
+class PipelineTrace:
+    '''
+    per-frame latency_tracer_pipeline samples of one gst-launch log,
+    all arrays share the same length and order
+    '''
+    timestamp: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    frame_latency: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    avg: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    min: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    max: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    latency: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    fps: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    frame_num: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.uint32))
+
+    def __len__(self):
+        return len(self.frame_num)
+
+
+@dataclass
+class ElementTrace:
+    '''
+    per-frame latency_tracer_element samples for a single element
+    '''
+    name: str
+    is_bin: bool = False
+    timestamp: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    frame_latency: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    avg: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    min: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    max: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.float64))
+    frame_num: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.uint32))
+
+    def __len__(self):
+        return len(self.frame_num)
+
+
+@dataclass
+class TracerLog:
+    '''
+    all latency tracer records decoded from one gst-launch log
+    '''
+    path: str
+    pipeline: PipelineTrace
+    elements: dict
+
+
+class _Columns:
+    '''
+    growable typed columns used while scanning a log, converted
+    to numpy arrays once the scan is done
+    '''
+    def __init__(self, value_fields):
+        self.value_fields = value_fields
+        self.timestamp = array('d')
+        self.values = {name: array('d') for name in value_fields}
+        self.frame_num = array('I')
+        self.is_bin = False
+
+    def append(self, timestamp, fields):
+        # look up every field first so a missing one leaves no partial row
+        values = [fields[name] for name in self.value_fields]
+        frame_num = fields["frame_num"]
+        self.timestamp.append(timestamp)
+        for name, value in zip(self.value_fields, values):
+            self.values[name].append(value)
+        self.frame_num.append(frame_num)
+
+    def to_arrays(self):
+        arrays = {name: np.frombuffer(values, dtype=np.float64).copy()
+                  for name, values in self.values.items()}
+        arrays["timestamp"] = np.frombuffer(
+            self.timestamp, dtype=np.float64).copy()
+        arrays["frame_num"] = np.frombuffer(
+            self.frame_num, dtype=np.uint32).copy()
+        return arrays
+
+
+def parse_timestamp(line):
+    '''
+    converts the GST debug timestamp at the start of a log line to seconds
+    Args:
+        line: a single gst-launch log line
+    Returns:
+        seconds since the pipeline started, or nan if there is no timestamp
+    '''
+    match = _TIMESTAMP_PATTERN.match(line)
+    if not match:
+        return float("nan")
+    hours, minutes, seconds, fraction = match.groups()
+    return (int(hours) * 3600 + int(minutes) * 60 + int(seconds) +
+            float("0." + fraction))
+
+
+def parse_record(line):
+    '''
+    decodes the GstStructure fields of a latency tracer record line
+    Args:
+        line: a single gst-launch log line
+    Returns:
+        (record_name, fields) where fields maps the field names to typed
+        values, or None if the line is not a pipeline or element record
+    '''
+    if _PIPELINE_MARKER in line:
+        record_name = PIPELINE_RECORD
+        start = line.index(_PIPELINE_MARKER) + len(_PIPELINE_MARKER)
+    elif _ELEMENT_MARKER in line:
+        record_name = ELEMENT_RECORD
+        start = line.index(_ELEMENT_MARKER) + len(_ELEMENT_MARKER)
+    else:
+        return None
+
+    fields = {}
+    try:
+        for key, value_type, value in _FIELD_PATTERN.findall(line, start):
+            if value_type == "double":
+                fields[key] = float(value)
+            elif value_type in ("uint", "int"):
+                fields[key] = int(value)
+            elif value_type == "boolean":
+                fields[key] = value.lower() in ("1", "true")
+            else:
+                if value.startswith('"'):
+                    value = value[1:-1].replace('\\', '')
+                fields[key] = value
+    except ValueError:
+        # the format-string lines carry %lf/%u placeholders, not values
+        return None
+    if "frame_num" not in fields:
+        return None
+    return record_name, fields
+
+
+def parse_tracer_lines(lines, path=""):
+    '''
+    decodes latency tracer records from an iterable of log lines
+    Args:
+        lines: iterable of gst-launch log lines
+        path: optional name of the source, kept on the result
+    Returns:
+        TracerLog with the pipeline trace and a dict of element traces
+        keyed by element name
+    '''
+    pipeline_columns = _Columns(PIPELINE_FIELDS)
+    element_columns = {}
+    for line in lines:
+        # cheap substring test before any regex work
+        if "latency_tracer_" not in line:
+            continue
+        record = parse_record(line)
+        if record is None:
+            continue
+        record_name, fields = record
+        try:
+            if record_name == PIPELINE_RECORD:
+                pipeline_columns.append(parse_timestamp(line), fields)
+            else:
+                name = fields["name"]
+                columns = element_columns.get(name)
+                if columns is None:
+                    columns = _Columns(ELEMENT_FIELDS)
+                    element_columns[name] = columns
+                columns.is_bin = bool(fields.get("is_bin", False))
+                columns.append(parse_timestamp(line), fields)
+        except KeyError:
+            # incomplete record, e.g. a truncated last line
+            continue
+
+    elements = {
+        name: ElementTrace(name=name, is_bin=columns.is_bin,
+                           **columns.to_arrays())
+        for name, columns in element_columns.items()}
+    return TracerLog(path=path,
+                     pipeline=PipelineTrace(**pipeline_columns.to_arrays()),
+                     elements=elements)
+
+
+def parse_tracer_log(log_file_path):
+    '''
+    decodes all latency tracer records in a gst-launch log file
+    Args:
+        log_file_path: path to the gst-launch log file, plain or compressed
+    Returns:
+        TracerLog for the file
+    '''
+    with log_io.open_log(log_file_path) as f:
+        return parse_tracer_lines(f, log_file_path)
+
+
+def last_average_latency(tracer_log):
+    '''
+    returns the running average pipeline latency of the last frame
+    Args:
+        tracer_log: TracerLog parsed from a gst-launch log
+    Returns:
+        the average latency in ms or 0.0 if there are no pipeline records
+    '''
+    if len(tracer_log.pipeline) == 0:
+        return 0.0
+    return float(tracer_log.pipeline.avg[-1])
+
+
+@dataclass
+class ElementLatency:
+    '''
+    latency of one element aggregated across pipelines
+    '''
+    name: str
+    mean_latency: float
+    max_latency: float
+    frames: int
+    share: float = 0.0
+
+
+def aggregate_element_latency(tracer_logs, include_bins=False):
+    '''
+    aggregates per-element frame latency across all given pipelines and
+    ranks the elements by their share of the summed element latency
+    Args:
+        tracer_logs: iterable of TracerLog, typically one per pipeline
+        include_bins: whether bin elements are ranked as well; bins
+                      contain other elements so they are left out by
+                      default to avoid counting the same time twice
+    Returns:
+        list of ElementLatency sorted by share in descending order
+    '''
+    latencies = {}
+    bins = set()
+    for tracer_log in tracer_logs:
+        for name, element in tracer_log.elements.items():
+            if len(element) == 0:
+                continue
+            latencies.setdefault(name, []).append(element.frame_latency)
+            if element.is_bin:
+                bins.add(name)
+
+    if not include_bins and len(bins) < len(latencies):
+        latencies = {name: samples for name, samples in latencies.items()
+                     if name not in bins}
+
+    ranking = []
+    for name, samples in latencies.items():
+        frame_latency = np.concatenate(samples)
+        ranking.append(ElementLatency(
+            name=name,
+            mean_latency=float(frame_latency.mean()),
+            max_latency=float(frame_latency.max()),
+            frames=len(frame_latency)))
+
+    total_latency = sum(element.mean_latency for element in ranking)
+    for element in ranking:
+        if total_latency > 0:
+            element.share = element.mean_latency / total_latency * 100
+    ranking.sort(key=lambda element: element.share, reverse=True)
+    return ranking
@@ -0,0 +1,106 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import gst_tracer_parser
+
+ELEMENT_LINES = [
+    "0:00:05.000000000  10 0x55 TRACE GST_TRACER :0:: "
+    "latency_tracer_element, name=(string)decode0, "
+    "frame_latency=(double)4.000000, avg=(double)4.000000, "
+    "min=(double)4.000000, max=(double)4.000000, "
+    "frame_num=(uint)1, is_bin=(boolean)0;\n",
+    "0:00:05.100000000  10 0x55 TRACE GST_TRACER :0:: "
+    "latency_tracer_element, name=(string)detection, "
+    "frame_latency=(double)20.000000, avg=(double)20.000000, "
+    "min=(double)20.000000, max=(double)20.000000, "
+    "frame_num=(uint)1, is_bin=(boolean)1;\n",
+    "0:00:05.200000000  10 0x55 TRACE GST_TRACER :0:: "
+    "latency_tracer_element, name=(string)decode0, "
+    "frame_latency=(double)6.000000, avg=(double)5.000000, "
+    "min=(double)4.000000, max=(double)6.000000, "
+    "frame_num=(uint)2, is_bin=(boolean)0;\n",
+]
+
+
+class Testing(unittest.TestCase):
+
+    def test_parse_tracer_log_pipeline_records(self):
+        log_file = os.path.join(
+            './test_stream_density_results',
+            'gst-launch_20240405141713198120407_gst.log')
+        tracer_log = gst_tracer_parser.parse_tracer_log(log_file)
+        pipeline = tracer_log.pipeline
+        # the format string and interval records must not be decoded
+        self.assertEqual(len(pipeline), 883)
+        self.assertEqual(pipeline.frame_num.dtype, np.uint32)
+        self.assertEqual(pipeline.fps.dtype, np.float64)
+        self.assertEqual(int(pipeline.frame_num[0]), 1)
+        self.assertEqual(int(pipeline.frame_num[-1]), 883)
+        self.assertAlmostEqual(float(pipeline.fps[-1]), 28.296039)
+        self.assertAlmostEqual(float(pipeline.timestamp[0]), 5.650520443)
+        self.assertAlmostEqual(
+            gst_tracer_parser.last_average_latency(tracer_log), 1760.57762)
+        self.assertEqual(tracer_log.elements, {})
+
+    def test_parse_tracer_lines_element_records(self):
+        tracer_log = gst_tracer_parser.parse_tracer_lines(ELEMENT_LINES)
+        self.assertEqual(len(tracer_log.pipeline), 0)
+        self.assertEqual(
+            sorted(tracer_log.elements.keys()), ['decode0', 'detection'])
+        decode = tracer_log.elements['decode0']
+        self.assertFalse(decode.is_bin)
+        np.testing.assert_allclose(decode.frame_latency, [4.0, 6.0])
+        np.testing.assert_array_equal(decode.frame_num, [1, 2])
+        self.assertTrue(tracer_log.elements['detection'].is_bin)
+
+    def test_parse_record_skips_format_strings(self):
+        line = ("new format string: latency_tracer_pipeline, "
+                "frame_latency=(double)%lf, avg=(double)%lf, "
+                "frame_num=(uint)%u;")
+        self.assertIsNone(gst_tracer_parser.parse_record(line))
+        self.assertIsNone(gst_tracer_parser.parse_record("no record here"))
+
+    def test_aggregate_element_latency(self):
+        first = gst_tracer_parser.parse_tracer_lines(ELEMENT_LINES)
+        second = gst_tracer_parser.parse_tracer_lines([
+            line.replace("decode0", "classify0") for line in ELEMENT_LINES])
+        ranking = gst_tracer_parser.aggregate_element_latency(
+            [first, second])
+        # the detection bin is left out, decode0 and classify0 remain
+        self.assertEqual(
+            sorted(element.name for element in ranking),
+            ['classify0', 'decode0'])
+        for element in ranking:
+            self.assertAlmostEqual(element.mean_latency, 5.0)
+            self.assertAlmostEqual(element.share, 50.0)
+            self.assertEqual(element.frames, 2)
+
+        ranking = gst_tracer_parser.aggregate_element_latency(
+            [first], include_bins=True)
+        self.assertEqual(ranking[0].name, 'detection')
+        self.assertAlmostEqual(ranking[0].share, 80.0)
+        self.assertAlmostEqual(
+            sum(element.share for element in ranking), 100.0)
+
+    def test_aggregate_element_latency_no_records(self):
+        self.assertEqual(
+            gst_tracer_parser.aggregate_element_latency([]), [])
+
+    def test_last_average_latency_empty_log(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.log') as f:
+            f.write("nothing to see\n")
+            f.flush()
+            tracer_log = gst_tracer_parser.parse_tracer_log(f.name)
+        self.assertEqual(
+            gst_tracer_parser.last_average_latency(tracer_log), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,321 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+from collections import deque
+import glob
+import gzip
+import io
+import os
+import shutil
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_SUFFIX = ".gz"
+ZSTD_SUFFIX = ".zst"
+COMPRESSED_SUFFIXES = (GZIP_SUFFIX, ZSTD_SUFFIX)
+# environment variable selecting the compression of logs at rest
+LOG_COMPRESSION_KEY = "LOG_COMPRESSION"
+# high-volume logs written by the pipelines, compressed once they stopped
+PIPELINE_LOG_PATTERNS = ("gst-launch*.log", "r*.jsonl")
+# every compressed member/frame holds about this much log text so that
+# readers can decompress new data without going back to the file start
+DEFAULT_FRAME_BYTES = 4 * 1024 * 1024
+_TAIL_BLOCK_BYTES = 64 * 1024
+_DECOMPRESS_ERRORS = (zlib.error,) + (
+    (zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class CompressionError(Exception):
+    pass
+
+
+def compression_of(path):
+    '''
+    returns the compression suffix of a log path
+    Args:
+        path: log file path
+    Returns:
+        ".gz", ".zst" or "" for plain text logs
+    '''
+    for suffix in COMPRESSED_SUFFIXES:
+        if path.endswith(suffix):
+            return suffix
+    return ""
+
+
+def strip_compression_suffix(path):
+    '''
+    returns the path without its compression suffix, if any
+    '''
+    suffix = compression_of(path)
+    return path[:-len(suffix)] if suffix else path
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise CompressionError(
+            'ERROR: reading or writing .zst logs needs the zstandard '
+            'package, please pip install zstandard')
+
+
+def open_log(path, mode="rt", errors="replace"):
+    '''
+    opens a plain, gzip or zstd compressed log for streaming reads
+    Args:
+        path: log file path, the compression is taken from the suffix
+        mode: "rt" for text or "rb" for bytes
+        errors: text decoding error handling
+    Returns:
+        file object reading the decompressed content
+    '''
+    suffix = compression_of(path)
+    binary = "b" in mode
+    if suffix == GZIP_SUFFIX:
+        # gzip.open reads across concatenated members
+        if binary:
+            return gzip.open(path, "rb")
+        return gzip.open(path, "rt", errors=errors)
+    if suffix == ZSTD_SUFFIX:
+        _require_zstandard()
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True, closefd=True)
+        buffered = io.BufferedReader(reader)
+        if binary:
+            return buffered
+        return io.TextIOWrapper(buffered, errors=errors)
+    if binary:
+        return open(path, "rb")
+    return open(path, "r", errors=errors)
+
+
+def glob_logs(pattern):
+    '''
+    globs a log file pattern and its compressed variants
+    Args:
+        pattern: glob pattern of the plain text log names
+    Returns:
+        list of matching plain and compressed log paths
+    '''
+    matching_files = glob.glob(pattern)
+    for suffix in COMPRESSED_SUFFIXES:
+        matching_files.extend(glob.glob(pattern + suffix))
+    return matching_files
+
+
+def tail_lines(path, num_lines):
+    '''
+    returns the last num_lines lines of a log without reading all of it
+    for plain files; compressed logs are streamed through once
+    Args:
+        path: log file path
+        num_lines: number of lines to return
+    Returns:
+        list of the last lines, including their line endings
+    '''
+    if num_lines <= 0:
+        return []
+    if compression_of(path):
+        with open_log(path) as f:
+            return list(deque(f, maxlen=num_lines))
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # one extra line so a partial first line is never returned
+        while position > 0 and data.count(b"\n") <= num_lines:
+            read_size = min(_TAIL_BLOCK_BYTES, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    lines = data.decode(errors="replace").splitlines(keepends=True)
+    return lines[-num_lines:]
+
+
+class LogTailer:
+    '''
+    incrementally reads complete new lines from a growing log
+
+    Plain logs are followed by byte offset. Compressed logs are followed
+    at member (gzip) or frame (zstd) boundaries: only fully written
+    members are decompressed and the offset is only moved past them, so
+    each call decompresses just the data appended since the last call.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.compression = compression_of(path)
+        self.offset = 0
+        self._partial = ""
+
+    def _decompressor(self):
+        if self.compression == GZIP_SUFFIX:
+            return zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        _require_zstandard()
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    def _read_plain(self, data):
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        return data[:end].decode(errors="replace")
+
+    def _read_compressed(self, data):
+        chunks = []
+        while data:
+            decompressor = self._decompressor()
+            try:
+                text = decompressor.decompress(data)
+            except _DECOMPRESS_ERRORS:
+                # a member still being written can look corrupt
+                break
+            if not decompressor.eof:
+                # the last member/frame is incomplete, retry next time
+                break
+            consumed = len(data) - len(decompressor.unused_data)
+            self.offset += consumed
+            data = decompressor.unused_data
+            chunks.append(text)
+        return b"".join(chunks).decode(errors="replace")
+
+    def read_lines(self):
+        '''
+        returns the complete lines appended since the previous call
+        '''
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        if not data:
+            return []
+        if self.compression:
+            text = self._read_compressed(data)
+        else:
+            text = self._read_plain(data)
+        text = self._partial + text
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        return [line + "\n" for line in lines]
+
+
+class CompressedLogWriter:
+    '''
+    appends log text or bytes as independent gzip members or zstd frames
+
+    Data is buffered and every flush writes one self-contained member,
+    which keeps the file readable by gzip/zstd tools and lets LogTailer
+    follow it while it grows.
+    '''
+    def __init__(self, path, frame_bytes=DEFAULT_FRAME_BYTES):
+        self.path = path
+        self.compression = compression_of(path)
+        if not self.compression:
+            raise CompressionError(
+                f'ERROR: {path} has no {"/".join(COMPRESSED_SUFFIXES)} '
+                f'suffix to select the compression')
+        if self.compression == ZSTD_SUFFIX:
+            _require_zstandard()
+            self._compressor = zstandard.ZstdCompressor()
+        self.frame_bytes = frame_bytes
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def _compress(self, data):
+        if self.compression == GZIP_SUFFIX:
+            return gzip.compress(data, mtime=0)
+        return self._compressor.compress(data)
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        self._buffer.append(data)
+        self._buffered_bytes += len(data)
+        if self._buffered_bytes >= self.frame_bytes:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        frame = self._compress(b"".join(self._buffer))
+        with open(self.path, "ab") as f:
+            f.write(frame)
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def compress_file(path, compression=GZIP_SUFFIX,
+                  frame_bytes=DEFAULT_FRAME_BYTES, remove_source=True):
+    '''
+    compresses a finished plain log into independent members/frames,
+    byte for byte
+    Args:
+        path: plain text log file path
+        compression: ".gz" or ".zst"
+        frame_bytes: amount of log text per member/frame
+        remove_source: whether to delete the plain log once the
+                       compressed one is complete
+    Returns:
+        path of the compressed log
+    '''
+    if compression not in COMPRESSED_SUFFIXES:
+        raise CompressionError(
+            f'ERROR: unsupported log compression {compression}')
+    compressed_path = path + compression
+    if os.path.exists(compressed_path):
+        os.remove(compressed_path)
+    try:
+        with open(path, "rb") as source, \
+                CompressedLogWriter(compressed_path, frame_bytes) as writer:
+            # line-wise copy keeps every member aligned on whole lines
+            for line in source:
+                writer.write(line)
+    except BaseException:
+        # keep the plain log, a partial compressed one would shadow it
+        if os.path.exists(compressed_path):
+            os.remove(compressed_path)
+        raise
+    # the modification time dates the last sample of logs that carry
+    # no timestamps of their own, see timeline.py
+    shutil.copystat(path, compressed_path)
+    if remove_source:
+        os.remove(path)
+    return compressed_path
+
+
+def compress_logs(results_dir, patterns, compression):
+    '''
+    compresses the plain logs matching any of the patterns in results_dir
+    Args:
+        results_dir: directory holding the benchmark results
+        patterns: list of glob patterns relative to results_dir
+        compression: ".gz", ".zst", "gz", "zst" or empty for no compression
+    Returns:
+        list of the compressed log paths
+    '''
+    if not compression:
+        return []
+    if not compression.startswith("."):
+        compression = "." + compression
+    compressed = []
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(results_dir, pattern)):
+            if os.path.isfile(path):
+                compressed.append(compress_file(path, compression))
+    return compressed
@@ -0,0 +1,134 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import gst_tracer_parser
+import log_io
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_plain(self, name, lines):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w') as f:
+            f.writelines(lines)
+        return path
+
+    def test_open_log_round_trip(self):
+        lines = [f"{i}.5\n" for i in range(100)]
+        compressions = [log_io.GZIP_SUFFIX]
+        if log_io.zstandard is not None:
+            compressions.append(log_io.ZSTD_SUFFIX)
+        for compression in compressions:
+            with self.subTest(compression=compression):
+                path = self.write_plain('pipeline1_gst.log', lines)
+                # small frames so the file holds many members/frames
+                compressed_path = log_io.compress_file(
+                    path, compression, frame_bytes=64)
+                self.assertFalse(os.path.exists(path))
+                with log_io.open_log(compressed_path) as f:
+                    self.assertEqual(f.readlines(), lines)
+                self.assertEqual(
+                    log_io.tail_lines(compressed_path, 3), lines[-3:])
+                os.remove(compressed_path)
+
+    def test_tail_lines_plain(self):
+        lines = [f"line {i}\n" for i in range(50000)]
+        path = self.write_plain('pipeline1_gst.log', lines)
+        self.assertEqual(log_io.tail_lines(path, 20), lines[-20:])
+        self.assertEqual(log_io.tail_lines(path, 100000), lines)
+        self.assertEqual(log_io.tail_lines(path, 0), [])
+
+    def test_log_tailer_gzip_members(self):
+        path = os.path.join(self.test_dir, 'r1_gst.jsonl.gz')
+        tailer = log_io.LogTailer(path)
+        self.assertEqual(tailer.read_lines(), [])
+        with log_io.CompressedLogWriter(path) as writer:
+            writer.write('{"a": 1}\n{"b"')
+        self.assertEqual(tailer.read_lines(), ['{"a": 1}\n'])
+        offset = tailer.offset
+        # a member that is only partially written must not be consumed
+        member = gzip.compress(b': 2}\n')
+        with open(path, 'ab') as f:
+            f.write(member[:len(member) // 2])
+        self.assertEqual(tailer.read_lines(), [])
+        self.assertEqual(tailer.offset, offset)
+        with open(path, 'ab') as f:
+            f.write(member[len(member) // 2:])
+        self.assertEqual(tailer.read_lines(), ['{"b": 2}\n'])
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual(f.read(), '{"a": 1}\n{"b": 2}\n')
+
+    def test_log_tailer_plain(self):
+        path = self.write_plain('pipeline1_gst.log', ['1.0\n', '2.0'])
+        tailer = log_io.LogTailer(path)
+        self.assertEqual(tailer.read_lines(), ['1.0\n'])
+        with open(path, 'a') as f:
+            f.write('\n3.0\n')
+        self.assertEqual(tailer.read_lines(), ['2.0\n', '3.0\n'])
+
+    def test_glob_logs_and_tracer_parser(self):
+        source = os.path.join(
+            './test_stream_density_results',
+            'gst-launch_20240405141414071831277_gst.log')
+        path = os.path.join(self.test_dir, os.path.basename(source))
+        shutil.copy(source, path)
+        plain_log = gst_tracer_parser.parse_tracer_log(path)
+        compressed = log_io.compress_logs(
+            self.test_dir, log_io.PIPELINE_LOG_PATTERNS, 'gz')
+        self.assertEqual(compressed, [path + '.gz'])
+        self.assertEqual(
+            log_io.glob_logs(os.path.join(self.test_dir, 'gst-launch*.log')),
+            [path + '.gz'])
+        compressed_log = gst_tracer_parser.parse_tracer_log(path + '.gz')
+        self.assertEqual(
+            len(compressed_log.pipeline), len(plain_log.pipeline))
+        self.assertEqual(
+            gst_tracer_parser.last_average_latency(compressed_log),
+            gst_tracer_parser.last_average_latency(plain_log))
+
+    def test_compress_file_is_lossless(self):
+        path = os.path.join(self.test_dir, 'gst-launch_1_gst.log')
+        content = b'crlf line\r\n\xff\xfe not utf-8\nno newline'
+        with open(path, 'wb') as f:
+            f.write(content)
+        compressed_path = log_io.compress_file(path, frame_bytes=8)
+        with gzip.open(compressed_path, 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+    def test_compress_file_keeps_source_on_failure(self):
+        path = self.write_plain('gst-launch_1_gst.log', ['x\n'])
+        with patch.object(log_io.CompressedLogWriter, 'flush',
+                          side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                log_io.compress_file(path)
+        self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path + log_io.GZIP_SUFFIX))
+
+    def test_compress_logs_disabled(self):
+        self.write_plain('gst-launch_1_gst.log', ['x\n'])
+        self.assertEqual(log_io.compress_logs(
+            self.test_dir, log_io.PIPELINE_LOG_PATTERNS, None), [])
+
+    def test_writer_requires_suffix(self):
+        with self.assertRaises(log_io.CompressionError):
+            log_io.CompressedLogWriter(
+                os.path.join(self.test_dir, 'plain.log'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import os
+import socket
+import time
+
+METRICS_SOCKET_NAME = "metrics.sock"
+METRICS_PORT_KEY = "METRICS_PORT"
+DEFAULT_TIMEOUT = 0.5
+# the host utilisation and package power stored with every stream
+# density iteration
+HOST_METRICS = ("cpu", "memory", "gpu", "npu", "power")
+
+
+def query_metrics(results_dir, names=None, port=0, timeout=DEFAULT_TIMEOUT):
+    '''
+    queries the rolling metric windows served by the metrics hub in the
+    metrics-collector container
+    Args:
+        results_dir: results directory mounted into the collector, the
+                     hub listens on metrics.sock inside it
+        names: optional metric names such as "cpu" or "gpu", all metrics
+               are returned when empty
+        port: localhost TCP port to use when the socket is not reachable
+        timeout: seconds to wait for the reply
+    Returns:
+        dict with "time", "window_seconds" and "metrics", where metrics
+        maps each name to its mean, last, max and count, or None if the
+        hub is not running
+    '''
+    port = int(port or 0)
+    request = (" ".join(names or []) + "\n").encode()
+    socket_path = os.path.join(results_dir, METRICS_SOCKET_NAME)
+    addresses = []
+    if os.path.exists(socket_path):
+        addresses.append((socket.AF_UNIX, socket_path))
+    if port:
+        addresses.append((socket.AF_INET, ("127.0.0.1", port)))
+
+    for family, address in addresses:
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as client:
+                client.settimeout(timeout)
+                client.connect(address)
+                client.sendall(request)
+                reply = b""
+                while not reply.endswith(b"\n"):
+                    data = client.recv(65536)
+                    if not data:
+                        break
+                    reply += data
+            return json.loads(reply)
+        except (OSError, ValueError) as e:
+            print(f"WARN: cannot query metrics hub at {address}: {e}")
+    return None
+
+
+def window_means(reply):
+    '''
+    flattens a metrics hub reply to the mean of each metric window
+    Args:
+        reply: the dict returned by query_metrics, may be None
+    Returns:
+        dict of metric name to its windowed mean
+    '''
+    if not reply:
+        return {}
+    return {name: stats["mean"]
+            for name, stats in reply.get("metrics", {}).items()}
+
+
+def measure_window(results_dir, duration, names=None, port=0):
+    '''
+    waits for duration seconds while collecting the rolling windows of
+    the metrics hub back to back, so the means cover the whole duration
+    rather than only the hub's last window
+    Args:
+        results_dir: results directory the hub listens in
+        duration: seconds to measure for
+        names: optional metric names, see query_metrics
+        port: localhost TCP port to use when the socket is not reachable
+    Returns:
+        dict of metric name to its mean over the duration, empty if the
+        hub is not running
+    '''
+    reply = query_metrics(results_dir, names, port)
+    if not reply or not reply.get("window_seconds"):
+        time.sleep(max(duration, 0))
+        return {}
+    if duration <= 0:
+        return window_means(reply)
+    window = float(reply["window_seconds"])
+    sums, weights = {}, {}
+    remaining = duration
+    while remaining > 0:
+        step = min(window, remaining)
+        time.sleep(step)
+        remaining -= step
+        reply = query_metrics(results_dir, names, port)
+        # a last step shorter than the window overlaps the previous one,
+        # it only counts for its own share of the window
+        for name, stats in ((reply or {}).get("metrics") or {}).items():
+            weight = stats.get("count", 0) * step / window
+            if weight > 0 and stats.get("mean") is not None:
+                sums[name] = sums.get(name, 0.0) + stats["mean"] * weight
+                weights[name] = weights.get(name, 0.0) + weight
+    return {name: sums[name] / weights[name] for name in sums}
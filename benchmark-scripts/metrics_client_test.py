@@ -0,0 +1,173 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import urllib.error
+import urllib.request
+import metrics_client
+
+# the hub runs inside the metrics-collector container
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'docker', 'scripts'))
+import metrics_hub  # noqa: E402
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_rolling_window(self):
+        window = metrics_hub.RollingWindow(10)
+        self.assertIsNone(window.stats())
+        for t, value in enumerate([50.0, 90.0, 10.0, 30.0]):
+            window.add(100.0 + t, value)
+        stats = window.stats()
+        self.assertAlmostEqual(stats["mean"], 45.0)
+        self.assertEqual(stats["max"], 90.0)
+        self.assertEqual(stats["last"], 30.0)
+        # the samples before 103 fall out of the window
+        window.add(113.0, 20.0)
+        stats = window.stats()
+        self.assertEqual(stats["count"], 2)
+        self.assertAlmostEqual(stats["mean"], 25.0)
+        self.assertEqual(stats["max"], 30.0)
+
+    def test_csv_tailer_partial_rows(self):
+        path = os.path.join(self.test_dir, 'npu_usage.csv')
+        tailer = metrics_hub.CsvTailer(path)
+        self.assertEqual(tailer.read_rows(), [])
+        with open(path, 'w') as f:
+            f.write("device,percent_usage\nnpu0,12.5\nnpu0,1")
+        self.assertEqual(tailer.read_rows(),
+                         [{"device": "npu0", "percent_usage": "12.5"}])
+        with open(path, 'a') as f:
+            f.write("5.0\n")
+        self.assertEqual(tailer.read_rows(),
+                         [{"device": "npu0", "percent_usage": "15.0"}])
+
+    def test_query_metrics(self):
+        self.assertIsNone(metrics_client.query_metrics(self.test_dir))
+        now = time.time()
+        with open(os.path.join(self.test_dir, 'platform_usage.csv'),
+                  'w') as f:
+            f.write("epoch_s,monotonic_s,cpu_percent,iowait_percent,"
+                    "mem_total_kb,mem_used_kb,mem_percent,"
+                    "disk_read_bps,disk_write_bps\n")
+            for i, cpu in enumerate([40.0, 60.0]):
+                f.write(f"{now - 2 + i},{i},{cpu},0,100,50,50.0,0,0\n")
+        with open(os.path.join(self.test_dir, 'igt1-56a0.csv'), 'w') as f:
+            f.write("Freq MHz req,RC6 %,RCS %,VCS %\n")
+            f.write("1000,90.0,25.0,70.0\n")
+
+        hub = metrics_hub.MetricsHub(self.test_dir, 10)
+        hub.poll()
+        server = metrics_hub.UnixMetricsServer(
+            os.path.join(self.test_dir, metrics_client.METRICS_SOCKET_NAME),
+            metrics_hub.MetricsRequestHandler)
+        metrics_hub.serve(server, hub)
+        try:
+            reply = metrics_client.query_metrics(
+                self.test_dir, metrics_client.HOST_METRICS)
+            self.assertEqual(set(reply["metrics"]), {"cpu", "memory", "gpu"})
+            self.assertEqual(metrics_client.window_means(reply),
+                             {"cpu": 50.0, "memory": 50.0, "gpu": 70.0})
+            reply = metrics_client.query_metrics(self.test_dir)
+            self.assertIn("gpu/1-56a0", reply["metrics"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_measure_window(self):
+        # three 10 s windows and a 5 s tail of the 25 s measurement
+        replies = [{"window_seconds": 10, "metrics": {}}] + [
+            {"window_seconds": 10, "metrics": {"cpu": {"mean": cpu,
+                                                       "count": 10}}}
+            for cpu in (20.0, 40.0, 70.0)]
+        with patch('metrics_client.query_metrics', side_effect=replies), \
+                patch('metrics_client.time.sleep') as sleep:
+            means = metrics_client.measure_window(self.test_dir, 25)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list],
+                         [10, 10, 5])
+        self.assertAlmostEqual(means["cpu"], (20.0 * 2 + 40.0 * 2 + 70.0) / 5)
+        with patch('metrics_client.query_metrics', return_value=None), \
+                patch('metrics_client.time.sleep') as sleep:
+            self.assertEqual(metrics_client.measure_window(self.test_dir, 25),
+                             {})
+        sleep.assert_called_once_with(25)
+
+    def test_openmetrics_endpoint(self):
+        with open(os.path.join(self.test_dir, 'igt1-56a0.csv'), 'w') as f:
+            f.write("Freq MHz req,RC6 %,RCS %,VCS %\n")
+            f.write("1000,90.0,25.0,70.0\n")
+        iteration_dir = os.path.join(self.test_dir, 'iteration_gst_001')
+        os.makedirs(iteration_dir)
+        # only the newest iteration of a container is followed
+        os.makedirs(os.path.join(self.test_dir, 'iteration_gst_000'))
+        with open(os.path.join(self.test_dir, 'iteration_gst_000',
+                               'pipeline1_gst.log'), 'w') as f:
+            f.write("5.0\n")
+        fps_log = os.path.join(iteration_dir, 'pipeline1_gst.log')
+        tracer_log = os.path.join(iteration_dir, 'gst-launch_1_gst.log')
+        with open(fps_log, 'w') as f:
+            f.write("1.0\n")
+        hub = metrics_hub.MetricsHub(self.test_dir, 10)
+        # logs running before the hub started are read from their end
+        hub.poll()
+        self.assertNotIn("fps/iteration_gst_001/pipeline1_gst", hub.windows)
+        with open(fps_log, 'a') as f:
+            f.write("na\n29.0\n31.0\n")
+        with open(tracer_log, 'w') as f:
+            f.write("0:00:01.0 latency_tracer_pipeline, "
+                    "frame_latency=(double)40.0, avg=(double)40.0;\n"
+                    "0:00:01.1 latency_tracer_pipeline_interval, "
+                    "interval=(double)1000.0;\n"
+                    "0:00:01.2 latency_tracer_pipeline, "
+                    "frame_latency=(double)60.0, avg=(double)50.0;\n")
+        hub.poll()
+        self.assertEqual(
+            {name for name in hub.tailers if name.endswith('.log')},
+            {fps_log, tracer_log})
+
+        server = metrics_hub.HTTPMetricsServer(
+            ("127.0.0.1", 0), metrics_hub.OpenMetricsRequestHandler)
+        metrics_hub.serve(server, hub)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with urllib.request.urlopen(url + "/metrics") as response:
+                self.assertTrue(response.headers["Content-Type"].startswith(
+                    "application/openmetrics-text"))
+                lines = response.read().decode().splitlines()
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + "/")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(lines[-1], "# EOF")
+        self.assertIn("# TYPE benchmark_pipeline_fps gauge", lines)
+        self.assertIn('benchmark_pipeline_fps{pipeline='
+                      '"iteration_gst_001/pipeline1_gst"} 30.0', lines)
+        self.assertIn('benchmark_pipeline_latency_milliseconds{pipeline='
+                      '"iteration_gst_001/gst-launch_1_gst"} 50.0', lines)
+        self.assertIn('benchmark_gpu_engine_busy_percent{card="1-56a0",'
+                      'engine="VCS"} 70.0', lines)
+        self.assertIn('benchmark_gpu_card_busy_percent{card="1-56a0"} 70.0',
+                      lines)
+        self.assertIn("benchmark_gpu_busy_percent 70.0", lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,470 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable
+import consolidate_multiple_run_of_metrics as consolidate
+import results_parser
+import stream_density
+
+DEFAULT_SIZE = 20000
+DEFAULT_PIPELINES = 8
+DEFAULT_OBJECTS = 8
+DEFAULT_REPEAT = 5
+# records/s drop in percent of the baseline that counts as a regression
+DEFAULT_THRESHOLD = 20.0
+DEFAULT_SEED = 1
+CONTAINER_NAME = "bench"
+PRODUCT_KEY = ("classification_layer_name:efficientnet-b0/model/head/"
+               "dense/BiasAdd/Add")
+TEXT_KEY = "inference_layer_name:logits"
+IGT_METRICS = ("CCS %", "RCS %", "VCS %", "VECS %", "Power W pkg", "RC6 %")
+
+
+def _clock(index):
+    seconds = index % (24 * 60 * 60)
+    return "%02d:%02d:%02d" % (seconds // 3600, seconds // 60 % 60,
+                               seconds % 60)
+
+
+def generate_sar(path, records, rng):
+    '''
+    writes a sar cpu log of records one second samples
+    '''
+    with open(path, 'w') as f:
+        f.write("Linux 6.5.0 (bench) \t01/01/2025 \t_x86_64_\t(16 CPU)\n\n")
+        f.write("00:00:00        CPU     %user     %nice   %system   "
+                "%iowait    %steal     %idle\n")
+        for i in range(records):
+            user, system = rng.uniform(0, 80), rng.uniform(0, 15)
+            f.write("%s        all %9.2f %9.2f %9.2f %9.2f %9.2f %9.2f\n" % (
+                _clock(i), user, 0.0, system, 0.1, 0.0,
+                100.0 - user - system - 0.1))
+    return records
+
+
+def generate_free(path, records, rng):
+    '''
+    writes a free -s 1 memory log of records samples
+    '''
+    total = 32000000
+    with open(path, 'w') as f:
+        for _ in range(records):
+            used = rng.randint(total // 10, total // 2)
+            f.write("               total        used        free      "
+                    "shared  buff/cache   available\n")
+            f.write("Mem:     %10d  %10d  %10d  %10d  %10d  %10d\n" % (
+                total, used, total - used, 1000, 2000000, total - used))
+            f.write("Swap:     2000000           0     2000000\n\n")
+    return records
+
+
+def generate_iotop(path, records, rng):
+    '''
+    writes an iotop -b disk bandwidth log of records samples
+    '''
+    with open(path, 'w') as f:
+        for _ in range(records):
+            f.write("Total DISK READ:       %7.2f K/s | Total DISK WRITE:"
+                    "       %7.2f K/s\n" % (rng.uniform(0, 500),
+                                            rng.uniform(0, 500)))
+            f.write("Current DISK READ:       0.00 B/s | Current DISK WRITE:"
+                    "       0.00 B/s\n")
+            f.write("    PID  PRIO  USER     DISK READ  DISK WRITE  "
+                    "SWAPIN      IO    COMMAND\n")
+    return records
+
+
+def generate_pcm(path, records, rng, sockets=2):
+    '''
+    writes a pcm csv with memory read/write and energy columns per
+    socket under its two header rows
+    '''
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["System", "System"]
+                        + [f"Socket {s}" for s in range(sockets)
+                           for _ in range(2)]
+                        + [f"Socket {s} Proc Energy (Joules)"
+                           for s in range(sockets)])
+        writer.writerow(["Date", "Time"] + ["READ", "WRITE"] * sockets
+                        + ["Proc Energy (Joules)"] * sockets)
+        for i in range(records):
+            row = ["2025-01-01", _clock(i)]
+            for _ in range(sockets):
+                row += ["%.2f" % rng.uniform(0, 20),
+                        "%.2f" % rng.uniform(0, 10)]
+            row += ["%.2f" % rng.uniform(20, 120) for _ in range(sockets)]
+            writer.writerow(row)
+    return records
+
+
+def generate_igt(path, records, rng):
+    '''
+    writes an igt gpu json array of records samples
+    '''
+    samples = [{metric: "%.2f" % rng.uniform(0, 100)
+                for metric in IGT_METRICS} for _ in range(records)]
+    with open(path, 'w') as f:
+        json.dump(samples, f)
+    return records
+
+
+def generate_gst_tracer(path, records, rng, elements=4):
+    '''
+    writes a gst-launch log with records latency tracer frames, one
+    pipeline record and one record per element each
+    '''
+    avg = 0.0
+    with open(path, 'w') as f:
+        for frame in range(1, records + 1):
+            timestamp = "0:%02d:%02d.%09d" % (
+                frame // 1800 % 60, frame // 30 % 60, frame % 30 * 33333333)
+            for element in range(elements):
+                latency = rng.uniform(1, 10)
+                f.write("%s  10 0x55 TRACE GST_TRACER :0:: "
+                        "latency_tracer_element, name=(string)element%d, "
+                        "frame_latency=(double)%f, avg=(double)%f, "
+                        "min=(double)1.000000, max=(double)10.000000, "
+                        "frame_num=(uint)%d, is_bin=(boolean)0;\n" % (
+                            timestamp, element, latency, latency, frame))
+            latency = rng.uniform(20, 60)
+            avg += (latency - avg) / frame
+            f.write("%s  10 0x55 TRACE GST_TRACER :0:: "
+                    "latency_tracer_pipeline, frame_latency=(double)%f, "
+                    "avg=(double)%f, min=(double)20.000000, "
+                    "max=(double)60.000000, latency=(double)33.300000, "
+                    "fps=(double)30.000000, frame_num=(uint)%d;\n" % (
+                        timestamp, latency, avg, frame))
+    return records
+
+
+def generate_pipeline_fps(path, records, rng):
+    '''
+    writes a pipeline fps log of records samples
+    '''
+    with open(path, 'w') as f:
+        for _ in range(records):
+            f.write("%.2f\n" % rng.uniform(14, 31))
+    return records
+
+
+def _box(x_min, y_min, x_max, y_max):
+    return {"x_min": x_min, "y_min": y_min, "x_max": x_max, "y_max": y_max}
+
+
+def generate_jsonl(path, records, rng, objects=DEFAULT_OBJECTS):
+    '''
+    writes a gvametapublish jsonl of records frames with objects tracked
+    products per frame, each holding a barcode and a text region
+    '''
+    width = 1.0 / objects
+    with open(path, 'w') as f:
+        for frame in range(records):
+            results = []
+            region_id = 0
+            for index in range(objects):
+                x_min = index * width + rng.uniform(0, width / 10)
+                x_max = x_min + width * 0.8
+                region_id += 1
+                results.append({
+                    "region_id": region_id, "id": index + 1,
+                    "detection": {"label": "bottle", "confidence": 0.9,
+                                  "bounding_box": _box(x_min, 0.1,
+                                                       x_max, 0.9)},
+                    PRODUCT_KEY: {"label": "product: cola_%d" % index},
+                })
+                region_id += 1
+                results.append({
+                    "region_id": region_id,
+                    "detection": {"label": "barcode: %08d" % index,
+                                  "bounding_box": _box(x_min + 0.01, 0.2,
+                                                       x_max - 0.01, 0.3)},
+                })
+                region_id += 1
+                results.append({
+                    "region_id": region_id,
+                    "detection": {"label": "text",
+                                  "bounding_box": _box(x_min + 0.01, 0.5,
+                                                       x_max - 0.01, 0.6)},
+                    TEXT_KEY: {"label": "COLA"},
+                })
+            f.write(json.dumps({"objects": results,
+                                "timestamp": frame * 33333333}) + "\n")
+    return records
+
+
+@dataclass
+class Case:
+    '''
+    one micro-benchmark: setup writes the synthetic input into the work
+    directory and returns its record count, run parses it
+    '''
+    name: str
+    setup: Callable
+    run: Callable
+
+
+def _extractor_case(name, extractor, file_name, generator):
+    def setup(work_dir, size, pipelines, rng):
+        return generator(os.path.join(work_dir, file_name), size, rng)
+
+    def run(work_dir, pipelines):
+        return extractor().extract_data(os.path.join(work_dir, file_name))
+    return Case(name, setup, run)
+
+
+def _setup_latency_extractor(work_dir, size, pipelines, rng):
+    return generate_gst_tracer(
+        os.path.join(work_dir, "gst-launch_0_bench.log"), size, rng)
+
+
+def _run_latency_extractor(work_dir, pipelines):
+    return consolidate.PipelineLatencyExtractor().extract_data(
+        os.path.join(work_dir, "gst-launch_0_bench.log"))
+
+
+def _setup_results_parser(work_dir, size, pipelines, rng):
+    return generate_jsonl(os.path.join(work_dir, "r0.jsonl"), size, rng)
+
+
+def _run_results_parser(work_dir, pipelines):
+    results_parser.tracked_objects.clear()
+    results_parser.frame_count = 0
+    results_parser.inferenceCounts = results_parser.InferenceCounts()
+    results_parser.process_file(
+        work_dir, os.path.join(work_dir, "r0.jsonl"), 0, 1)
+    return results_parser.frame_count
+
+
+def _setup_total_fps(work_dir, size, pipelines, rng):
+    records = 0
+    for pipeline in range(pipelines):
+        records += generate_pipeline_fps(os.path.join(
+            work_dir, f"pipeline{pipeline}_{CONTAINER_NAME}.log"),
+            max(1, size // pipelines), rng)
+    return records
+
+
+def _run_total_fps(work_dir, pipelines):
+    return stream_density.calculate_total_fps(
+        pipelines, work_dir, CONTAINER_NAME)
+
+
+def _setup_pipeline_latency(work_dir, size, pipelines, rng):
+    records = 0
+    for pipeline in range(pipelines):
+        records += generate_gst_tracer(os.path.join(
+            work_dir, f"gst-launch_{pipeline}_{CONTAINER_NAME}.log"),
+            max(1, size // pipelines), rng)
+    return records
+
+
+def _run_pipeline_latency(work_dir, pipelines):
+    return stream_density.calculate_pipeline_latency(
+        pipelines, work_dir, CONTAINER_NAME)
+
+
+CASES = (
+    _extractor_case("cpu_usage", consolidate.CPUUsageExtractor,
+                    "cpu_usage.log", generate_sar),
+    _extractor_case("memory_usage", consolidate.MemUsageExtractor,
+                    "memory_usage.log", generate_free),
+    _extractor_case("disk_bandwidth", consolidate.DiskBandwidthExtractor,
+                    "disk_bandwidth.log", generate_iotop),
+    _extractor_case("pcm", consolidate.PCMExtractor, "pcm.csv",
+                    generate_pcm),
+    _extractor_case("gpu_usage", consolidate.GPUUsageExtractor,
+                    "igt0.json", generate_igt),
+    Case("pipeline_latency_extractor", _setup_latency_extractor,
+         _run_latency_extractor),
+    Case("results_parser", _setup_results_parser, _run_results_parser),
+    Case("calculate_total_fps", _setup_total_fps, _run_total_fps),
+    Case("calculate_pipeline_latency", _setup_pipeline_latency,
+         _run_pipeline_latency),
+)
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, name))
+               for name in os.listdir(path))
+
+
+def run_case(case, work_dir, size, pipelines, repeat, seed=DEFAULT_SEED):
+    '''
+    generates the input of one case and times its parsing
+    Args:
+        case: the Case to run
+        work_dir: empty directory for the synthetic input
+        size: number of records to generate
+        pipelines: number of pipeline logs of the density cases
+        repeat: number of timed runs, the fastest one is reported
+        seed: random seed of the generators
+    Returns:
+        dict with the record count, input bytes, best and median seconds,
+        MB/s and records/s of the fastest run
+    '''
+    records = case.setup(work_dir, size, pipelines, random.Random(seed))
+    size_bytes = _dir_size(work_dir)
+    timings = []
+    # the parsers print progress, which would dominate the timings
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            case.run(work_dir, pipelines)
+            timings.append(time.perf_counter() - start)
+    best = max(min(timings), 1e-9)
+    return {
+        "records": records,
+        "bytes": size_bytes,
+        "best_seconds": best,
+        "median_seconds": statistics.median(timings),
+        "mb_per_second": size_bytes / 1e6 / best,
+        "records_per_second": records / best,
+    }
+
+
+def run_benchmarks(size=DEFAULT_SIZE, pipelines=DEFAULT_PIPELINES,
+                   repeat=DEFAULT_REPEAT, names=None, seed=DEFAULT_SEED):
+    '''
+    runs the micro-benchmark cases in temporary directories
+    Args:
+        size: number of records of every generated log
+        pipelines: number of pipeline logs of the density cases
+        repeat: number of timed runs of every case
+        names: optional list of case names to run, all by default
+    Returns:
+        dict with the settings and the results of every case by name
+    Raises:
+        ValueError: for unknown case names
+    '''
+    known = {case.name for case in CASES}
+    unknown = set(names or ()) - known
+    if unknown:
+        raise ValueError(f"unknown micro-benchmark(s) {sorted(unknown)}, "
+                         f"expected some of {sorted(known)}")
+    results = {}
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+        work_dir = tempfile.mkdtemp(prefix=f"microbenchmark_{case.name}_")
+        try:
+            results[case.name] = run_case(case, work_dir, size, pipelines,
+                                          repeat, seed)
+        finally:
+            shutil.rmtree(work_dir)
+    return {"size": size, "pipelines": pipelines, "repeat": repeat,
+            "results": results}
+
+
+def compare_to_baseline(report, baseline, threshold=DEFAULT_THRESHOLD):
+    '''
+    finds the cases whose records/s dropped by more than threshold
+    percent of the baseline
+    Args:
+        report: dict returned by run_benchmarks
+        baseline: an earlier report, e.g. loaded from a baseline file
+        threshold: allowed drop in percent
+    Returns:
+        list of (name, baseline records/s, records/s, change percent) of
+        the regressed cases
+    '''
+    if (baseline.get("size"), baseline.get("pipelines")) != (
+            report["size"], report["pipelines"]):
+        print(f"WARN: baseline measured {baseline.get('size')} records "
+              f"and {baseline.get('pipelines')} pipelines, not "
+              f"{report['size']} and {report['pipelines']}")
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or base["records_per_second"] <= 0:
+            continue
+        change = (100.0 * (result["records_per_second"] -
+                           base["records_per_second"]) /
+                  base["records_per_second"])
+        if change < -threshold:
+            regressions.append((name, base["records_per_second"],
+                                result["records_per_second"], change))
+    return regressions
+
+
+def format_report(report):
+    lines = ["%-28s %9s %9s %10s %10s %13s" % (
+        "benchmark", "records", "MB", "best s", "MB/s", "records/s")]
+    for name, result in report["results"].items():
+        lines.append("%-28s %9d %9.2f %10.4f %10.2f %13.0f" % (
+            name, result["records"], result["bytes"] / 1e6,
+            result["best_seconds"], result["mb_per_second"],
+            result["records_per_second"]))
+    return "\n".join(lines)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog='microbenchmark',
+        description='times the log parsers and stream density hot paths '
+                    'on synthetic logs')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE,
+                        help='number of records of every generated log')
+    parser.add_argument('--pipelines', type=int, default=DEFAULT_PIPELINES,
+                        help='number of pipeline logs of the density cases')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='timed runs of every case, the fastest counts')
+    parser.add_argument('--benchmark', action='append', default=None,
+                        choices=[case.name for case in CASES],
+                        help='case to run, may be repeated; all by default')
+    parser.add_argument('--output', default=None,
+                        help='json file to write the results to')
+    parser.add_argument('--baseline', default=None,
+                        help='json results to compare against, a missing '
+                             'file is written with the current results')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed records/s drop in percent of the '
+                             'baseline')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    if args.size < 1 or args.pipelines < 1:
+        print("ERROR: --size and --pipelines must be positive")
+        return 2
+    report = run_benchmarks(args.size, args.pipelines, args.repeat,
+                            args.benchmark)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if not args.baseline:
+        return 0
+    if not os.path.isfile(args.baseline):
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote baseline {args.baseline}")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(report, baseline, args.threshold)
+    for name, base, current, change in regressions:
+        print(f"REGRESSION: {name} {current:.0f} records/s, baseline "
+              f"{base:.0f} records/s ({change:+.1f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
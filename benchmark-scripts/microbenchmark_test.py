@@ -0,0 +1,84 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import consolidate_multiple_run_of_metrics as consolidate
+import microbenchmark
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_generators_match_parsers(self):
+        # every generated log has to parse, or the timings measure nothing
+        with contextlib.redirect_stdout(io.StringIO()):
+            for case in microbenchmark.CASES:
+                with self.subTest(case=case.name):
+                    work_dir = os.path.join(self.test_dir, case.name)
+                    os.makedirs(work_dir)
+                    self.assertEqual(case.setup(work_dir, 20, 2,
+                                                random.Random(1)), 20)
+                    result = case.run(work_dir, 2)
+                    if isinstance(result, dict):
+                        self.assertNotIn("NA", result.values())
+                        self.assertTrue(result)
+                    elif isinstance(result, tuple):
+                        self.assertGreater(result[0], 0)
+                    else:
+                        self.assertEqual(result, 20)
+
+    def test_latency_extractor_state(self):
+        path = os.path.join(self.test_dir, "gst-launch_0_bench.log")
+        microbenchmark.generate_gst_tracer(path, 20, random.Random(1))
+        first = consolidate.PipelineLatencyExtractor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            first.extract_data(path)
+        self.assertEqual(len(first.tracer_logs), 1)
+        # a later consolidation in the same process starts empty
+        self.assertEqual(consolidate.PipelineLatencyExtractor().tracer_logs,
+                         [])
+
+    def test_run_benchmarks(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = microbenchmark.run_benchmarks(
+                size=10, pipelines=2, repeat=1,
+                names=["cpu_usage", "calculate_total_fps"])
+        self.assertEqual(sorted(report["results"]),
+                         ["calculate_total_fps", "cpu_usage"])
+        result = report["results"]["cpu_usage"]
+        self.assertEqual(result["records"], 10)
+        self.assertGreater(result["mb_per_second"], 0)
+        with self.assertRaises(ValueError):
+            microbenchmark.run_benchmarks(names=["missing"])
+
+    def test_compare_to_baseline(self):
+        def report(rates):
+            return {"size": 10, "pipelines": 2, "results": {
+                name: {"records_per_second": rate}
+                for name, rate in rates.items()}}
+        baseline = report({"cpu_usage": 1000.0, "pcm": 1000.0})
+        current = report({"cpu_usage": 700.0, "pcm": 900.0, "new": 1.0})
+        regressions = microbenchmark.compare_to_baseline(
+            current, baseline, threshold=20.0)
+        self.assertEqual([name for name, *_ in regressions], ["cpu_usage"])
+        self.assertAlmostEqual(regressions[0][3], -30.0)
+        self.assertEqual(microbenchmark.compare_to_baseline(
+            current, baseline, threshold=50.0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,330 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import os
+import re
+import time
+import benchmark
+import log_io
+import stream_density
+import stream_stability
+import thermal
+
+# the results of a mixed density search in the results dir
+MIXED_DENSITY_FILE = "mixed_density.json"
+# iteration directory label of the measured mixes
+MIX_NAME = "mix"
+# every container type reads its pipeline count from PIPELINE_COUNT_<NAME>
+PIPELINE_COUNT_PREFIX = "PIPELINE_COUNT_"
+DEFAULT_MAX_PIPELINES = 32
+
+
+def pipeline_count_key(container_name):
+    '''
+    returns the environment variable holding the pipeline count of a
+    container type, e.g. PIPELINE_COUNT_SELF_CHECKOUT for self-checkout
+    '''
+    return PIPELINE_COUNT_PREFIX + re.sub(
+        r'[^A-Z0-9]', '_', container_name.upper())
+
+
+class MixOracle:
+    '''
+    answers whether a mix of pipeline counts keeps every target FPS
+
+    More pipelines of any type never raise the fps, so a mix below a
+    feasible one is feasible and a mix above an infeasible one is not.
+    Only mixes those answers do not cover are measured.
+    Args:
+        measure: callable taking a tuple of pipeline counts and returning
+                 whether every container met its target FPS
+        max_pipelines: counts above this are infeasible without measuring
+    '''
+    def __init__(self, measure, max_pipelines=DEFAULT_MAX_PIPELINES):
+        self.measure = measure
+        self.max_pipelines = max_pipelines
+        self.feasible = []
+        self.infeasible = []
+
+    @property
+    def measurements(self):
+        return len(self.feasible) + len(self.infeasible)
+
+    def __call__(self, counts):
+        counts = tuple(counts)
+        if not any(counts):
+            return True
+        if max(counts) > self.max_pipelines:
+            return False
+        if any(all(count <= known for count, known in zip(counts, mix))
+               for mix in self.feasible):
+            return True
+        if any(all(count >= known for count, known in zip(counts, mix))
+               for mix in self.infeasible):
+            return False
+        feasible = bool(self.measure(counts))
+        (self.feasible if feasible else self.infeasible).append(counts)
+        return feasible
+
+
+def _bisect(is_feasible, make_mix, low, high):
+    # low is feasible and high is not
+    while high - low > 1:
+        middle = (low + high) // 2
+        if is_feasible(make_mix(middle)):
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def _axis_max(is_feasible, head, upper, max_pipelines):
+    '''
+    returns the largest count of the last container type that is
+    feasible next to the head counts, searching up from zero or, with
+    the upper count of the previous step, down from it
+    '''
+    def make_mix(count):
+        return head + (count,)
+
+    if upper is None:
+        low, count = 0, 1
+        while count <= max_pipelines and is_feasible(make_mix(count)):
+            low, count = count, count * 2
+        return _bisect(is_feasible, make_mix, low,
+                       min(count, max_pipelines + 1))
+    if is_feasible(make_mix(upper)):
+        return upper
+    high, step = upper, 1
+    while upper - step > 0:
+        if is_feasible(make_mix(upper - step)):
+            return _bisect(is_feasible, make_mix, upper - step, high)
+        high, step = upper - step, step * 2
+    return _bisect(is_feasible, make_mix, 0, high)
+
+
+def maximal_mixes(mixes):
+    '''
+    returns the mixes no other mix dominates, without the empty mix
+    '''
+    mixes = sorted(set(mix for mix in mixes if any(mix)))
+    return [mix for mix in mixes
+            if not any(other != mix and
+                       all(a >= b for a, b in zip(other, mix))
+                       for other in mixes)]
+
+
+def pareto_frontier(is_feasible, dimensions,
+                    max_pipelines=DEFAULT_MAX_PIPELINES):
+    '''
+    finds the maximal feasible mixes of pipeline counts
+
+    The first container types are walked count by count, the last one
+    follows the staircase of the frontier downwards, so two container
+    types take about as many measurements as the frontier is long.
+    Args:
+        is_feasible: callable taking a tuple of counts, see MixOracle
+        dimensions: number of container types
+        max_pipelines: largest count of any container type
+    Returns:
+        list of maximal feasible count tuples
+    '''
+    def walk(prefix):
+        remaining = dimensions - len(prefix)
+        if remaining == 1:
+            return [prefix + (_axis_max(is_feasible, prefix, None,
+                                        max_pipelines),)]
+        mixes = []
+        upper = None
+        for count in range(max_pipelines + 1):
+            head = prefix + (count,)
+            if remaining == 2:
+                upper = _axis_max(is_feasible, head, upper, max_pipelines)
+                # a feasible step above zero implies the head alone fits
+                if upper == 0 and not is_feasible(head + (0,)):
+                    break
+                mixes.append(head + (upper,))
+            elif is_feasible(head + (0,) * (remaining - 1)):
+                mixes.extend(walk(head))
+            else:
+                break
+        return mixes
+    return maximal_mixes(walk(()))
+
+
+def max_ratio_mix(is_feasible, ratio, max_pipelines=DEFAULT_MAX_PIPELINES):
+    '''
+    finds the largest multiple of a fixed mix that is feasible by
+    doubling the multiple, then bisecting
+    Args:
+        is_feasible: callable taking a tuple of counts, see MixOracle
+        ratio: counts of one unit of the mix, e.g. (3, 1)
+        max_pipelines: largest count of any container type
+    Returns:
+        the feasible count tuple, all zeros if one unit is too much
+    '''
+    def make_mix(multiple):
+        return tuple(part * multiple for part in ratio)
+
+    limit = min(max_pipelines // part for part in ratio if part > 0)
+    low, multiple = 0, 1
+    while multiple <= limit and is_feasible(make_mix(multiple)):
+        low, multiple = multiple, multiple * 2
+    return make_mix(_bisect(is_feasible, make_mix, low,
+                            min(multiple, limit + 1)))
+
+
+def measure_mix(env_vars, compose_files, compose, container_names,
+                target_fps_list, counts, iteration, settle_seconds):
+    '''
+    runs one mix of pipelines and measures the fps of every container
+    Returns:
+        the iteration manifest, meets_target_fps tells whether every
+        container met its target FPS
+    '''
+    results_dir = env_vars[stream_density.RESULTS_DIR_KEY]
+    iteration_dir = stream_density.make_iteration_dir(
+        results_dir, MIX_NAME, iteration)
+    iteration_env = env_vars.copy()
+    iteration_env[stream_density.RESULTS_DIR_KEY] = iteration_dir
+    for name, count in zip(container_names, counts):
+        iteration_env[pipeline_count_key(name)] = str(count)
+    manifest = {
+        "container_name": MIX_NAME,
+        "iteration": iteration,
+        "num_pipelines": sum(counts),
+        "counts": dict(zip(container_names, counts)),
+        "start_time": time.time(),
+    }
+    print(f"Starting mix: {manifest['counts']}")
+    compose("up", compose_files=compose_files, compose_post_args="-d",
+            env_vars=iteration_env)
+    print("waiting for pipelines to settle...")
+    time.sleep(settle_seconds)
+    containers = {}
+    meets_target_fps = True
+    try:
+        for name, target_fps, count in zip(
+                container_names, target_fps_list, counts):
+            if count == 0:
+                continue
+            stream_density.check_non_empty_result_logs(
+                count, iteration_dir, name,
+                int(env_vars.get(stream_density.LOG_WAIT_DURATION_KEY)
+                    or stream_density.DEFAULT_LOG_WAIT_DURATION))
+            total_fps, fps_per_stream = stream_density.calculate_total_fps(
+                count, iteration_dir, name)
+            _, latency_per_stream = stream_density.calculate_pipeline_latency(
+                count, iteration_dir, name)
+            stability = stream_stability.iteration_stability(
+                stream_density.get_latest_pipeline_logs(
+                    count, log_io.glob_logs(os.path.join(
+                        iteration_dir, f'pipeline*_{name}*.log'))),
+                target_fps, env_vars)
+            meets = fps_per_stream >= target_fps and stability["stable"]
+            containers[name] = {
+                "num_pipelines": count,
+                "target_fps": target_fps,
+                "total_fps": total_fps,
+                "fps_per_stream": fps_per_stream,
+                "latency_per_stream": latency_per_stream,
+                "stability": stability,
+                "meets_target_fps": meets,
+            }
+            meets_target_fps &= meets
+    except ValueError as e:
+        # pipelines that do not start do not fit either
+        print(f"ERROR: {e}")
+        manifest["error"] = str(e)
+        meets_target_fps = False
+    manifest.update({"containers": containers,
+                     "meets_target_fps": meets_target_fps,
+                     "end_time": time.time()})
+    manifest.update(thermal.iteration_throttling(
+        results_dir, manifest["start_time"], manifest["end_time"]))
+    stream_density.write_iteration_manifest(iteration_dir, manifest)
+    return manifest
+
+
+def run_mixed_density(env_vars, compose_files, container_names,
+                      target_fps_list, init_duration, ratio=None,
+                      max_pipelines=None, compose=None, on_iteration=None):
+    '''
+    searches the mixes of pipeline counts per container type that keep
+    every container's target FPS at the same time, on one running
+    compose stack whose services read PIPELINE_COUNT_<NAME>
+    Args:
+        env_vars: the dict of current environment variables
+        compose_files: the list of compose files to run pipelines
+        container_names: the container type names
+        target_fps_list: the target FPS of every container type
+        init_duration: settle time in seconds of every measured mix
+        ratio: optional counts of one unit of a fixed mix to find the
+               largest multiple of, the Pareto frontier otherwise
+        max_pipelines: largest count of any container type,
+                       DEFAULT_MAX_PIPELINES when None
+        compose: callable to run compose commands with, the docker
+                 compose CLI by default
+        on_iteration: optional callable receiving the manifest of every
+                      measured mix
+    Returns:
+        dict with the frontier mixes, the best mix by total pipelines
+        and the number of measured mixes
+    '''
+    compose = compose or benchmark.docker_compose_containers
+    max_pipelines = max_pipelines or DEFAULT_MAX_PIPELINES
+    results_dir = env_vars[stream_density.RESULTS_DIR_KEY]
+    stream_density.clean_up_iteration_dirs(results_dir, MIX_NAME)
+    manifests = []
+
+    def measure(counts):
+        manifest = measure_mix(
+            env_vars, compose_files, compose, container_names,
+            target_fps_list, counts, len(manifests), init_duration)
+        manifests.append(manifest)
+        if on_iteration:
+            on_iteration(manifest)
+        return manifest["meets_target_fps"]
+
+    oracle = MixOracle(measure, max_pipelines)
+    try:
+        if ratio:
+            frontier = maximal_mixes([max_ratio_mix(
+                oracle, tuple(ratio), max_pipelines)])
+        else:
+            frontier = pareto_frontier(
+                oracle, len(container_names), max_pipelines)
+    finally:
+        compose("down", compose_files=compose_files, env_vars=env_vars)
+        try:
+            log_io.compress_logs(
+                results_dir,
+                [os.path.join(
+                    stream_density.ITERATION_DIR_PREFIX + "*", pattern)
+                 for pattern in log_io.PIPELINE_LOG_PATTERNS],
+                env_vars.get(log_io.LOG_COMPRESSION_KEY))
+        except (log_io.CompressionError, OSError) as e:
+            print(f"WARN: could not compress the logs: {e}")
+
+    mixes = [dict(zip(container_names, mix)) for mix in frontier]
+    result = {
+        "container_names": list(container_names),
+        "target_fps": list(target_fps_list),
+        "ratio": list(ratio) if ratio else None,
+        "frontier": mixes,
+        "best": max(mixes, key=lambda mix: sum(mix.values()),
+                    default=None),
+        "measurements": oracle.measurements,
+    }
+    with open(os.path.join(results_dir, MIXED_DENSITY_FILE), 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"Mixed density frontier after {oracle.measurements} "
+          f"measured mix(es):")
+    for mix in mixes:
+        print("  " + ", ".join(f"{name}={count}"
+                               for name, count in mix.items()))
+    return result
@@ -0,0 +1,123 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import benchmark
+import mixed_density
+
+
+def capacity_model(costs, capacity):
+    # a mix fits while the summed cost of its pipelines fits the capacity
+    return lambda counts: sum(
+        cost * count for cost, count in zip(costs, counts)) <= capacity
+
+
+def brute_force_frontier(feasible, dimensions, max_pipelines):
+    return mixed_density.maximal_mixes(
+        mix for mix in itertools.product(range(max_pipelines + 1),
+                                         repeat=dimensions)
+        if feasible(mix))
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_pipeline_count_key(self):
+        self.assertEqual(mixed_density.pipeline_count_key("self-checkout"),
+                         "PIPELINE_COUNT_SELF_CHECKOUT")
+
+    def test_pareto_frontier(self):
+        for costs, capacity, max_pipelines in (
+                ((3, 5), 30, 16), ((1, 1), 7, 5), ((2, 3, 4), 24, 12),
+                ((1,), 9, 16)):
+            with self.subTest(costs=costs, capacity=capacity):
+                feasible = capacity_model(costs, capacity)
+                oracle = mixed_density.MixOracle(feasible, max_pipelines)
+                frontier = mixed_density.pareto_frontier(
+                    oracle, len(costs), max_pipelines)
+                self.assertEqual(frontier, brute_force_frontier(
+                    feasible, len(costs), max_pipelines))
+                self.assertLess(oracle.measurements,
+                                (max_pipelines + 1) ** len(costs) / 2)
+        # two container types only measure along the frontier staircase
+        oracle = mixed_density.MixOracle(capacity_model((3, 5), 30), 16)
+        mixed_density.pareto_frontier(oracle, 2, 16)
+        self.assertLessEqual(oracle.measurements, 25)
+
+    def test_max_ratio_mix(self):
+        oracle = mixed_density.MixOracle(capacity_model((2, 5), 40))
+        self.assertEqual(mixed_density.max_ratio_mix(oracle, (3, 1)), (9, 3))
+        self.assertLessEqual(oracle.measurements, 5)
+        self.assertEqual(mixed_density.max_ratio_mix(
+            capacity_model((2, 5), 4), (3, 1)), (0, 0))
+        self.assertEqual(mixed_density.max_ratio_mix(
+            capacity_model((1, 1), 100), (3, 1), max_pipelines=10), (9, 3))
+
+    @mock.patch('time.sleep', return_value=None)
+    def test_run_mixed_density(self, mock_sleep):
+        costs = {"checkout": 10.0, "lp": 30.0}
+        capacity = 120.0
+
+        def compose(command, compose_files=[], compose_pre_args="",
+                    compose_post_args="", env_vars=None):
+            if command != "up":
+                return "", "", 0
+            counts = {name: int(env_vars[
+                mixed_density.pipeline_count_key(name)]) for name in costs}
+            load = sum(costs[name] * count for name, count in counts.items())
+            slowdown = max(1.0, load / capacity)
+            for name, count in counts.items():
+                for pipeline in range(count):
+                    path = os.path.join(
+                        env_vars["RESULTS_DIR"],
+                        f"pipeline{pipeline}_{name}.log")
+                    with open(path, 'w') as f:
+                        f.write(f"{30.0 / slowdown:.2f}\n" * 5)
+            return "", "", 0
+
+        env_vars = {"RESULTS_DIR": self.test_dir}
+        manifests = []
+        result = mixed_density.run_mixed_density(
+            env_vars, ['a.yml'], list(costs), [25.0, 25.0], 0,
+            max_pipelines=12, compose=compose,
+            on_iteration=manifests.append)
+        # 10 * checkout + 30 * lp <= 144 keeps 25 of 30 fps
+        self.assertEqual(result["frontier"], [
+            {"checkout": 2, "lp": 4}, {"checkout": 5, "lp": 3},
+            {"checkout": 8, "lp": 2}, {"checkout": 11, "lp": 1},
+            {"checkout": 12, "lp": 0}])
+        self.assertEqual(sum(result["best"].values()), 12)
+        self.assertEqual(result["measurements"], len(manifests))
+        self.assertTrue(all(manifest["container_name"] ==
+                            mixed_density.MIX_NAME for manifest in manifests))
+        with open(os.path.join(self.test_dir,
+                               mixed_density.MIXED_DENSITY_FILE)) as f:
+            self.assertEqual(json.load(f)["frontier"], result["frontier"])
+
+        result = mixed_density.run_mixed_density(
+            env_vars, ['a.yml'], list(costs), [25.0, 25.0], 0, ratio=[3, 1],
+            max_pipelines=12, compose=compose)
+        self.assertEqual(result["frontier"], [{"checkout": 6, "lp": 2}])
+
+        config = benchmark.BenchmarkConfig(
+            compose_files=['a.yml'], target_fps=[25.0, 25.0],
+            container_names=list(costs), mix_ratio=[3, 1])
+        self.assertEqual(config.mode, benchmark.MIXED_DENSITY_MODE)
+
+
+if __name__ == '__main__':
+    unittest.main()
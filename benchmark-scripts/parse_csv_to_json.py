@@ -9,7 +9,7 @@ import csv
 import json
 import os
 
-def parse_args():
+def parse_args(args=None):
 
     parser = argparse.ArgumentParser(
         prog='parse_csv_to_json', 
@@ -20,7 +20,7 @@ def parse_args():
     parser.add_argument('--keyword', '-k', default=['device'], action='append',
                         help='keyword that results file(s) start with, ' +
                         'can be used multiple times')
-    return parser.parse_args()
+    return parser.parse_args(args)
 
 
 def convert_csv_results_to_json(results_dir, log_name):
@@ -30,12 +30,16 @@ def convert_csv_results_to_json(results_dir, log_name):
     Args:
         results_dir: directory containing the benchmark results
         log_name: first portion of the log filename to search for
+    Returns:
+        dict of the written json file paths to their rows
     '''
+    results = {}
     for entry in os.scandir(results_dir):
         if entry.name.startswith(log_name) and entry.is_file():
             print(entry.path)
             csv_file = open(entry.path)
-            json_file = json.dumps([dict(r) for r in csv.DictReader(csv_file)])
+            rows = [dict(r) for r in csv.DictReader(csv_file)]
+            json_file = json.dumps(rows)
             device_name = entry.name.split('.')
             json_result_path = os.path.join(
                 results_dir, device_name[0]+".json")
@@ -43,6 +47,26 @@ def convert_csv_results_to_json(results_dir, log_name):
                 outfile.write(json_file)
             outfile.close()
             csv_file.close()
+            results[json_result_path] = rows
+    return results
+
+
+def parse_results(results_dir, args=()):
+    '''
+    parser plugin entry point called in-process by benchmark.py
+
+    Args:
+        results_dir: directory containing the benchmark results
+        args: list of the parser command line arguments
+    Returns:
+        dict of the written json file paths to their rows
+    '''
+    my_args = parse_args(["-d", results_dir] + list(args))
+    results = {}
+    for k in my_args.keyword:
+        results.update(convert_csv_results_to_json(my_args.directory, k))
+    return results
+
 
 def main():
     my_args = parse_args()
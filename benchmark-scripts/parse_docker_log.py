@@ -10,7 +10,7 @@ import json
 import os
 import pprint
 
-def parse_args():
+def parse_args(args=None):
 
     parser = argparse.ArgumentParser(
         prog='parse_docker_log', 
@@ -21,7 +21,7 @@ def parse_args():
     parser.add_argument('--keyword', '-k', default=['device'], action='append',
                         help='keyword that results file(s) start with, ' +
                         'can be used multiple times')
-    return parser.parse_args()
+    return parser.parse_args(args)
 
 
 def parse_fps_from_log(results_dir, log_name):
@@ -31,7 +31,10 @@ def parse_fps_from_log(results_dir, log_name):
     Args:
         results_dir: directory containing the benchmark results
         log_name: first portion of the log filename to search for
+    Returns:
+        dict of the written json file paths to their FPS information
     '''
+    results = {}
     for entry in os.scandir(results_dir):
         if entry.name.startswith(log_name) and entry.is_file() and not entry.name.endswith("json"):
             print(entry.path)
@@ -50,6 +53,9 @@ def parse_fps_from_log(results_dir, log_name):
                                 fps_info["sum_%s" % words[fps - 1]] = 0
                                 sum_list.append("sum_%s" % words[fps - 1])
                             fps_info["sum_%s" % words[fps - 1]] += float(words[fps + 1])
+            if not count:
+                print("no FPS found in %s" % entry.path)
+                continue
             total_fps = 0.0
             for sum in sum_list:
                 name = sum.split('sum_')[-1]
@@ -61,6 +67,26 @@ def parse_fps_from_log(results_dir, log_name):
             outfile = os.path.join(os.path.split(entry.path)[0], "%s.json" % entry.name.split(".")[0])
             with open(outfile, "w") as output:
                 json.dump(fps_info, output)
+            results[outfile] = fps_info
+    return results
+
+
+def parse_results(results_dir, args=()):
+    '''
+    parser plugin entry point called in-process by benchmark.py
+
+    Args:
+        results_dir: directory containing the benchmark results
+        args: list of the parser command line arguments
+    Returns:
+        dict of the written json file paths to their FPS information
+    '''
+    my_args = parse_args(["-d", results_dir] + list(args))
+    results = {}
+    for k in my_args.keyword:
+        results.update(parse_fps_from_log(my_args.directory, k))
+    return results
+
 
 def main():
     my_args = parse_args()
@@ -0,0 +1,291 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import csv
+import json
+import os
+import time
+import benchmark
+import log_io
+import stream_density
+
+# the curve of a --pipelines start:stop:step sweep in the results dir
+SCALING_CURVE_CSV = "scaling_curve.csv"
+SCALING_CURVE_JSON = "scaling_curve.json"
+# iteration directory label when no container name filters the logs
+DEFAULT_SWEEP_NAME = "sweep"
+HOST_METRIC_COLUMNS = ("cpu", "memory", "gpu", "npu")
+ENERGY_COLUMNS = ("power_watts", "fps_per_watt", "joules_per_frame")
+THERMAL_COLUMNS = ("throttled", "throttled_seconds")
+STABILITY_COLUMNS = ("unstable_streams", "max_fps_cv")
+
+
+def parse_pipeline_counts(text):
+    '''
+    parses a --pipelines value, a single count or a start:stop[:step]
+    sweep including stop
+    Args:
+        text: e.g. "4", "1:32" or "1:32:4"
+    Returns:
+        list of pipeline counts in increasing order
+    Raises:
+        ValueError: for malformed or non-positive ranges
+    '''
+    parts = text.split(":")
+    if len(parts) == 1:
+        count = int(parts[0])
+        if count < 0:
+            raise ValueError(f"negative pipeline count {text}")
+        return [count]
+    if len(parts) not in (2, 3):
+        raise ValueError(f"expected start:stop[:step], got {text}")
+    start, stop = int(parts[0]), int(parts[1])
+    step = int(parts[2]) if len(parts) == 3 else 1
+    if start < 1 or stop < start or step < 1:
+        raise ValueError(
+            f"expected 1 <= start <= stop and step >= 1, got {text}")
+    counts = list(range(start, stop + 1, step))
+    if counts[-1] != stop:
+        # the end of the requested range is always measured
+        counts.append(stop)
+    return counts
+
+
+def scaling_efficiency(points):
+    '''
+    adds the scaling efficiency and marginal throughput to sweep points
+    Args:
+        points: list of point dicts with num_pipelines and total_fps,
+                ordered by num_pipelines
+    Returns:
+        the per-stream fps of the first measured point used as the
+        linear scaling baseline, or None without any fps
+    '''
+    baseline = None
+    previous = None
+    for point in points:
+        if baseline is None and point["total_fps"] > 0:
+            baseline = point["total_fps"] / point["num_pipelines"]
+        point["scaling_efficiency"] = (
+            point["total_fps"] / (point["num_pipelines"] * baseline)
+            if baseline else None)
+        point["marginal_fps"] = (
+            (point["total_fps"] - previous["total_fps"]) /
+            (point["num_pipelines"] - previous["num_pipelines"])
+            if previous is not None else None)
+        previous = point
+    return baseline
+
+
+def knee_point(points):
+    '''
+    finds the knee of the throughput curve as the point farthest above
+    the chord between the first and the last point of the normalized
+    curve, where adding streams stops paying off
+    Args:
+        points: list of point dicts with num_pipelines and total_fps,
+                ordered by num_pipelines
+    Returns:
+        the num_pipelines of the knee, or None for fewer than three
+        points or a curve without a bend
+    '''
+    if len(points) < 3:
+        return None
+    counts = [point["num_pipelines"] for point in points]
+    fps = [point["total_fps"] for point in points]
+    count_range = counts[-1] - counts[0]
+    fps_range = max(fps) - min(fps)
+    if count_range <= 0 or fps_range <= 0:
+        return None
+    x = [(count - counts[0]) / count_range for count in counts]
+    y = [(value - min(fps)) / fps_range for value in fps]
+    distances = [y[i] - (y[0] + (y[-1] - y[0]) * x[i])
+                 for i in range(len(points))]
+    knee = max(range(len(points)), key=lambda i: distances[i])
+    if distances[knee] <= 0:
+        return None
+    return counts[knee]
+
+
+def energy_summary(points, power_budget=None):
+    '''
+    picks the energy-efficient pipeline counts of a sweep
+    Args:
+        points: list of sweep point dicts with their energy columns
+        power_budget: optional package power budget in watts
+    Returns:
+        dict with the count of the most fps per watt and, with a budget,
+        the largest count whose power stayed within it; None where no
+        point qualifies
+    '''
+    measured = [point for point in points
+                if point.get("fps_per_watt") is not None]
+    best = max(measured, key=lambda point: point["fps_per_watt"],
+               default=None)
+    summary = {"most_efficient_pipelines":
+               best["num_pipelines"] if best else None}
+    if power_budget:
+        within = [point["num_pipelines"] for point in measured
+                  if point["power_watts"] <= power_budget]
+        summary["power_budget_watts"] = power_budget
+        summary["max_pipelines_within_budget"] = max(within, default=None)
+    return summary
+
+
+def sweep_point(num_pipelines, measurement):
+    '''
+    reduces the measurement of one sweep step to a curve point
+    '''
+    host_utilization = measurement.get("host_utilization") or {}
+    point = {
+        "num_pipelines": num_pipelines,
+        "total_fps": measurement["total_fps"],
+        "fps_per_stream": measurement["fps_per_stream"],
+        "latency_per_stream": measurement["latency_per_stream"],
+    }
+    for name in HOST_METRIC_COLUMNS:
+        point[f"{name}_percent"] = host_utilization.get(name)
+    for name in ENERGY_COLUMNS + THERMAL_COLUMNS:
+        point[name] = measurement.get(name)
+    streams = (measurement.get("stability") or {}).get("streams", [])
+    point["unstable_streams"] = sum(
+        1 for stream in streams if not stream["stable"])
+    point["max_fps_cv"] = max(
+        (stream["cv"] for stream in streams if stream["cv"] is not None),
+        default=None)
+    return point
+
+
+def write_scaling_curve(results_dir, points, baseline, knee, energy=None):
+    '''
+    writes the sweep curve as csv and, with the summary, as json
+    Args:
+        results_dir: directory holding the benchmark results
+        points: list of sweep point dicts
+        baseline: per-stream fps of the linear scaling baseline
+        knee: num_pipelines of the knee point or None
+        energy: optional dict returned by energy_summary
+    Returns:
+        path of the json file
+    '''
+    columns = (["num_pipelines", "total_fps", "fps_per_stream",
+                "latency_per_stream", "scaling_efficiency", "marginal_fps"]
+               + [f"{name}_percent" for name in HOST_METRIC_COLUMNS]
+               + list(ENERGY_COLUMNS) + list(THERMAL_COLUMNS)
+               + list(STABILITY_COLUMNS))
+    with open(os.path.join(results_dir, SCALING_CURVE_CSV), 'w',
+              newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for point in points:
+            writer.writerow(point)
+    path = os.path.join(results_dir, SCALING_CURVE_JSON)
+    with open(path, 'w') as f:
+        json.dump({"baseline_fps_per_stream": baseline,
+                   "knee_pipelines": knee,
+                   **(energy or {}),
+                   "points": points}, f, indent=2)
+    return path
+
+
+def run_pipeline_sweep(env_vars, compose_files, pipeline_counts,
+                       init_duration, duration, container_name="",
+                       compose=None, on_iteration=None):
+    '''
+    measures every pipeline count of a sweep on one running compose
+    stack: each step only restarts the pipelines with the new count
+    while the collectors keep running
+    Args:
+        env_vars: the dict of current environment variables
+        compose_files: the list of compose files to run pipelines
+        pipeline_counts: increasing list of pipeline counts
+        init_duration: settle time in seconds after every step
+        duration: measurement window in seconds of every step
+        container_name: container name to match in the log files
+        compose: callable to run compose commands with, the docker
+                 compose CLI by default
+        on_iteration: optional callable receiving the manifest of every
+                      finished step
+    Returns:
+        list of sweep point dicts
+    '''
+    compose = compose or benchmark.docker_compose_containers
+    results_dir = env_vars[stream_density.RESULTS_DIR_KEY]
+    sweep_name = container_name or DEFAULT_SWEEP_NAME
+    stream_density.clean_up_iteration_dirs(results_dir, sweep_name)
+    points = []
+    try:
+        for iteration, num_pipelines in enumerate(pipeline_counts):
+            print(f"Sweep step {iteration + 1}/{len(pipeline_counts)}: "
+                  f"{num_pipelines} pipeline(s)")
+            iteration_dir = stream_density.make_iteration_dir(
+                results_dir, sweep_name, iteration)
+            iteration_env = env_vars.copy()
+            iteration_env["PIPELINE_COUNT"] = str(num_pipelines)
+            iteration_env[stream_density.RESULTS_DIR_KEY] = iteration_dir
+            manifest = {
+                "container_name": sweep_name,
+                "iteration": iteration,
+                "num_pipelines": num_pipelines,
+                "start_time": time.time(),
+            }
+            compose(
+                "up", compose_files=compose_files,
+                compose_post_args="-d", env_vars=iteration_env)
+            try:
+                measurement = stream_density.measure_iteration(
+                    env_vars, results_dir, iteration_dir, container_name,
+                    num_pipelines, init_duration, duration)
+            except ValueError as e:
+                # more pipelines would not start either
+                print(f"ERROR: stopping the sweep at {num_pipelines} "
+                      f"pipeline(s): {e}")
+                manifest.update({"end_time": time.time(), "error": str(e)})
+                stream_density.write_iteration_manifest(
+                    iteration_dir, manifest)
+                if on_iteration:
+                    on_iteration(manifest)
+                break
+            manifest.update(measurement)
+            manifest["end_time"] = time.time()
+            stream_density.write_iteration_manifest(iteration_dir, manifest)
+            if on_iteration:
+                on_iteration(manifest)
+            points.append(sweep_point(num_pipelines, measurement))
+    finally:
+        compose(
+            "down", compose_files=compose_files, env_vars=env_vars)
+        try:
+            log_io.compress_logs(
+                results_dir,
+                [os.path.join(
+                    stream_density.ITERATION_DIR_PREFIX + "*", pattern)
+                 for pattern in log_io.PIPELINE_LOG_PATTERNS],
+                env_vars.get(log_io.LOG_COMPRESSION_KEY))
+        except (log_io.CompressionError, OSError) as e:
+            print(f"WARN: could not compress the logs: {e}")
+
+    baseline = scaling_efficiency(points)
+    knee = knee_point(points)
+    energy = energy_summary(
+        points, float(env_vars.get(stream_density.POWER_BUDGET_KEY) or 0))
+    write_scaling_curve(results_dir, points, baseline, knee, energy)
+    print("pipelines,total fps,fps per stream,latency per stream,efficiency")
+    for point in points:
+        efficiency = point["scaling_efficiency"]
+        print(f"{point['num_pipelines']},{point['total_fps']:.2f},"
+              f"{point['fps_per_stream']:.2f},"
+              f"{point['latency_per_stream']:.2f},"
+              + (f"{efficiency:.2f}" if efficiency is not None else "na"))
+    if knee is not None:
+        print(f"Scaling knee point: {knee} pipeline(s)")
+    if energy["most_efficient_pipelines"] is not None:
+        print(f"Most energy-efficient: "
+              f"{energy['most_efficient_pipelines']} pipeline(s)")
+    if "power_budget_watts" in energy:
+        print(f"Most pipelines within {energy['power_budget_watts']} W: "
+              f"{energy['max_pipelines_within_budget']}")
+    return points
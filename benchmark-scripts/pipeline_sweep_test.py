@@ -0,0 +1,117 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import pipeline_sweep
+import stream_density
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_parse_pipeline_counts(self):
+        self.assertEqual(pipeline_sweep.parse_pipeline_counts("4"), [4])
+        self.assertEqual(pipeline_sweep.parse_pipeline_counts("1:4"),
+                         [1, 2, 3, 4])
+        # the stop value is always part of the sweep
+        self.assertEqual(pipeline_sweep.parse_pipeline_counts("1:32:8"),
+                         [1, 9, 17, 25, 32])
+        for text in ("0:4", "4:1", "1:4:0", "1:2:3:4", "a:b", "-1"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    pipeline_sweep.parse_pipeline_counts(text)
+
+    def test_efficiency_and_knee(self):
+        # linear up to 8 pipelines, then the throughput saturates
+        points = [{"num_pipelines": n, "total_fps": fps} for n, fps in
+                  [(1, 30.0), (4, 120.0), (8, 240.0), (12, 250.0),
+                   (16, 252.0)]]
+        baseline = pipeline_sweep.scaling_efficiency(points)
+        self.assertEqual(baseline, 30.0)
+        self.assertAlmostEqual(points[2]["scaling_efficiency"], 1.0)
+        self.assertAlmostEqual(points[4]["scaling_efficiency"],
+                               252.0 / 480.0)
+        self.assertIsNone(points[0]["marginal_fps"])
+        self.assertAlmostEqual(points[3]["marginal_fps"], 2.5)
+        self.assertEqual(pipeline_sweep.knee_point(points), 8)
+        self.assertIsNone(pipeline_sweep.knee_point(points[:2]))
+        linear = [{"num_pipelines": n, "total_fps": 30.0 * n}
+                  for n in (1, 2, 3)]
+        self.assertIsNone(pipeline_sweep.knee_point(linear))
+
+    def test_energy_summary(self):
+        points = [{"num_pipelines": n, "power_watts": power,
+                   "fps_per_watt": fps / power}
+                  for n, fps, power in [(1, 30.0, 20.0), (2, 60.0, 25.0),
+                                        (4, 110.0, 40.0), (8, 130.0, 60.0)]]
+        points.append({"num_pipelines": 16, "power_watts": None,
+                       "fps_per_watt": None})
+        self.assertEqual(pipeline_sweep.energy_summary(points),
+                         {"most_efficient_pipelines": 4})
+        summary = pipeline_sweep.energy_summary(points, power_budget=50.0)
+        self.assertEqual(summary["max_pipelines_within_budget"], 4)
+        summary = pipeline_sweep.energy_summary(points, power_budget=10.0)
+        self.assertIsNone(summary["max_pipelines_within_budget"])
+        self.assertIsNone(pipeline_sweep.energy_summary(
+            points[-1:])["most_efficient_pipelines"])
+
+    @patch('pipeline_sweep.stream_density.measure_iteration')
+    @patch('pipeline_sweep.benchmark.docker_compose_containers')
+    def test_run_pipeline_sweep(self, mock_compose, mock_measure):
+        def measure(env_vars, results_dir, iteration_dir, container_name,
+                    num_pipelines, settle_seconds, window_seconds):
+            if num_pipelines > 3:
+                raise ValueError("missing pipeline logs")
+            return {"total_fps": 30.0 * num_pipelines,
+                    "fps_per_stream": 30.0, "latency_per_stream": 20.0,
+                    "host_utilization": {"cpu": 10.0 * num_pipelines}}
+        mock_measure.side_effect = measure
+        env_vars = {stream_density.RESULTS_DIR_KEY: self.test_dir}
+
+        points = pipeline_sweep.run_pipeline_sweep(
+            env_vars, ["docker-compose.yml"], [1, 2, 3, 4, 5], 10, 5)
+
+        # the stack stays up between the steps and stops after the
+        # first failing one
+        commands = [call[0][0] for call in mock_compose.call_args_list]
+        self.assertEqual(commands, ["up", "up", "up", "up", "down"])
+        up_env = mock_compose.call_args_list[1][1]["env_vars"]
+        self.assertEqual(up_env["PIPELINE_COUNT"], "2")
+        self.assertEqual(
+            up_env[stream_density.RESULTS_DIR_KEY],
+            stream_density.iteration_dir_path(
+                self.test_dir, pipeline_sweep.DEFAULT_SWEEP_NAME, 1))
+        self.assertEqual(mock_measure.call_args[0][5:], (10, 5))
+        self.assertEqual([point["num_pipelines"] for point in points],
+                         [1, 2, 3])
+        self.assertEqual(points[2]["cpu_percent"], 30.0)
+
+        with open(os.path.join(self.test_dir,
+                               pipeline_sweep.SCALING_CURVE_JSON)) as f:
+            curve = json.load(f)
+        self.assertEqual(curve["baseline_fps_per_stream"], 30.0)
+        self.assertIsNone(curve["knee_pipelines"])
+        with open(os.path.join(self.test_dir,
+                               pipeline_sweep.SCALING_CURVE_CSV)) as f:
+            self.assertEqual(len(f.readlines()), 4)
+        trace = stream_density.load_density_trace(
+            self.test_dir, pipeline_sweep.DEFAULT_SWEEP_NAME)
+        self.assertEqual(len(trace), 4)
+        self.assertIn("error", trace[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
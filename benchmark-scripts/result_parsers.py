@@ -0,0 +1,90 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import importlib.util
+import os
+import shlex
+import subprocess  # nosec B404
+import traceback
+import parse_csv_to_json
+import parse_docker_log
+
+# a parser plugin is a module with a function of this name taking the
+# results directory and the list of parser arguments and returning
+# its results as a dict
+PARSER_ENTRY_POINT = "parse_results"
+BUILTIN_PARSERS = {
+    "parse_csv_to_json": parse_csv_to_json,
+    "parse_docker_log": parse_docker_log,
+}
+
+
+def load_parser(parser_script):
+    '''
+    finds the in-process entry point of a parser script
+
+    Args:
+        parser_script: a built-in parser name or the path to a parser
+                       script, with or without its .py suffix
+    Returns:
+        the parse_results function, or None when the script has to run
+        in its own process
+    '''
+    name = os.path.splitext(os.path.basename(parser_script))[0]
+    module = BUILTIN_PARSERS.get(name)
+    if module is None:
+        if not (parser_script.endswith(".py")
+                and os.path.isfile(parser_script)):
+            return None
+        # importing runs the module, legacy scripts without a main guard
+        # would parse with the wrong arguments
+        with open(parser_script, errors="replace") as f:
+            if "def %s(" % PARSER_ENTRY_POINT not in f.read():
+                return None
+        spec = importlib.util.spec_from_file_location(
+            "result_parser_" + name, parser_script)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            print("Exception loading parser %s: %s" %
+                  (parser_script, traceback.format_exc()))
+            return None
+    return getattr(module, PARSER_ENTRY_POINT, None)
+
+
+def run_parser(parser_script, results_dir, parser_args="", env_vars=None):
+    '''
+    parses the benchmark results in-process when the parser script is a
+    plugin, otherwise runs it as before with python3
+
+    Args:
+        parser_script: a built-in parser name or the parser script path
+        results_dir: directory containing the benchmark results
+        parser_args: string of arguments to pass to the parser
+        env_vars: environment variables of a parser process
+    Returns:
+        dict of the parser results, None when the parser ran as a
+        process or failed
+    '''
+    parse = load_parser(parser_script)
+    if parse is None:
+        parser_string = ("python3 %s -d %s %s" %
+                         (parser_script, results_dir, parser_args))
+        try:
+            subprocess.run(shlex.split(parser_string), check=True,
+                           env=env_vars)  # nosec B404, B603
+        except (subprocess.CalledProcessError, OSError):
+            print("Exception calling %s\n parser %s: %s" %
+                  (parser_string, parser_script, traceback.format_exc()))
+        return None
+    try:
+        return parse(results_dir, shlex.split(parser_args))
+    except (Exception, SystemExit):
+        # argparse exits on bad parser arguments, the run itself is done
+        print("Exception in parser %s with arguments %s: %s" %
+              (parser_script, parser_args, traceback.format_exc()))
+        return None
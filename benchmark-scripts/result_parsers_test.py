@@ -0,0 +1,82 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import parse_csv_to_json
+import parse_docker_log
+import result_parsers
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_load_parser(self):
+        self.assertIs(result_parsers.load_parser('./parse_csv_to_json.py'),
+                      parse_csv_to_json.parse_results)
+        self.assertIs(result_parsers.load_parser('parse_docker_log'),
+                      parse_docker_log.parse_results)
+        plugin = self.write('my_parser.py',
+                            "def parse_results(results_dir, args):\n"
+                            "    return {'dir': results_dir, 'args': args}\n")
+        self.assertEqual(result_parsers.load_parser(plugin)('r', ['-x']),
+                         {'dir': 'r', 'args': ['-x']})
+        legacy = self.write('legacy_parser.py', "print('parsing')\n")
+        self.assertIsNone(result_parsers.load_parser(legacy))
+        self.assertIsNone(result_parsers.load_parser('missing.sh'))
+
+    @patch('result_parsers.subprocess.run')
+    def test_run_parser(self, mock_run):
+        self.write('device_cpu.csv', "fps,latency\n30.0,12\n29.5,13\n")
+        self.write('igt0.csv', "RCS %\n50.0\n")
+        results = result_parsers.run_parser(
+            'parse_csv_to_json', self.test_dir, '-k device -k igt')
+        device_json = os.path.join(self.test_dir, 'device_cpu.json')
+        self.assertEqual(results[device_json],
+                         [{"fps": "30.0", "latency": "12"},
+                          {"fps": "29.5", "latency": "13"}])
+        self.assertTrue(os.path.isfile(device_json))
+        self.assertIn(os.path.join(self.test_dir, 'igt0.json'), results)
+        mock_run.assert_not_called()
+
+        self.write('docker.log', "cam1 FPS 30.0 cam2 FPS 20.0\n"
+                                 "cam1 FPS 32.0 cam2 FPS 22.0\n")
+        self.write('docker_empty.log', "no frames yet\n")
+        results = result_parsers.run_parser(
+            'parse_docker_log', self.test_dir, '-k docker')
+        fps_info = results[os.path.join(self.test_dir, 'docker.json')]
+        self.assertEqual(fps_info["avg_cam1"], 31.0)
+        self.assertEqual(fps_info["avg_fps"], 26.0)
+
+        # bad arguments do not fail the finished run
+        self.assertIsNone(result_parsers.run_parser(
+            'parse_csv_to_json', self.test_dir, '--no-such-option'))
+
+        # scripts without the entry point still run as a process
+        legacy = self.write('legacy_parser.py', "print('parsing')\n")
+        self.assertIsNone(result_parsers.run_parser(
+            legacy, self.test_dir, '-k device', {"PATH": "/usr/bin"}))
+        self.assertEqual(mock_run.call_args[0][0],
+                         ['python3', legacy, '-d', self.test_dir,
+                          '-k', 'device'])
+
+
+if __name__ == '__main__':
+    unittest.main()
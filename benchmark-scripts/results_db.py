@@ -0,0 +1,330 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+import benchmark
+import compare_results
+import mixed_density
+import stream_density
+
+DEFAULT_DB = "results.db"
+SECONDS_PER_DAY = 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    host TEXT,
+    start_time REAL,
+    mode TEXT,
+    target_device TEXT,
+    pipeline TEXT,
+    pipelines INTEGER,
+    compose_files TEXT,
+    target_fps TEXT,
+    config TEXT,
+    signature REAL
+);
+CREATE TABLE IF NOT EXISTS kpis (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS density_points (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    container_name TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    num_pipelines INTEGER,
+    target_fps REAL,
+    total_fps REAL,
+    fps_per_stream REAL,
+    latency_per_stream REAL,
+    meets_target_fps INTEGER,
+    start_time REAL,
+    PRIMARY KEY (run_id, container_name, iteration)
+);
+CREATE INDEX IF NOT EXISTS runs_host_time ON runs (host, start_time);
+CREATE INDEX IF NOT EXISTS runs_pipeline_time ON runs (pipeline, start_time);
+CREATE INDEX IF NOT EXISTS runs_device_time
+    ON runs (target_device, start_time);
+CREATE INDEX IF NOT EXISTS kpis_key ON kpis (key, run_id);
+CREATE INDEX IF NOT EXISTS density_container
+    ON density_points (container_name, meets_target_fps, num_pipelines);
+"""
+
+
+def connect(path=DEFAULT_DB):
+    '''
+    opens the results database and creates its tables when missing
+    Args:
+        path: database file path
+    Returns:
+        sqlite3 connection
+    '''
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def find_result_dirs(root):
+    '''
+    finds the results directories of benchmark runs under root: every
+    directory with a run config, a consolidated summary or stream density
+    iterations
+    '''
+    result_dirs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        has_iterations = any(
+            d.startswith(stream_density.ITERATION_DIR_PREFIX)
+            for d in dirnames)
+        dirnames[:] = [
+            d for d in dirnames
+            if not d.startswith(stream_density.ITERATION_DIR_PREFIX)]
+        has_summary = any(compare_results.SUMMARY_PATTERN.match(name)
+                          for name in filenames)
+        if (benchmark.RUN_CONFIG_FILE in filenames or has_iterations
+                or has_summary):
+            result_dirs.append(dirpath)
+    return sorted(result_dirs)
+
+
+def _run_files(results_dir):
+    files = [os.path.join(results_dir, benchmark.RUN_CONFIG_FILE)]
+    files += sorted(
+        os.path.join(results_dir, name) for name in os.listdir(results_dir)
+        if compare_results.SUMMARY_PATTERN.match(name))
+    files += glob.glob(os.path.join(
+        results_dir, stream_density.ITERATION_DIR_PREFIX + "*",
+        stream_density.ITERATION_MANIFEST))
+    return [path for path in files if os.path.isfile(path)]
+
+
+def _pipeline_name(config):
+    # the container name identifies the pipeline, otherwise the first
+    # pipeline compose file does
+    if config.get("container_names"):
+        return config["container_names"][0]
+    if config.get("compose_files"):
+        return os.path.splitext(
+            os.path.basename(config["compose_files"][0]))[0]
+    return None
+
+
+def _density_rows(run_id, trace, pipeline):
+    rows = []
+    for manifest in trace:
+        container_name = manifest.get("container_name", "")
+        if container_name == mixed_density.MIX_NAME:
+            # a mix loads several pipelines at once, its counts are no
+            # stream density of any single one of them
+            continue
+        if container_name in ("", benchmark.DEFAULT_CONTAINER_NAME):
+            # runs without --container_names, name them like the run
+            container_name = pipeline or container_name
+        rows.append(
+            (run_id, container_name,
+             manifest.get("iteration", 0), manifest.get("num_pipelines"),
+             manifest.get("target_fps"), manifest.get("total_fps"),
+             manifest.get("fps_per_stream"),
+             manifest.get("latency_per_stream"),
+             manifest.get("meets_target_fps"), manifest.get("start_time")))
+    return rows
+
+
+def ingest_run(conn, results_dir):
+    '''
+    loads the config, consolidated KPIs and stream density iterations of
+    one run, runs that did not change since their last ingest are skipped
+    Args:
+        conn: connection returned by connect
+        results_dir: results directory of the run
+    Returns:
+        the run id, or None when the run was up to date
+    '''
+    path = os.path.abspath(results_dir)
+    files = _run_files(path)
+    signature = max((os.path.getmtime(file) for file in files), default=0.0)
+    row = conn.execute("SELECT id, signature FROM runs WHERE path = ?",
+                       (path,)).fetchone()
+    if row is not None and row["signature"] == signature:
+        return None
+
+    config = {}
+    config_path = os.path.join(path, benchmark.RUN_CONFIG_FILE)
+    if os.path.isfile(config_path):
+        with open(config_path) as f:
+            config = json.load(f)
+    kpis = {}
+    for file in files:
+        if compare_results.SUMMARY_PATTERN.match(os.path.basename(file)):
+            # several summaries of one run are trials of the same config
+            for key, value in compare_results.read_summary(file).items():
+                kpis.setdefault(key, []).append(value)
+    trace = stream_density.load_density_trace(path)
+    pipeline = _pipeline_name(config)
+
+    with conn:
+        if row is not None:
+            conn.execute("DELETE FROM runs WHERE id = ?", (row["id"],))
+        run_id = conn.execute(
+            "INSERT INTO runs (path, host, start_time, mode, target_device,"
+            " pipeline, pipelines, compose_files, target_fps, config,"
+            " signature) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, config.get("host"),
+             config.get("start_time", signature), config.get("mode"),
+             config.get("target_device"), pipeline,
+             config.get("pipelines"),
+             json.dumps(config.get("compose_files", [])),
+             json.dumps(config.get("target_fps", [])),
+             json.dumps(config), signature)).lastrowid
+        conn.executemany(
+            "INSERT INTO kpis (run_id, key, value) VALUES (?, ?, ?)",
+            [(run_id, key, sum(values) / len(values))
+             for key, values in kpis.items()])
+        conn.executemany(
+            "INSERT OR REPLACE INTO density_points (run_id, container_name,"
+            " iteration, num_pipelines, target_fps, total_fps,"
+            " fps_per_stream, latency_per_stream, meets_target_fps,"
+            " start_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _density_rows(run_id, trace, pipeline))
+    return run_id
+
+
+def ingest(conn, roots):
+    '''
+    ingests every run found under the roots
+    Returns:
+        (number of ingested runs, number of up to date runs)
+    '''
+    ingested = skipped = 0
+    for root in roots:
+        for results_dir in find_result_dirs(root):
+            if ingest_run(conn, results_dir) is None:
+                skipped += 1
+            else:
+                ingested += 1
+    return ingested, skipped
+
+
+def _run_filters(host=None, days=None, now=None):
+    clauses, params = [], []
+    if host:
+        clauses.append("runs.host = ?")
+        params.append(host)
+    if days:
+        clauses.append("runs.start_time >= ?")
+        params.append((now or time.time()) - days * SECONDS_PER_DAY)
+    return clauses, params
+
+
+def max_density(conn, pipeline, host=None, days=None, now=None):
+    '''
+    returns the highest pipeline count that met its target fps
+    Args:
+        conn: connection returned by connect
+        pipeline: pipeline name of the stream density runs, their
+                  container name or else their compose file name
+        host: optional host name to limit the runs to
+        days: optional number of days back from now to limit the runs to
+    Returns:
+        dict with num_pipelines, target_fps, the run path and start
+        time, or None without any passing iteration
+    '''
+    clauses, params = _run_filters(host, days, now)
+    row = conn.execute(
+        "SELECT density_points.num_pipelines, density_points.target_fps,"
+        " runs.path, runs.host, runs.start_time FROM density_points"
+        " JOIN runs ON runs.id = density_points.run_id"
+        " WHERE density_points.container_name = ?"
+        " AND density_points.meets_target_fps = 1" +
+        "".join(" AND " + clause for clause in clauses) +
+        " ORDER BY density_points.num_pipelines DESC,"
+        " runs.start_time DESC LIMIT 1",
+        [pipeline] + params).fetchone()
+    return dict(row) if row is not None else None
+
+
+def kpi_history(conn, key, pipeline=None, host=None, days=None, now=None):
+    '''
+    returns the values of one KPI over time
+    Args:
+        conn: connection returned by connect
+        key: consolidated KPI key, e.g. "Total FPS Mean"
+        pipeline: optional pipeline name of the runs
+        host: optional host name to limit the runs to
+        days: optional number of days back from now to limit the runs to
+    Returns:
+        list of dicts with start_time, host, path and value
+    '''
+    clauses, params = _run_filters(host, days, now)
+    if pipeline:
+        clauses.append("runs.pipeline = ?")
+        params.append(pipeline)
+    rows = conn.execute(
+        "SELECT runs.start_time, runs.host, runs.path, kpis.value"
+        " FROM kpis JOIN runs ON runs.id = kpis.run_id WHERE kpis.key = ?" +
+        "".join(" AND " + clause for clause in clauses) +
+        " ORDER BY runs.start_time", [key] + params).fetchall()
+    return [dict(row) for row in rows]
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog='results_db',
+        description='loads benchmark results into a SQLite database and '
+                    'queries it')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                        help='SQLite database file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = subparsers.add_parser(
+        'ingest', help='loads the runs found under the directories')
+    ingest_parser.add_argument('roots', nargs='+',
+                               help='results directories to search')
+    for name, help_text in (
+            ('max-density', 'highest pipeline count meeting its target'),
+            ('kpi', 'values of a consolidated KPI over time')):
+        query_parser = subparsers.add_parser(name, help=help_text)
+        if name == 'kpi':
+            query_parser.add_argument('key', help='KPI key')
+            query_parser.add_argument('--pipeline', default=None)
+        else:
+            query_parser.add_argument('pipeline',
+                                      help='stream density pipeline name')
+        query_parser.add_argument('--host', default=None)
+        query_parser.add_argument('--days', type=float, default=None,
+                                  help='only runs of the last days')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    conn = connect(args.db)
+    try:
+        if args.command == 'ingest':
+            ingested, skipped = ingest(conn, args.roots)
+            print(f"ingested {ingested} run(s), {skipped} up to date")
+        elif args.command == 'max-density':
+            print(json.dumps(max_density(conn, args.pipeline, args.host,
+                                         args.days), indent=2))
+        else:
+            print(json.dumps(kpi_history(conn, args.key, args.pipeline,
+                                         args.host, args.days), indent=2))
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
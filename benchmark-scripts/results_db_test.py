@@ -0,0 +1,138 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import benchmark
+import mixed_density
+import results_db
+import stream_density
+
+DAY = results_db.SECONDS_PER_DAY
+NOW = 1000 * DAY
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.conn = results_db.connect(os.path.join(self.test_dir, "r.db"))
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.test_dir)
+
+    def write_run(self, name, host, start_time, kpis=None, densities=(),
+                  container_name="gst"):
+        results_dir = os.path.join(self.test_dir, "results", name)
+        os.makedirs(results_dir)
+        with open(os.path.join(results_dir, benchmark.RUN_CONFIG_FILE),
+                  'w') as f:
+            json.dump({"host": host, "start_time": start_time,
+                       "mode": benchmark.STREAM_DENSITY_MODE,
+                       "target_device": "GPU", "pipelines": 1,
+                       "container_names":
+                           [container_name] if container_name else [],
+                       "compose_files": ["../src/docker-compose.yml"],
+                       "target_fps": [14.95]}, f)
+        if kpis:
+            with open(os.path.join(results_dir, "summary.csv"), 'w') as f:
+                for key, value in kpis.items():
+                    f.write(f"{key},{value}\n")
+        container_name = container_name or benchmark.DEFAULT_CONTAINER_NAME
+        for iteration, (num_pipelines, passed) in enumerate(densities):
+            iteration_dir = stream_density.make_iteration_dir(
+                results_dir, container_name, iteration)
+            stream_density.write_iteration_manifest(iteration_dir, {
+                "container_name": container_name, "iteration": iteration,
+                "num_pipelines": num_pipelines, "target_fps": 14.95,
+                "total_fps": 15.0 * num_pipelines, "fps_per_stream": 15.0,
+                "latency_per_stream": 30.0, "meets_target_fps": passed,
+                "start_time": start_time})
+        return results_dir
+
+    def test_ingest_and_query(self):
+        self.write_run("old", "host1", NOW - 200 * DAY,
+                       {"Total FPS Mean": 50.0}, [(1, True), (9, True)])
+        self.write_run("recent", "host1", NOW - 10 * DAY,
+                       {"Total FPS Mean": 60.0, "Camera_1 FPS": "n/a"},
+                       [(1, True), (2, True), (4, True), (8, False)])
+        self.write_run("other", "host2", NOW - 5 * DAY,
+                       {"Total FPS Mean": 70.0}, [(6, True)])
+        root = os.path.join(self.test_dir, "results")
+        self.assertEqual(len(results_db.find_result_dirs(root)), 3)
+        self.assertEqual(results_db.ingest(self.conn, [root]), (3, 0))
+        # unchanged runs are skipped, changed ones replace their rows
+        self.assertEqual(results_db.ingest(self.conn, [root]), (0, 3))
+        run = self.conn.execute(
+            "SELECT * FROM runs WHERE path LIKE '%recent'").fetchone()
+        self.assertEqual(run["pipeline"], "gst")
+        self.assertEqual(json.loads(run["target_fps"]), [14.95])
+
+        best = results_db.max_density(self.conn, "gst")
+        self.assertEqual(best["num_pipelines"], 9)
+        best = results_db.max_density(self.conn, "gst", days=90, now=NOW)
+        self.assertEqual(best["num_pipelines"], 6)
+        best = results_db.max_density(self.conn, "gst", host="host1",
+                                      days=90, now=NOW)
+        self.assertEqual(best["num_pipelines"], 4)
+        self.assertIsNone(results_db.max_density(self.conn, "missing"))
+
+        history = results_db.kpi_history(self.conn, "Total FPS Mean",
+                                         host="host1")
+        self.assertEqual([row["value"] for row in history], [50.0, 60.0])
+        self.assertEqual(results_db.kpi_history(self.conn, "Camera_1 FPS"),
+                         [])
+
+    def test_reingest_changed_run(self):
+        results_dir = self.write_run("run", "host1", NOW,
+                                     densities=[(1, True), (2, True)])
+        self.assertIsNotNone(results_db.ingest_run(self.conn, results_dir))
+        self.assertIsNone(results_db.ingest_run(self.conn, results_dir))
+        manifest = os.path.join(
+            stream_density.iteration_dir_path(results_dir, "gst", 1),
+            stream_density.ITERATION_MANIFEST)
+        with open(manifest) as f:
+            data = json.load(f)
+        data["meets_target_fps"] = False
+        with open(manifest, 'w') as f:
+            json.dump(data, f)
+        os.utime(manifest, (NOW + 1, NOW + 1))
+        self.assertIsNotNone(results_db.ingest_run(self.conn, results_dir))
+        self.assertEqual(
+            self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0], 1)
+        self.assertEqual(self.conn.execute(
+            "SELECT COUNT(*) FROM density_points").fetchone()[0], 2)
+        self.assertEqual(
+            results_db.max_density(self.conn, "gst")["num_pipelines"], 1)
+
+    def test_density_points_of_default_container(self):
+        results_dir = self.write_run("run", "host1", NOW,
+                                     densities=[(1, True), (3, True)],
+                                     container_name=None)
+        # a mix counts several pipelines, it is no density of its own
+        iteration_dir = stream_density.make_iteration_dir(
+            results_dir, mixed_density.MIX_NAME, 0)
+        stream_density.write_iteration_manifest(iteration_dir, {
+            "container_name": mixed_density.MIX_NAME, "iteration": 0,
+            "num_pipelines": 12, "counts": {"gst": 12},
+            "meets_target_fps": True, "start_time": NOW})
+        results_db.ingest_run(self.conn, results_dir)
+        run = self.conn.execute("SELECT * FROM runs").fetchone()
+        self.assertEqual(run["pipeline"], "docker-compose")
+        best = results_db.max_density(self.conn, "docker-compose")
+        self.assertEqual(best["num_pipelines"], 3)
+        self.assertIsNone(results_db.max_density(
+            self.conn, benchmark.DEFAULT_CONTAINER_NAME))
+        self.assertIsNone(results_db.max_density(
+            self.conn, mixed_density.MIX_NAME))
+
+
+if __name__ == '__main__':
+    unittest.main()
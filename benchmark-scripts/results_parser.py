@@ -10,7 +10,9 @@ import os
 import json
 from collections import Counter
 from dataclasses import dataclass
+from functools import partial
 import traceback
+import log_io
 
 @dataclass
 class InferenceCounts:
@@ -28,6 +30,13 @@ tracked_objects = {}
 frame_count = 0
 inferenceCounts = InferenceCounts()
 
+# which enclosing detection becomes the parent of a barcode or text
+FIRST_MATCH = "first"
+SMALLEST_MATCH = "smallest"
+PARENT_MATCH_MODES = (FIRST_MATCH, SMALLEST_MATCH)
+# cells per axis of the parent lookup grid over normalised coordinates
+GRID_CELLS = 16
+
 def parse_args():
     parser = argparse.ArgumentParser(prog="Results Parser",
                                      fromfile_prefix_chars='@',
@@ -40,6 +49,10 @@ def parse_args():
     parser.add_argument('--reclassify-interval', default=1, help='Reclassify interval')
     parser.add_argument('--broker-address', default="localhost", help='MQTT broker address')
     parser.add_argument('--broker-port', default=1883, help='MQTT broker port')
+    parser.add_argument('--parent-match', default=FIRST_MATCH,
+                        choices=PARENT_MATCH_MODES,
+                        help='Parent of a barcode or text: the first or '
+                        'the smallest enclosing detection')
     return parser.parse_args()
 
 
@@ -49,12 +62,65 @@ def is_inside(inner, outer):
            inner["y_min"] >= outer["y_min"] and \
            inner["y_max"] <= outer["y_max"]
 
-def get_parent_id(detections, detection):
+
+def box_area(bbox):
+    return (bbox["x_max"] - bbox["x_min"]) * (bbox["y_max"] - bbox["y_min"])
+
+
+def get_parent_id(detections, detection, parent_match=FIRST_MATCH):
     bbox = detection["bounding_box"]
-    for key in detections:
-        if is_inside(bbox, detections[key]["bounding_box"]):
-            return key
-    return 0
+    parents = [key for key in detections
+               if is_inside(bbox, detections[key]["bounding_box"])]
+    if not parents:
+        return 0
+    if parent_match == SMALLEST_MATCH:
+        return min(parents,
+                   key=lambda key: box_area(detections[key]["bounding_box"]))
+    return parents[0]
+
+
+def _cell(value):
+    return min(max(int(value * GRID_CELLS), 0), GRID_CELLS - 1)
+
+
+class RegionIndex:
+    '''
+    grid buckets over the bounding boxes of the detections of a frame
+    for parent lookups, same answers as get_parent_id
+
+    Every box is listed in the grid cells it overlaps, so a box that
+    encloses another one is listed in the cell of the inner box's
+    top left corner and a lookup only checks the boxes of that cell.
+    Args:
+        parent_match: FIRST_MATCH for the enclosing detection added
+                      first, SMALLEST_MATCH for the smallest one
+    '''
+    def __init__(self, parent_match=FIRST_MATCH):
+        if parent_match not in PARENT_MATCH_MODES:
+            raise ValueError("unknown parent match {}".format(parent_match))
+        self.parent_match = parent_match
+        self.cells = {}
+        # key -> (insertion order, bounding box) like a dict update
+        self.boxes = {}
+
+    def add(self, key, bbox):
+        order = self.boxes[key][0] if key in self.boxes else len(self.boxes)
+        self.boxes[key] = (order, bbox)
+        for column in range(_cell(bbox["x_min"]), _cell(bbox["x_max"]) + 1):
+            for row in range(_cell(bbox["y_min"]), _cell(bbox["y_max"]) + 1):
+                self.cells.setdefault((column, row), []).append((key, bbox))
+
+    def parent_id(self, bbox):
+        cell = self.cells.get((_cell(bbox["x_min"]), _cell(bbox["y_min"])), ())
+        # entries of a replaced box are skipped
+        parents = [key for key, outer in cell
+                   if self.boxes[key][1] is outer and is_inside(bbox, outer)]
+        if not parents:
+            return 0
+        if self.parent_match == SMALLEST_MATCH:
+            return min(parents, key=lambda key: (
+                box_area(self.boxes[key][1]), self.boxes[key][0]))
+        return min(parents, key=lambda key: self.boxes[key][0])
 
 def print_object(obj):
     print("  - Object {}: {}".format(obj["id"], obj["label"]))
@@ -63,14 +129,14 @@ def print_object(obj):
     print("    - Text: {} {}".format(len(obj["text"]),obj["text"]))
 
 
-def process(results, reclassify_interval):
+def process(results, reclassify_interval, parent_match=FIRST_MATCH):
     product_key = ("classification_layer_name:efficientnet-b0/model/head/" +
                    "dense/BiasAdd/Add")
     text_keys = ["inference_layer_name:logits",
                  "inference_layer_name:shadow/LSTMLayers/" +
                  "transpose_time_major",
                  "inference_layer_name:shadow/LSTMLayers/Reshape_1"]
-    detections = {}
+    detections = RegionIndex(parent_match)
     objects = {}
     inferenceCounts.detection += 1
     # Needed for additional entries like non-inference results like
@@ -92,7 +158,7 @@ def process(results, reclassify_interval):
                 "barcode": None,
                 "bounding_box": detection["bounding_box"]
             }
-            detections[region_id] = detection
+            detections.add(region_id, detection["bounding_box"])
         if product_key in result:
             product = result[product_key]["label"][10:]
             objects[region_id]["product"] = product
@@ -102,7 +168,7 @@ def process(results, reclassify_interval):
                 barcode = barcode[:-len("_tracked")]
             else:
                 inferenceCounts.barcode+=1
-            parent_id = get_parent_id(detections, detection)
+            parent_id = detections.parent_id(detection["bounding_box"])
             if parent_id:
                 objects[parent_id]["barcode"] = barcode
         for text_key in text_keys:
@@ -110,7 +176,8 @@ def process(results, reclassify_interval):
                 text = result[text_key]["label"]
                 inferenceCounts.text_detection+=1
                 inferenceCounts.text_recognition+=1
-                parent_id = get_parent_id(detections, detection)
+                parent_id = detections.parent_id(
+                    detection["bounding_box"])
                 if parent_id:
                     objects[parent_id]["text"].append(text)
 
@@ -133,18 +200,19 @@ def update_tracked_object(obj, tracked_objects):
             updates)
 
 
-def process_file(results_root, file, stream_index, reclassify_interval):
+def process_file(results_root, file, stream_index, reclassify_interval,
+                 parent_match=FIRST_MATCH):
     if file:
         filename = file
     else:
         filename = os.path.join(results_root, "/r{}.jsonl".
                                 format(stream_index))
-    with open(filename, "r") as file:
+    with log_io.open_log(filename) as file:
         global frame_count
         for line in file:
             try:
                 results = json.loads(line)
-                process(results, reclassify_interval)
+                process(results, reclassify_interval, parent_match)
                 frame_count += 1
             except Exception as e:
                 print("Error: {}".format(e))
@@ -164,28 +232,35 @@ def on_connect(client, user_data, _unused_flags, return_code):
         sys.exit(1)
 
 
-def on_message(_unused_client, user_data, msg):
+def on_message(_unused_client, user_data, msg, reclassify_interval=1,
+               parent_match=FIRST_MATCH):
     results = json.loads(msg.payload)
-    process(results)
+    process(results, reclassify_interval, parent_match)
 
 
-def process_mqtt(broker_address, broker_port):
+def process_mqtt(broker_address, broker_port, reclassify_interval=1,
+                 parent_match=FIRST_MATCH):
+    import paho.mqtt.client as mqtt
     client = mqtt.Client("Gulfstream")
     client.on_connect = on_connect
-    client.on_message = on_message
+    client.on_message = partial(on_message,
+                                reclassify_interval=reclassify_interval,
+                                parent_match=parent_match)
     client.connect(broker_address, broker_port)
     client.loop_forever()
 
 
 def main(mode, stream_index=0, file="", min_detections=15,
          reclassify_interval=1, broker_address="localhost", broker_port=1883,
-         results_root=os.path.join(os.path.curdir, 'results')):
+         results_root=os.path.join(os.path.curdir, 'results'),
+         parent_match=FIRST_MATCH):
     try:
         if mode == "file":
-            process_file(results_root, file, stream_index, reclassify_interval)
+            process_file(results_root, file, stream_index, reclassify_interval,
+                         parent_match)
         else:
-            import paho.mqtt.client as mqtt
-            process_mqtt(broker_address, broker_port)
+            process_mqtt(broker_address, broker_port, reclassify_interval,
+                         parent_match)
         text_count = 0
         barcode_count = 0
         results = {"frame": frame_count}
@@ -230,4 +305,5 @@ def main(mode, stream_index=0, file="", min_detections=15,
 if __name__ == "__main__":
     args = parse_args()
     main(args.mode, args.file, args.min_detections, args.reclassify_interval,
-         args.broker_address, args.broker_port)
+         args.broker_address, args.broker_port,
+         parent_match=args.parent_match)
@@ -0,0 +1,72 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import random
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import results_parser
+
+
+def box(x_min, y_min, x_max, y_max):
+    return {"x_min": x_min, "y_min": y_min, "x_max": x_max, "y_max": y_max}
+
+
+class Testing(unittest.TestCase):
+
+    def test_region_index_matches_linear_scan(self):
+        rng = random.Random(7)
+        detections = {}
+        index = {mode: results_parser.RegionIndex(mode)
+                 for mode in results_parser.PARENT_MATCH_MODES}
+        for region_id in range(1, 300):
+            x, y = rng.random(), rng.random()
+            bbox = box(x, y, min(x + rng.random() / 2, 1.0),
+                       min(y + rng.random() / 2, 1.0))
+            detections[region_id] = {"bounding_box": bbox}
+            for mode_index in index.values():
+                mode_index.add(region_id, bbox)
+        # a replaced box keeps its place like in a dict
+        detections[5] = {"bounding_box": box(0.0, 0.0, 1.0, 1.0)}
+        for mode_index in index.values():
+            mode_index.add(5, detections[5]["bounding_box"])
+        for _ in range(300):
+            x, y = rng.random(), rng.random()
+            inner = {"bounding_box": box(x, y, min(x + 0.05, 1.0),
+                                         min(y + 0.05, 1.0))}
+            for mode, mode_index in index.items():
+                with self.subTest(mode=mode):
+                    self.assertEqual(
+                        mode_index.parent_id(inner["bounding_box"]),
+                        results_parser.get_parent_id(detections, inner, mode))
+
+    def test_parent_match(self):
+        index = results_parser.RegionIndex()
+        self.assertEqual(index.parent_id(box(0.1, 0.1, 0.2, 0.2)), 0)
+        index.add(1, box(0.0, 0.0, 1.0, 1.0))
+        index.add(2, box(0.05, 0.05, 0.3, 0.3))
+        self.assertEqual(index.parent_id(box(0.1, 0.1, 0.2, 0.2)), 1)
+        index = results_parser.RegionIndex(results_parser.SMALLEST_MATCH)
+        index.add(1, box(0.0, 0.0, 1.0, 1.0))
+        index.add(2, box(0.05, 0.05, 0.3, 0.3))
+        self.assertEqual(index.parent_id(box(0.1, 0.1, 0.2, 0.2)), 2)
+        self.assertEqual(index.parent_id(box(0.1, 0.1, 0.5, 0.5)), 1)
+        with self.assertRaises(ValueError):
+            results_parser.RegionIndex("largest")
+
+    def test_on_message_uses_parent_match(self):
+        msg = SimpleNamespace(payload=json.dumps({"objects": []}))
+        with patch.object(results_parser, 'process') as process:
+            results_parser.on_message(
+                None, None, msg, reclassify_interval=2,
+                parent_match=results_parser.SMALLEST_MATCH)
+        process.assert_called_once_with(
+            {"objects": []}, 2, results_parser.SMALLEST_MATCH)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import contextlib
+import contextvars
+import sys
+import threading
+
+# the log file of the run executing in the current thread or task
+_current_log = contextvars.ContextVar("run_log", default=None)
+_install_lock = threading.Lock()
+
+
+class _ContextStream:
+    '''
+    stands in for sys.stdout/sys.stderr and writes to the log of the
+    current run, or to the original stream outside of any run
+    '''
+    def __init__(self, stream):
+        self._stream = stream
+
+    def _target(self):
+        log = _current_log.get()
+        return log if log is not None else self._stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+def _install():
+    with _install_lock:
+        if not isinstance(sys.stdout, _ContextStream):
+            sys.stdout = _ContextStream(sys.stdout)
+        if not isinstance(sys.stderr, _ContextStream):
+            sys.stderr = _ContextStream(sys.stderr)
+
+
+@contextlib.contextmanager
+def logging_to(path):
+    '''
+    sends the print output of the current thread to a log file
+
+    Unlike swapping sys.stdout, runs in other threads keep their own
+    output, so several runs can log to their own files in one process.
+    Threads started inside the block do not inherit the log.
+
+    Args:
+        path: log file to append to
+    '''
+    _install()
+    with open(path, 'a') as log:
+        token = _current_log.set(log)
+        try:
+            yield log
+        finally:
+            _current_log.reset(token)
+
+
+def current_log():
+    '''
+    returns the log file of the current run or None
+    '''
+    return _current_log.get()
@@ -0,0 +1,51 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import run_log
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_concurrent_run_logs(self):
+        barrier = threading.Barrier(2)
+
+        def run(name):
+            with run_log.logging_to(
+                    os.path.join(self.test_dir, name + '.log')):
+                # both runs log at the same time
+                barrier.wait()
+                for i in range(100):
+                    print(f"{name} {i}")
+                barrier.wait()
+
+        threads = [threading.Thread(target=run, args=(name,))
+                   for name in ('first', 'second')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for name in ('first', 'second'):
+            with open(os.path.join(self.test_dir, name + '.log')) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 100)
+            self.assertTrue(all(line.startswith(name) for line in lines))
+        self.assertIsNone(run_log.current_log())
+
+
+if __name__ == '__main__':
+    unittest.main()
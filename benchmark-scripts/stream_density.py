@@ -5,11 +5,19 @@
 '''
 
 import os
+import json
+import shutil
 import time
+from dataclasses import dataclass, field
 import benchmark
+import cgroup_stats
 import glob
-import sys
-import re
+import gst_tracer_parser
+import log_io
+import metrics_client
+import run_log
+import stream_stability
+import thermal
 
 # Constants:
 TARGET_FPS_KEY = "TARGET_FPS"
@@ -17,14 +25,39 @@ CONTAINER_NAME_KEY = "CONTAINER_NAME"
 PIPELINE_INCR_KEY = "PIPELINE_INC"
 INIT_DURATION_KEY = "INIT_DURATION"
 RESULTS_DIR_KEY = "RESULTS_DIR"
+# seconds to wait after compose down for the containers to clean up
+TEARDOWN_DURATION_KEY = "TEARDOWN_DURATION"
+DEFAULT_TEARDOWN_DURATION = 10
+# seconds to wait for the pipeline log files of an iteration to show up
+LOG_WAIT_DURATION_KEY = "LOG_WAIT_DURATION"
+DEFAULT_LOG_WAIT_DURATION = 50
+# optional package power budget in watts an iteration has to stay within
+POWER_BUDGET_KEY = "POWER_BUDGET"
 DEFAULT_TARGET_FPS = 14.95
 MAX_GUESS_INCREMENTS = 5
+# every stream density iteration writes its logs into its own
+# <results_dir>/iteration_<container_name>_<NNN> directory
+ITERATION_DIR_PREFIX = "iteration_"
+ITERATION_MANIFEST = "manifest.json"
 
 
 class ArgumentError(Exception):
     pass
 
 
+@dataclass
+class StreamDensityResult:
+    '''
+    the stream density found for one target FPS and container
+    '''
+    target_fps: float
+    container_name: str
+    num_pipelines: int
+    meets_target_fps: bool
+    # manifests of the iterations in iteration order
+    iterations: list = field(default_factory=list)
+
+
 def is_env_non_empty(env_vars, key):
     '''
     checks if the environment variable dict env_vars is not empty
@@ -52,7 +85,8 @@ def clean_up_pipeline_logs(results_dir):
     Args:
         results_dir: directory holding the benchmark results
     '''
-    matching_files = glob.glob(os.path.join(results_dir, 'pipeline*_*.log'))
+    matching_files = log_io.glob_logs(
+        os.path.join(results_dir, 'pipeline*_*.log'))
     if len(matching_files) > 0:
         for log_file in matching_files:
             os.remove(log_file)
@@ -60,6 +94,81 @@ def clean_up_pipeline_logs(results_dir):
         print('INFO: no match files to clean up')
 
 
+def iteration_dir_path(results_dir, container_name, iteration):
+    '''
+    returns the results directory of one stream density iteration
+    Args:
+        results_dir: directory holding the benchmark results
+        container_name: the name of the container the iteration runs
+        iteration: zero based iteration number
+    '''
+    return os.path.join(
+        results_dir,
+        f"{ITERATION_DIR_PREFIX}{container_name}_{iteration:03d}")
+
+
+def clean_up_iteration_dirs(results_dir, container_name):
+    '''
+    removes the iteration directories a previous stream density run
+    left for container_name under results_dir
+    Args:
+        results_dir: directory holding the benchmark results
+        container_name: the name of the container of the iterations
+    '''
+    pattern = os.path.join(
+        results_dir, f"{ITERATION_DIR_PREFIX}{container_name}_[0-9]*")
+    for iteration_dir in glob.glob(pattern):
+        if os.path.isdir(iteration_dir):
+            shutil.rmtree(iteration_dir)
+
+
+def make_iteration_dir(results_dir, container_name, iteration):
+    '''
+    creates the results directory of one stream density iteration
+    Args:
+        results_dir: directory holding the benchmark results
+        container_name: the name of the container the iteration runs
+        iteration: zero based iteration number
+    Returns:
+        path of the created directory
+    '''
+    iteration_dir = iteration_dir_path(results_dir, container_name, iteration)
+    os.makedirs(iteration_dir, exist_ok=True)
+    return iteration_dir
+
+
+def write_iteration_manifest(iteration_dir, manifest):
+    '''
+    writes the manifest with the measured results of an iteration
+    Args:
+        iteration_dir: results directory of the iteration
+        manifest: dict of the iteration results
+    '''
+    with open(os.path.join(iteration_dir, ITERATION_MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+
+def load_density_trace(results_dir, container_name=None):
+    '''
+    loads the manifests of all stream density iterations in results_dir
+    Args:
+        results_dir: directory holding the benchmark results
+        container_name: optional container name to filter on
+    Returns:
+        list of manifest dicts in iteration order per container
+    '''
+    pattern = ITERATION_DIR_PREFIX + (
+        f"{container_name}_[0-9]*" if container_name else "*")
+    trace = []
+    for manifest_file in glob.glob(
+            os.path.join(results_dir, pattern, ITERATION_MANIFEST)):
+        with open(manifest_file) as f:
+            trace.append(json.load(f))
+    trace.sort(key=lambda manifest: (
+        manifest.get("container_name", ""), manifest.get("iteration", 0)))
+    return trace
+
+
 def check_non_empty_result_logs(num_pipelines, results_dir,
                                 container_name, max_retries=5):
     '''
@@ -82,7 +191,7 @@ def check_non_empty_result_logs(num_pipelines, results_dir,
                     pipelines may have been failed...""")
         print("INFO: checking presence of all pipeline log files... " +
               "retry: {}".format(retry))
-        matching_files = glob.glob(os.path.join(
+        matching_files = log_io.glob_logs(os.path.join(
             results_dir, f'pipeline*_{container_name}*.log'))
         if len(matching_files) >= num_pipelines and all([
               os.path.isfile(file) and os.path.getsize(file) > 0
@@ -112,6 +221,9 @@ def get_latest_pipeline_logs(num_pipelines, pipeline_log_files):
         is more than num_pipelines; otherwise whatever the number
         of the matching files will be returned
     '''
+    if len(pipeline_log_files) <= num_pipelines:
+        # nothing to choose from, e.g. with one directory per iteration
+        return list(pipeline_log_files)
     timestamp_files = [
         (file, os.path.getmtime(file)) for file in pipeline_log_files]
     # sort timestamp_file by time in descending order
@@ -121,62 +233,97 @@ def get_latest_pipeline_logs(num_pipelines, pipeline_log_files):
         file for file, mtime in sorted_timestamp[:num_pipelines]]
     return latest_files
 
-def calculate_pipeline_latency(num_pipelines, results_dir, container_name):
-    total_pipeline_latency = 0.0
-    total_pipeline_latency_per_stream = 0.0
-    matching_files = glob.glob(os.path.join(
+
+def parse_latest_tracer_logs(num_pipelines, results_dir, container_name):
+    '''
+    parses the latency tracer records of the latest gst-launch log files
+    Args:
+        num_pipelines: number of currently running pipelines
+        results_dir: directory holding the benchmark results
+        container_name: the name of the container to match in log files,
+                        expected to be part of the filename pattern
+                        after the underscore (_)
+    Returns:
+        list of gst_tracer_parser.TracerLog, one per readable log file
+    '''
+    matching_files = log_io.glob_logs(os.path.join(
         results_dir, f'gst-launch*_{container_name}*.log'))
     print(f"DEBUG: num. of gst launch matching_files = {len(matching_files)}")
     latest_latency_logs = get_latest_pipeline_logs(
         num_pipelines, matching_files)
-    
-    pipeline_count = 0
+
+    tracer_logs = []
     for latency_file in latest_latency_logs:
-        pipeline_latency = 0.0
         try:
-            with open(latency_file) as f:
-                last_latency_line = None
-                chunk_size = 8192  # Read in 8KB chunks
-                buffer = ""
-                
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    
-                    buffer += chunk
-                    lines = buffer.split('\n')
-                    buffer = lines[-1]  # Keep incomplete line in buffer
-                    
-                    # Process complete lines
-                    for line in lines[:-1]:
-                        if "latency_tracer_pipeline" in line:
-                            last_latency_line = line
-                
-                # Process any remaining content in buffer
-                if buffer and "latency_tracer_pipeline" in buffer:
-                    last_latency_line = buffer
-                
-                if last_latency_line:
-                    match = re.search(r'avg=\(double\)([0-9]*\.?[0-9]+)', last_latency_line)
-                    if match:
-                        pipeline_latency = float(match.group(1))
-            
-            if pipeline_latency > 0:
-                total_pipeline_latency += pipeline_latency
-                pipeline_count += 1
-                print(f"DEBUG: Added latency {pipeline_latency} from {latency_file}")
-                
+            tracer_logs.append(
+                gst_tracer_parser.parse_tracer_log(latency_file))
         except (IOError, ValueError) as e:
             print(f"WARN: Error processing {latency_file}: {e}")
-            continue
-    
+    return tracer_logs
+
+
+def calculate_pipeline_latency(num_pipelines, results_dir, container_name,
+                               tracer_logs=None):
+    '''
+    calculates the pipeline latency from the latency tracer records
+    of the current running num_pipelines
+    Args:
+        num_pipelines: number of currently running pipelines
+        results_dir: directory holding the benchmark results
+        container_name: the name of the container to match in log files,
+                        expected to be part of the filename pattern
+                        after the underscore (_)
+        tracer_logs: already parsed tracer logs to use instead of
+                     reading the log files again
+    Returns:
+        total_pipeline_latency: accumulative average latency in ms
+        total_pipeline_latency_per_stream: the averaged latency per pipeline
+    '''
+    total_pipeline_latency = 0.0
+    total_pipeline_latency_per_stream = 0.0
+    if tracer_logs is None:
+        tracer_logs = parse_latest_tracer_logs(
+            num_pipelines, results_dir, container_name)
+
+    pipeline_count = 0
+    for tracer_log in tracer_logs:
+        pipeline_latency = gst_tracer_parser.last_average_latency(tracer_log)
+        if pipeline_latency > 0:
+            total_pipeline_latency += pipeline_latency
+            pipeline_count += 1
+            print(f"DEBUG: Added latency {pipeline_latency} "
+                  f"from {tracer_log.path}")
+
     if pipeline_count > 0:
-        total_pipeline_latency_per_stream = total_pipeline_latency / pipeline_count
-    
-    print(f"DEBUG: Total latency: {total_pipeline_latency}, Per stream: {total_pipeline_latency_per_stream}")
+        total_pipeline_latency_per_stream = \
+            total_pipeline_latency / pipeline_count
+
+    print(f"DEBUG: Total latency: {total_pipeline_latency}, "
+          f"Per stream: {total_pipeline_latency_per_stream}")
     return total_pipeline_latency, total_pipeline_latency_per_stream
-    
+
+
+def report_element_latency(tracer_logs):
+    '''
+    prints the per-element latency ranking across all pipelines so the
+    stream density log shows where the pipeline time is spent
+    Args:
+        tracer_logs: parsed tracer logs of the running pipelines
+    Returns:
+        list of gst_tracer_parser.ElementLatency sorted by share
+    '''
+    ranking = gst_tracer_parser.aggregate_element_latency(tracer_logs)
+    if not ranking:
+        print("INFO: no element latency records found")
+        return ranking
+    print("Element latency breakdown (share of total element latency):")
+    for element in ranking:
+        print(f"  {element.name}: {element.mean_latency:.3f} ms "
+              f"({element.share:.1f}%) over {element.frames} frames")
+    print(f"Latency bottleneck element: {ranking[0].name}")
+    return ranking
+
+
 def calculate_total_fps(num_pipelines, results_dir, container_name):
     '''
     calculates averaged fps from the current running num_pipelines
@@ -192,17 +339,16 @@ def calculate_total_fps(num_pipelines, results_dir, container_name):
     '''
     total_fps = 0
     total_fps_per_stream = 0
-    matching_files = glob.glob(os.path.join(
+    matching_files = log_io.glob_logs(os.path.join(
         results_dir, f'pipeline*_{container_name}*.log'))
     print(f"DEBUG: num. of matching_files = {len(matching_files)}")
     latest_pipeline_logs = get_latest_pipeline_logs(
         num_pipelines, matching_files)
     for pipeline_file in latest_pipeline_logs:
         print(f"DEBUG: in for loop pipeline_file:{pipeline_file}")
-        with open(pipeline_file, "r") as file:
-            stream_fps_list = [
-                fps for fps in
-                file.readlines()[-20:] if 'na' not in fps]
+        stream_fps_list = [
+            fps for fps in
+            log_io.tail_lines(pipeline_file, 20) if 'na' not in fps]
         if not stream_fps_list:
             print(f"WARN: No FPS returned from {pipeline_file}")
             continue
@@ -247,9 +393,156 @@ def validate_and_setup_env(env_vars, target_fps_list):
         env_vars[INIT_DURATION_KEY] = "120"
 
 
+def energy_efficiency(total_fps, power):
+    '''
+    relates the total fps of an iteration to the package power measured
+    over the same settled window
+    Args:
+        total_fps: total fps of all pipelines
+        power: mean package power in watts, None when not measured
+    Returns:
+        dict with power_watts, fps_per_watt and joules_per_frame, None
+        values when the power or the fps is missing
+    '''
+    efficiency = {"power_watts": power, "fps_per_watt": None,
+                  "joules_per_frame": None}
+    if power is not None and power > 0 and total_fps > 0:
+        efficiency["fps_per_watt"] = total_fps / power
+        efficiency["joules_per_frame"] = power / total_fps
+    return efficiency
+
+
+def within_power_budget(measurement, power_budget):
+    '''
+    returns whether a measured iteration stayed within the power budget,
+    iterations without a power reading fail it since the budget cannot
+    be checked
+    '''
+    if not power_budget:
+        return True
+    power = measurement.get("power_watts")
+    if power is None:
+        print(f"ERROR: no package power measured, the {power_budget} W "
+              f"power budget cannot be checked; the platform collector "
+              f"needs RAPL, PCM or igt power readings")
+        return False
+    return power <= power_budget
+
+
+def most_efficient_iteration(manifests):
+    '''
+    returns the manifest of the iteration with the most fps per watt
+    that met its target FPS, None without power measurements
+    '''
+    candidates = [manifest for manifest in manifests
+                  if manifest.get("fps_per_watt") is not None
+                  and manifest.get("meets_target_fps", True)]
+    return max(candidates, key=lambda manifest: manifest["fps_per_watt"],
+               default=None)
+
+
+def measure_iteration(env_vars, results_dir, iteration_dir, container_name,
+                      num_pipelines, settle_seconds, window_seconds,
+                      target_fps=None):
+    '''
+    measures the throughput, latency and resource usage of the pipelines
+    started for one iteration
+    Args:
+        env_vars: Environment variables for docker compose.
+        results_dir: directory holding the benchmark results
+        iteration_dir: results directory of the iteration
+        container_name: the name of the container to match in log files
+        num_pipelines: number of currently running pipelines
+        settle_seconds: time to wait before the measurement window
+        window_seconds: length of the cgroup and host utilization
+                        measurement window
+        target_fps: optional target FPS the stream stability is judged
+                    against
+    Returns:
+        dict of the iteration measurements for its manifest
+    Raises:
+        ValueError: when the pipeline log files do not show up
+    '''
+    start_time = time.time()
+    print("waiting for pipelines to settle...")
+    time.sleep(settle_seconds)
+    pipeline_cgroups = cgroup_stats.find_pipeline_cgroups(container_name)
+    collector_cgroups = cgroup_stats.find_collector_cgroups()
+    cgroup_start = cgroup_stats.snapshot_cgroups(pipeline_cgroups)
+    collector_start = cgroup_stats.snapshot_cgroups(collector_cgroups)
+    # the collector's rolling windows are collected over the same
+    # settled period, however much longer it is than one hub window
+    host_utilization = metrics_client.measure_window(
+        results_dir, window_seconds, metrics_client.HOST_METRICS,
+        env_vars.get(metrics_client.METRICS_PORT_KEY))
+    cgroup_end = cgroup_stats.snapshot_cgroups(pipeline_cgroups)
+    collector_end = cgroup_stats.snapshot_cgroups(collector_cgroups)
+    if host_utilization:
+        print(f"Host utilization %: {host_utilization}")
+    # note: before reading the pipeline log files
+    # we want to give pipelines some time as the log files
+    # producing could be lagging behind...
+    check_non_empty_result_logs(
+        num_pipelines, iteration_dir, container_name,
+        int(env_vars.get(LOG_WAIT_DURATION_KEY)
+            or DEFAULT_LOG_WAIT_DURATION))
+    # once we have all non-empty pipeline log files
+    # we then can calculate the average fps
+    total_fps, total_fps_per_stream = calculate_total_fps(
+        num_pipelines, iteration_dir, container_name)
+    print('container name:', container_name)
+    print('Total FPS:', total_fps)
+    print(f"Total averaged FPS per stream: {total_fps_per_stream} "
+          f"for {num_pipelines} pipeline(s)")
+    # the mean of the last samples hides streams that oscillate or stall
+    stability = stream_stability.iteration_stability(
+        get_latest_pipeline_logs(num_pipelines, log_io.glob_logs(
+            os.path.join(iteration_dir, f'pipeline*_{container_name}*.log'))),
+        target_fps, env_vars)
+
+    tracer_logs = parse_latest_tracer_logs(
+        num_pipelines, iteration_dir, container_name)
+    total_pipeline_latency, total_pipeline_latency_per_stream = \
+        calculate_pipeline_latency(
+            num_pipelines, iteration_dir, container_name, tracer_logs)
+    print(f"Total Pipeline Latency: {total_pipeline_latency} "
+          f"for {num_pipelines} pipeline(s)")
+    print(f"Total Pipeline Latency per stream: "
+          f"{total_pipeline_latency_per_stream} "
+          f"for {num_pipelines} pipeline(s)")
+    element_latency = report_element_latency(tracer_logs)
+    resource_usage = cgroup_stats.summarize_usage(
+        cgroup_stats.usage_between(cgroup_start, cgroup_end),
+        num_pipelines, total_fps,
+        cgroup_stats.usage_between(collector_start, collector_end))
+    print(f"Pipeline resource usage: "
+          f"{cgroup_stats.format_summary(resource_usage)} "
+          f"for {num_pipelines} pipeline(s)")
+    # the pipeline fps is averaged over the whole iteration, so any
+    # throttling since the pipelines started may have lowered it
+    throttling = thermal.iteration_throttling(
+        results_dir, start_time, time.time())
+    return {
+        "total_fps": total_fps,
+        "fps_per_stream": total_fps_per_stream,
+        "total_latency": total_pipeline_latency,
+        "latency_per_stream": total_pipeline_latency_per_stream,
+        "element_latency": [
+            {"name": element.name,
+             "mean_latency": element.mean_latency,
+             "share": element.share}
+            for element in element_latency],
+        "resource_usage": resource_usage,
+        "host_utilization": host_utilization,
+        "stability": stability,
+        **energy_efficiency(total_fps, host_utilization.get("power")),
+        **throttling,
+    }
+
+
 def run_pipeline_iterations(
         env_vars, compose_files, results_dir,
-        container_name, target_fps):
+        container_name, target_fps, compose=None, on_iteration=None):
     '''
     runs an iteration of stream density benchmarking for
     a given container name and target FPS.
@@ -259,39 +552,71 @@ def run_pipeline_iterations(
         results_dir: Directory for storing results.
         container_name: Name of the container to run.
         target_fps: Target FPS to achieve.
+        compose: callable with the signature of
+                 benchmark.docker_compose_containers to run compose
+                 commands with, the docker compose CLI by default
+        on_iteration: optional callable receiving the manifest of every
+                      finished iteration
     Returns:
         num_pipelines: Number of pipelines used.
         meet_target_fps: Whether the target FPS was achieved.
     '''
+    compose = compose or benchmark.docker_compose_containers
     INIT_DURATION = int(env_vars[INIT_DURATION_KEY])
     num_pipelines = 1
     in_decrement = False
     increments = 1
     meet_target_fps = False
+    iteration = 0
+    power_budget = float(env_vars.get(POWER_BUDGET_KEY) or 0)
 
     # clean up any residual pipeline log files before starts:
     clean_up_pipeline_logs(results_dir)
+    clean_up_iteration_dirs(results_dir, container_name)
     print(
         f"INFO: Stream density TARGET_FPS set for {target_fps} "
         f"with container_name {container_name} "
         f"and INIT_DURATION set for {INIT_DURATION} seconds")
+    if power_budget:
+        print(f"INFO: Stream density POWER_BUDGET set for "
+              f"{power_budget} W")
 
     while not meet_target_fps:
         env_vars["PIPELINE_COUNT"] = str(num_pipelines)
+        # the pipelines of this iteration log into their own directory,
+        # so only this iteration's logs have to be read back
+        iteration_dir = make_iteration_dir(
+            results_dir, container_name, iteration)
+        iteration_env = env_vars.copy()
+        iteration_env[RESULTS_DIR_KEY] = iteration_dir
+        manifest = {
+            "container_name": container_name,
+            "iteration": iteration,
+            "num_pipelines": num_pipelines,
+            "target_fps": target_fps,
+            "start_time": time.time(),
+        }
+        iteration += 1
         print(f"Starting num. of pipelines: {num_pipelines}")
-        benchmark.docker_compose_containers(
+        compose(
             "up", compose_files=compose_files,
-            compose_post_args="-d", env_vars=env_vars)
-        print("waiting for pipelines to settle...")
-        time.sleep(INIT_DURATION)
-        # note: before reading the pipeline log files
-        # we want to give pipelines some time as the log files
-        # producing could be lagging behind...
+            compose_post_args="-d", env_vars=iteration_env)
+        # the end of the settle time doubles as the window in which
+        # the cgroup usage of the pipeline containers is measured
+        cgroup_window = cgroup_stats.measurement_window(
+            env_vars, INIT_DURATION)
         try:
-            check_non_empty_result_logs(
-                num_pipelines, results_dir, container_name, 50)
+            measurement = measure_iteration(
+                env_vars, results_dir, iteration_dir, container_name,
+                num_pipelines, INIT_DURATION - cgroup_window, cgroup_window,
+                target_fps=target_fps)
         except ValueError as e:
             print(f"ERROR: {e}")
+            manifest["end_time"] = time.time()
+            manifest["error"] = str(e)
+            write_iteration_manifest(iteration_dir, manifest)
+            if on_iteration:
+                on_iteration(manifest)
             # since we are not able to get all non-empty log
             # the best we can do is to use the previous num_pipelines
             # before this current num_pipelines
@@ -299,25 +624,25 @@ def run_pipeline_iterations(
             if num_pipelines < 1:
                 num_pipelines = 1
             return num_pipelines, False
-        # once we have all non-empty pipeline log files
-        # we then can calculate the average fps
-        total_fps, total_fps_per_stream = calculate_total_fps(
-            num_pipelines, results_dir, container_name)
-        print('container name:', container_name)
-        print('Total FPS:', total_fps)
-        print(f"Total averaged FPS per stream: {total_fps_per_stream} "
-              f"for {num_pipelines} pipeline(s)")
-        
-        total_pipeline_latency, total_pipeline_latency_per_stream = calculate_pipeline_latency(
-            num_pipelines, results_dir, container_name)
-        print(f"Total Pipeline Latency: {total_pipeline_latency} "
-        f"for {num_pipelines} pipeline(s)")
-        print(f"Total Pipeline Latency per stream: "
-        f"{total_pipeline_latency_per_stream} "
-        f"for {num_pipelines} pipeline(s)")
+        total_fps_per_stream = measurement["fps_per_stream"]
+        # a power capped search treats an iteration over the budget,
+        # like one with unstable streams, as one below the target FPS
+        meets_target = (total_fps_per_stream >= target_fps and
+                        within_power_budget(measurement, power_budget) and
+                        measurement.get("stability", {}).get("stable", True))
+        manifest.update(measurement)
+        manifest.update({
+            "end_time": time.time(),
+            "meets_target_fps": meets_target,
+        })
+        if power_budget:
+            manifest["power_budget"] = power_budget
+        write_iteration_manifest(iteration_dir, manifest)
+        if on_iteration:
+            on_iteration(manifest)
         
         if not in_decrement:
-            if total_fps_per_stream >= target_fps:
+            if meets_target:
                 # if the increments hint from $PIPELINE_INC is not empty
                 # we will use it as the increments
                 # otherwise, we will try to adjust increments dynamically
@@ -337,11 +662,12 @@ def run_pipeline_iterations(
                 increments = -1
                 in_decrement = True
                 print(
-                    f"Below target fps {target_fps}, "
-                    f"starting to decrement pipelines by 1...")
+                    f"Below target fps {target_fps}"
+                    + (f" or over {power_budget} W" if power_budget else "")
+                    + ", starting to decrement pipelines by 1...")
         else:
             # in decrementing case:
-            if total_fps_per_stream >= target_fps:
+            if meets_target:
                 print(
                     f"found maximum number of pipelines to reach "
                     f"target FPS {target_fps}")
@@ -380,7 +706,8 @@ def run_pipeline_iterations(
 
 
 def run_stream_density(env_vars, compose_files, target_fps_list,
-                       container_names_list):
+                       container_names_list, compose=None,
+                       on_iteration=None):
     '''
     runs stream density using docker compose for the specified target FPS
     values and the corresponding container names
@@ -391,6 +718,10 @@ def run_stream_density(env_vars, compose_files, target_fps_list,
         target_fps_list: list of target FPS values for stream density
         container_names_list: list of container names for
                               the corresponding target FPS
+        compose: callable to run compose commands with, see
+                 run_pipeline_iterations
+        on_iteration: optional callable receiving the manifest of every
+                      finished iteration
     Returns:
         results as a list of tuples (target_fps, container_name,
                                      num_pipelines, meet_target_fps) where
@@ -400,17 +731,15 @@ def run_stream_density(env_vars, compose_files, target_fps_list,
         meet_target_fps: boolean to indicate whether the returned
         number_pipelines can achieve the TARGET_FPS goal or not
     '''
+    compose = compose or benchmark.docker_compose_containers
     results = []
     validate_and_setup_env(env_vars, target_fps_list)
     results_dir = env_vars[RESULTS_DIR_KEY]
     log_file_path = os.path.join(results_dir, 'stream_density.log')
-    orig_stdout = sys.stdout
-    orig_stderr = sys.stderr
-    try:
-        with open(log_file_path, 'a') as logger:
-            sys.stdout = logger
-            sys.stderr = logger
-
+    # the output of this run goes to its log, other runs in the same
+    # process keep their own output
+    with run_log.logging_to(log_file_path):
+        try:
             # loop through the target_fps list and find out the stream density:
             for target_fps, container_name in zip(
                 target_fps_list, container_names_list
@@ -424,7 +753,7 @@ def run_stream_density(env_vars, compose_files, target_fps_list,
                 try:
                     num_pipelines, meet_target_fps = run_pipeline_iterations(
                         env_vars, compose_files, results_dir,
-                        container_name, target_fps
+                        container_name, target_fps, compose, on_iteration
                     )
                     results.append(
                         (
@@ -436,22 +765,69 @@ def run_stream_density(env_vars, compose_files, target_fps_list,
                     )
                 finally:
                     # better to compose-down before the next iteration
-                    benchmark.docker_compose_containers(
+                    compose(
                         "down",
                         compose_files=compose_files,
                         env_vars=env_vars
                     )
+                    # pipelines are stopped, their logs can be compressed
+                    try:
+                        log_io.compress_logs(
+                            results_dir,
+                            list(log_io.PIPELINE_LOG_PATTERNS) + [
+                                os.path.join(
+                                    ITERATION_DIR_PREFIX + "*", pattern)
+                                for pattern in log_io.PIPELINE_LOG_PATTERNS],
+                            env_vars.get(log_io.LOG_COMPRESSION_KEY))
+                    except (log_io.CompressionError, OSError) as e:
+                        print(f"WARN: could not compress the logs: {e}")
                     # give some time for processes to clean up:
-                    time.sleep(10)
+                    time.sleep(float(
+                        env_vars.get(TEARDOWN_DURATION_KEY)
+                        or DEFAULT_TEARDOWN_DURATION))
 
             # end of for-loop
             print("stream_density done!")
-    except Exception as ex:
-        print(f'ERROR: found exception: {ex}')
-        raise
-    finally:
-        # reset sys stdout and err back to it's own
-        sys.stdout = orig_stdout
-        sys.stderr = orig_stderr
+        except Exception as ex:
+            print(f'ERROR: found exception: {ex}')
+            raise
 
     return results
+
+
+class StreamDensity:
+    '''
+    finds the maximum number of pipelines that keep a target FPS for
+    one or more containers
+    Args:
+        env_vars: environment variables for docker compose, including
+                  RESULTS_DIR and optionally INIT_DURATION/PIPELINE_INC
+        compose_files: the list of compose files to run pipelines
+        compose: callable to run compose commands with, see
+                 run_pipeline_iterations
+        on_iteration: optional callable receiving the manifest of every
+                      finished iteration
+    '''
+    def __init__(self, env_vars, compose_files, compose=None,
+                 on_iteration=None):
+        self.env_vars = dict(env_vars)
+        self.compose_files = list(compose_files)
+        self.compose = compose
+        self.on_iteration = on_iteration
+
+    def run(self, target_fps_list, container_names_list):
+        '''
+        runs stream density for every target FPS and container pair
+        Returns:
+            list of StreamDensityResult
+        '''
+        target_fps_list = list(target_fps_list)
+        results = run_stream_density(
+            self.env_vars, self.compose_files, target_fps_list,
+            list(container_names_list), self.compose, self.on_iteration)
+        results_dir = self.env_vars[RESULTS_DIR_KEY]
+        return [StreamDensityResult(
+                    target_fps, container_name, num_pipelines, met_fps,
+                    load_density_trace(results_dir, container_name))
+                for target_fps, container_name, num_pipelines, met_fps
+                in results]
@@ -17,6 +17,8 @@ from stream_density import (
     DEFAULT_TARGET_FPS
 )
 import os
+import shutil
+import tempfile
 
 
 class Testing(unittest.TestCase):
@@ -232,8 +234,21 @@ class Testing(unittest.TestCase):
     @patch('stream_density.calculate_total_fps')
     @patch('stream_density.check_non_empty_result_logs')
     @patch('stream_density.clean_up_pipeline_logs')
+    @patch('stream_density.clean_up_iteration_dirs')
+    @patch('stream_density.make_iteration_dir',
+           side_effect=stream_density.iteration_dir_path)
+    @patch('stream_density.write_iteration_manifest')
+    @patch('stream_density.cgroup_stats.find_pipeline_cgroups',
+           return_value={})
+    @patch('stream_density.cgroup_stats.find_collector_cgroups',
+           return_value={})
     def test_pipeline_iterations(
         self,
+        mock_find_collector_cgroups,
+        mock_find_cgroups,
+        mock_write_manifest,
+        mock_make_iteration_dir,
+        mock_clean_iteration_dirs,
         mock_clean_logs,
         mock_check_logs,
         mock_calculate_fps,
@@ -365,6 +380,132 @@ class Testing(unittest.TestCase):
                         meet_target_fps,
                         test_case["expected_meet_target_fps"])
 
+                # every iteration has its own results directory
+                manifest = mock_write_manifest.call_args[0][1]
+                self.assertEqual(
+                    mock_write_manifest.call_args[0][0],
+                    stream_density.iteration_dir_path(
+                        results_dir, container_name,
+                        manifest["iteration"]))
+                if "error" not in manifest:
+                    self.assertIn("resource_usage", manifest)
+                mock_find_cgroups.assert_called_with(container_name)
+                up_env = mock_docker_compose.call_args[1]["env_vars"]
+                self.assertEqual(
+                    up_env[RESULTS_DIR_KEY],
+                    mock_write_manifest.call_args[0][0])
+
+    def test_iteration_dirs_and_density_trace(self):
+        test_results_dir = tempfile.mkdtemp()
+        try:
+            for iteration in range(3):
+                iteration_dir = stream_density.make_iteration_dir(
+                    test_results_dir, 'abc', iteration)
+                stream_density.write_iteration_manifest(
+                    iteration_dir,
+                    {"container_name": "abc", "iteration": iteration,
+                     "num_pipelines": iteration + 1})
+            other_dir = stream_density.make_iteration_dir(
+                test_results_dir, 'abc_def', 0)
+            stream_density.write_iteration_manifest(
+                other_dir, {"container_name": "abc_def", "iteration": 0})
+
+            trace = stream_density.load_density_trace(
+                test_results_dir, 'abc')
+            self.assertEqual(
+                [manifest["num_pipelines"] for manifest in trace],
+                [1, 2, 3])
+            self.assertEqual(
+                len(stream_density.load_density_trace(test_results_dir)), 4)
+
+            stream_density.clean_up_iteration_dirs(test_results_dir, 'abc')
+            self.assertEqual(
+                stream_density.load_density_trace(test_results_dir, 'abc'),
+                [])
+            self.assertTrue(os.path.isdir(other_dir))
+        finally:
+            shutil.rmtree(test_results_dir)
+
+    def test_energy_efficiency(self):
+        efficiency = stream_density.energy_efficiency(120.0, 40.0)
+        self.assertEqual(efficiency, {"power_watts": 40.0,
+                                      "fps_per_watt": 3.0,
+                                      "joules_per_frame": 40.0 / 120.0})
+        self.assertIsNone(
+            stream_density.energy_efficiency(120.0, None)["fps_per_watt"])
+        self.assertTrue(stream_density.within_power_budget(
+            {"power_watts": 80.0}, None))
+        self.assertFalse(stream_density.within_power_budget(
+            {"power_watts": 80.0}, 60.0))
+        # a budget without a power reading is not met
+        self.assertFalse(stream_density.within_power_budget(
+            {"power_watts": None}, 60.0))
+        self.assertTrue(stream_density.within_power_budget(
+            {"power_watts": None}, None))
+        manifests = [
+            {"num_pipelines": 1, "fps_per_watt": 1.0,
+             "meets_target_fps": True},
+            {"num_pipelines": 2, "fps_per_watt": 1.5,
+             "meets_target_fps": True},
+            {"num_pipelines": 3, "fps_per_watt": 2.0,
+             "meets_target_fps": False},
+            {"num_pipelines": 4, "error": "missing pipeline logs"}]
+        self.assertEqual(stream_density.most_efficient_iteration(
+            manifests)["num_pipelines"], 2)
+        self.assertIsNone(stream_density.most_efficient_iteration([]))
+
+    @patch('stream_density.measure_iteration')
+    def test_power_budget_iterations(self, mock_measure):
+        def measure(env_vars, results_dir, iteration_dir, container_name,
+                    num_pipelines, settle_seconds, window_seconds,
+                    target_fps=None):
+            # every stream keeps its fps, the power limits the density
+            measurement = {"total_fps": 30.0 * num_pipelines,
+                           "fps_per_stream": 30.0}
+            measurement.update(stream_density.energy_efficiency(
+                30.0 * num_pipelines, 20.0 + 10.0 * num_pipelines))
+            return measurement
+        mock_measure.side_effect = measure
+        compose = MagicMock(return_value=("", "", 0))
+        test_results_dir = tempfile.mkdtemp()
+        try:
+            env_vars = {INIT_DURATION_KEY: "0",
+                        stream_density.TEARDOWN_DURATION_KEY: "0",
+                        stream_density.PIPELINE_INCR_KEY: "1",
+                        stream_density.POWER_BUDGET_KEY: "55"}
+            num_pipelines, met = stream_density.run_pipeline_iterations(
+                env_vars, [], test_results_dir, 'gst', 14.95,
+                compose=compose)
+            self.assertEqual((num_pipelines, met), (3, True))
+            trace = stream_density.load_density_trace(
+                test_results_dir, 'gst')
+            self.assertEqual(
+                [manifest["meets_target_fps"] for manifest in trace],
+                [True, True, True, False, True])
+            self.assertEqual(trace[3]["power_budget"], 55.0)
+        finally:
+            shutil.rmtree(test_results_dir)
+
+    def test_get_latest_pipeline_logs(self):
+        test_results_dir = tempfile.mkdtemp()
+        try:
+            log_files = []
+            for i, mtime in enumerate([100, 300, 200]):
+                log_file = os.path.join(
+                    test_results_dir, f'pipeline{i}_abc.log')
+                with open(log_file, 'w') as f:
+                    f.write('1.0\n')
+                os.utime(log_file, (mtime, mtime))
+                log_files.append(log_file)
+            self.assertEqual(
+                stream_density.get_latest_pipeline_logs(2, log_files),
+                [log_files[1], log_files[2]])
+            self.assertEqual(
+                stream_density.get_latest_pipeline_logs(3, log_files),
+                log_files)
+        finally:
+            shutil.rmtree(test_results_dir)
+
     @patch('time.sleep', return_value=None)
     @patch('stream_density.validate_and_setup_env')
     @patch('stream_density.run_pipeline_iterations')
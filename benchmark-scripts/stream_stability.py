@@ -0,0 +1,259 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+from dataclasses import dataclass
+import os
+
+import numpy as np
+import pandas as pd
+
+import log_io
+
+# the pipeline logs hold one fps value or "na" per second
+SAMPLE_PERIOD_SECONDS = 1.0
+# a stream has warmed up once its fps stays within this fraction of
+# its steady fps for WARMUP_SAMPLES samples in a row, start-up spikes
+# above the steady fps do not count
+WARMUP_TOLERANCE = 0.1
+WARMUP_SAMPLES = 3
+# a second below this fraction of the reference fps counts as stalled
+STALL_FRACTION = 0.1
+
+# thresholds of the density decision, empty disables a check
+MAX_CV_KEY = "STABILITY_MAX_CV"
+MAX_STALL_KEY = "STABILITY_MAX_STALL"
+MAX_BELOW_TARGET_KEY = "STABILITY_MAX_BELOW_TARGET"
+DEFAULT_MAX_CV = 0.2
+DEFAULT_MAX_STALL_SECONDS = 5.0
+DEFAULT_MAX_BELOW_TARGET_PERCENT = None
+
+
+def read_fps_log(path):
+    '''
+    reads the fps samples of a pipeline log, "na" becomes nan
+    '''
+    with log_io.open_log(path) as f:
+        lines = f.read().split()
+    return pd.to_numeric(pd.Series(lines, dtype=object),
+                         errors='coerce').to_numpy(dtype=np.float64)
+
+
+def stack_streams(samples):
+    '''
+    stacks the fps samples of several streams into one matrix, aligned
+    at their last sample since the pipelines stop together
+    Args:
+        samples: list of 1d arrays, one per stream
+    Returns:
+        (fps, present) matrices of streams by samples, present is False
+        in the padding in front of the shorter streams
+    '''
+    length = max((len(values) for values in samples), default=0)
+    fps = np.full((len(samples), length), np.nan)
+    present = np.zeros((len(samples), length), dtype=bool)
+    for row, values in enumerate(samples):
+        if len(values):
+            fps[row, length - len(values):] = values
+            present[row, length - len(values):] = True
+    return fps, present
+
+
+def longest_runs(mask):
+    '''
+    returns the length of the longest run of True in every row
+    '''
+    if mask.size == 0:
+        return np.zeros(mask.shape[0], dtype=np.int64)
+    counts = np.cumsum(mask, axis=1)
+    # the count at the last False before every position
+    resets = np.maximum.accumulate(np.where(mask, 0, counts), axis=1)
+    return (counts - resets).max(axis=1)
+
+
+@dataclass
+class StabilityReport:
+    '''
+    the stability of every stream, one array element per stream; the
+    cv, stalls and time below target only count the samples after the
+    warm-up, or all samples of a stream that never settles
+    '''
+    mean_fps: np.ndarray
+    cv: np.ndarray
+    longest_stall_seconds: np.ndarray
+    below_target_percent: np.ndarray
+    warmup_seconds: np.ndarray
+
+    def __len__(self):
+        return len(self.mean_fps)
+
+    def unstable(self, max_cv=DEFAULT_MAX_CV,
+                 max_stall_seconds=DEFAULT_MAX_STALL_SECONDS,
+                 max_below_target_percent=DEFAULT_MAX_BELOW_TARGET_PERCENT):
+        '''
+        returns a boolean array marking the streams that fail any of the
+        thresholds, None disables a threshold; streams without any
+        steady sample fail
+        '''
+        failed = np.isnan(self.mean_fps)
+        if max_cv is not None:
+            failed |= np.nan_to_num(self.cv) > max_cv
+        if max_stall_seconds is not None:
+            failed |= self.longest_stall_seconds > max_stall_seconds
+        if max_below_target_percent is not None:
+            failed |= (np.nan_to_num(self.below_target_percent) >
+                       max_below_target_percent)
+        return failed
+
+    def streams(self):
+        '''
+        returns one dict per stream for manifests and summaries
+        '''
+        def value(array, index):
+            return None if np.isnan(array[index]) else float(array[index])
+        return [{"mean_fps": value(self.mean_fps, index),
+                 "cv": value(self.cv, index),
+                 "longest_stall_seconds":
+                     float(self.longest_stall_seconds[index]),
+                 "below_target_percent":
+                     value(self.below_target_percent, index),
+                 "warmup_seconds": float(self.warmup_seconds[index])}
+                for index in range(len(self))]
+
+
+def analyze(fps, present=None, target_fps=None,
+            period=SAMPLE_PERIOD_SECONDS):
+    '''
+    analyzes the fps samples of all streams at once
+    Args:
+        fps: matrix of streams by samples, nan for "na"
+        present: optional matrix marking the samples that exist, by
+                 default every sample from the first non-nan one
+        target_fps: optional target FPS of every stream
+        period: seconds per sample
+    Returns:
+        StabilityReport
+    '''
+    fps = np.asarray(fps, dtype=np.float64)
+    if fps.ndim == 1:
+        fps = fps[np.newaxis, :]
+    if present is None:
+        present = np.logical_or.accumulate(~np.isnan(fps), axis=1)
+    streams, length = fps.shape
+    if length == 0:
+        missing = np.full(streams, np.nan)
+        return StabilityReport(missing, missing, np.zeros(streams),
+                               missing, np.zeros(streams))
+    columns = np.arange(length)
+    valid = present & ~np.isnan(fps)
+
+    # the second half of every stream is the most likely to be settled
+    first = np.where(present.any(axis=1), present.argmax(axis=1), length)
+    middle = (first + length) // 2
+    late = valid & (columns >= middle[:, np.newaxis])
+    steady_fps = np.full(streams, np.nan)
+    settled = late.any(axis=1)
+    if settled.any():
+        steady_fps[settled] = np.nanmedian(
+            np.where(late[settled], fps[settled], np.nan), axis=1)
+    with np.errstate(invalid='ignore'):
+        in_band = valid & (np.abs(fps - steady_fps[:, np.newaxis]) <=
+                           WARMUP_TOLERANCE * steady_fps[:, np.newaxis])
+    # in_band for the next WARMUP_SAMPLES samples, all of the samples
+    # of a stream shorter than that
+    band_counts = np.concatenate((np.zeros((streams, 1), dtype=np.int64),
+                                  np.cumsum(in_band, axis=1)), axis=1)
+    ends = np.minimum(columns + WARMUP_SAMPLES, length)
+    needed = np.minimum(WARMUP_SAMPLES, length - first)
+    settles = in_band & (band_counts[:, ends] - band_counts[:, columns] >=
+                         needed[:, np.newaxis])
+    # streams that never settle are judged over all of their samples
+    never_settled = ~settles.any(axis=1)
+    warmed = np.where(never_settled, np.minimum(first, length),
+                      settles.argmax(axis=1))
+    warmup_end = np.where(never_settled, length, warmed)
+    steady = present & (columns >= warmed[:, np.newaxis])
+
+    measured = steady & valid
+    steady_values = np.where(measured, fps, 0.0)
+    counts = steady.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_fps = steady_values.sum(axis=1) / measured.sum(axis=1)
+        std_fps = np.sqrt(np.where(
+            measured, (fps - mean_fps[:, np.newaxis]) ** 2, 0.0).sum(axis=1) /
+            measured.sum(axis=1))
+        cv = np.where(mean_fps > 0, std_fps / mean_fps, np.nan)
+
+    # "na" after the warm-up means the stream delivered no frames
+    reference = (np.full(streams, float(target_fps)) if target_fps
+                 else steady_fps)
+    slow = np.where(valid, fps, -np.inf) < \
+        STALL_FRACTION * np.nan_to_num(reference)[:, np.newaxis]
+    stalls = longest_runs(steady & slow)
+    if target_fps:
+        below = steady & (np.where(valid, fps, -np.inf) < target_fps)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            below_target = np.where(counts > 0,
+                                    100.0 * below.sum(axis=1) / counts,
+                                    np.nan)
+    else:
+        below_target = np.full(streams, np.nan)
+    return StabilityReport(
+        mean_fps=mean_fps, cv=cv,
+        longest_stall_seconds=stalls * period,
+        below_target_percent=below_target,
+        warmup_seconds=(warmup_end - np.minimum(first, warmup_end)) * period)
+
+
+def analyze_logs(paths, target_fps=None, period=SAMPLE_PERIOD_SECONDS):
+    '''
+    reads the pipeline logs of the streams and analyzes them together
+    Returns:
+        StabilityReport with one stream per log in the order of paths
+    '''
+    fps, present = stack_streams([read_fps_log(path) for path in paths])
+    return analyze(fps, present, target_fps, period)
+
+
+def thresholds_from_env(env_vars):
+    '''
+    reads the density decision thresholds from the environment, an
+    empty value disables a check and a missing one keeps the default
+    Returns:
+        dict of StabilityReport.unstable keyword arguments
+    '''
+    def threshold(key, default):
+        if key not in env_vars:
+            return default
+        return float(env_vars[key]) if env_vars[key] else None
+    return {"max_cv": threshold(MAX_CV_KEY, DEFAULT_MAX_CV),
+            "max_stall_seconds": threshold(MAX_STALL_KEY,
+                                           DEFAULT_MAX_STALL_SECONDS),
+            "max_below_target_percent": threshold(
+                MAX_BELOW_TARGET_KEY, DEFAULT_MAX_BELOW_TARGET_PERCENT)}
+
+
+def iteration_stability(paths, target_fps, env_vars):
+    '''
+    judges the streams of a density iteration
+    Args:
+        paths: the pipeline logs of the iteration
+        target_fps: the target FPS of every stream
+        env_vars: environment holding the optional thresholds
+    Returns:
+        dict with "stable" and the per-stream "streams" for the manifest
+    '''
+    report = analyze_logs(paths, target_fps)
+    unstable = report.unstable(**thresholds_from_env(env_vars))
+    streams = report.streams()
+    for path, stream, failed in zip(paths, streams, unstable):
+        stream["log"] = os.path.basename(path)
+        stream["stable"] = not failed
+        if failed:
+            print(f"WARN: unstable stream {stream['log']}: "
+                  f"cv {stream['cv']}, longest stall "
+                  f"{stream['longest_stall_seconds']}s, "
+                  f"{stream['below_target_percent']}% below target")
+    return {"stable": not unstable.any(), "streams": streams}
@@ -0,0 +1,113 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import consolidate_multiple_run_of_metrics as consolidate
+import log_io
+import stream_stability
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_log(self, name, values):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w') as f:
+            f.write("\n".join(str(value) for value in values) + "\n")
+        return path
+
+    def test_longest_runs(self):
+        mask = np.array([[True, True, False, True, True, True],
+                         [False, False, False, False, False, False],
+                         [True, False, True, False, True, False]])
+        np.testing.assert_array_equal(stream_stability.longest_runs(mask),
+                                      [3, 0, 1])
+
+    def test_analyze(self):
+        steady = [15.0] * 30
+        ramp = [2.0, 6.0, 10.0] + [15.0] * 27
+        oscillating = [20.0, 10.0] * 15
+        stalled = [15.0] * 15 + [float("nan")] * 8 + [15.0] * 7
+        # the start-up spike above the steady fps is part of the warm-up
+        spike = [40.0, 40.0] + [15.0] * 28
+        report = stream_stability.analyze(
+            np.array([steady, ramp, oscillating, stalled, spike]))
+        # the oscillating stream never settles and is judged as a whole
+        np.testing.assert_array_equal(report.warmup_seconds,
+                                      [0, 3, 30, 0, 2])
+        self.assertAlmostEqual(report.cv[0], 0.0)
+        self.assertAlmostEqual(report.cv[1], 0.0)
+        self.assertAlmostEqual(report.cv[2], 1 / 3)
+        self.assertAlmostEqual(report.cv[4], 0.0)
+        np.testing.assert_array_equal(report.longest_stall_seconds,
+                                      [0, 0, 0, 8, 0])
+        self.assertTrue(np.isnan(report.below_target_percent).all())
+        np.testing.assert_array_equal(report.unstable(),
+                                      [False, False, True, True, False])
+        np.testing.assert_array_equal(
+            report.unstable(max_cv=None, max_stall_seconds=None), False)
+
+        report = stream_stability.analyze(np.array([oscillating]),
+                                          target_fps=15)
+        self.assertEqual(report.below_target_percent[0], 50.0)
+        self.assertTrue(report.unstable(max_cv=None,
+                                        max_below_target_percent=20)[0])
+
+    def test_fixture_logs(self):
+        paths = sorted(log_io.glob_logs(os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            'test_stream_density_results', 'pipeline*.log')))
+        self.assertEqual(len(paths), 2)
+        stability = stream_stability.iteration_stability(paths, 14.95, {})
+        self.assertTrue(stability["stable"])
+        for stream in stability["streams"]:
+            self.assertLess(stream["cv"], 0.01)
+            self.assertEqual(stream["warmup_seconds"], 2.0)
+
+    def test_analyze_empty(self):
+        report = stream_stability.analyze(np.empty((2, 0)))
+        np.testing.assert_array_equal(report.unstable(), [True, True])
+
+    def test_iteration_stability(self):
+        paths = [self.write_log("pipeline1_gst.log", [15] * 20),
+                 self.write_log("pipeline2_gst.log",
+                                ["na"] * 4 + [15] * 6 + ["na"] * 6 + [15] * 4)]
+        stability = stream_stability.iteration_stability(paths, 15, {})
+        self.assertFalse(stability["stable"])
+        self.assertEqual([stream["stable"] for stream in stability["streams"]],
+                         [True, False])
+        self.assertEqual(stability["streams"][1]["log"], "pipeline2_gst.log")
+        self.assertEqual(stability["streams"][1]["longest_stall_seconds"], 6.0)
+        # an empty threshold disables the stall check
+        env = {stream_stability.MAX_STALL_KEY: ""}
+        self.assertTrue(stream_stability.iteration_stability(
+            paths, 15, env)["stable"])
+
+    def test_stability_kpis(self):
+        self.write_log("pipeline1_gst.log", [15] * 20)
+        self.write_log("pipeline2_gst.log", [20, 10] * 10)
+        kpis = consolidate.stream_stability_kpis(self.test_dir, 15)
+        self.assertEqual(kpis["Camera_1 " + consolidate.FPS_CV_CONSTANT], 0.0)
+        self.assertEqual(
+            kpis["Camera_2 " + consolidate.BELOW_TARGET_CONSTANT], 50.0)
+        self.assertEqual(kpis[consolidate.UNSTABLE_STREAMS_CONSTANT], 1)
+        self.assertNotIn("Camera_1 " + consolidate.BELOW_TARGET_CONSTANT,
+                         consolidate.stream_stability_kpis(self.test_dir))
+        self.assertEqual(consolidate.stream_stability_kpis(
+            os.path.join(self.test_dir, "missing")), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import log_io
+
+# written to the results directory by collect_thermal.py
+THERMAL_FILE = "thermal_usage.csv"
+THERMAL_FILE_PATTERN = r"^thermal_usage\.csv(?:\.gz|\.zst)?$"
+DEFAULT_PERIOD_SECONDS = 1.0
+GPU_FREQUENCY_PATTERN = re.compile(r'^gpu(\d+)_mhz$')
+
+
+def read_thermal(path):
+    '''
+    reads thermal_usage.csv written by collect_thermal.py
+    Returns:
+        DataFrame of numeric columns ordered by epoch_s, empty cells
+        are nan
+    '''
+    with log_io.open_log(path) as f:
+        df = pd.read_csv(f)
+    df = df.apply(pd.to_numeric, errors='coerce').dropna(subset=["epoch_s"])
+    return df.sort_values("epoch_s", kind="stable").reset_index(drop=True)
+
+
+def sample_starts(epochs, period=DEFAULT_PERIOD_SECONDS):
+    '''
+    returns the start of the interval every sample covers, a sample
+    counts the throttling since the previous one
+    '''
+    epochs = np.asarray(epochs, dtype=np.float64)
+    gaps = np.diff(epochs)
+    if len(gaps) and np.isfinite(np.median(gaps)):
+        period = float(np.median(gaps))
+    return np.concatenate(([epochs[0] - period], epochs[:-1])) \
+        if len(epochs) else epochs
+
+
+def throttle_intervals(epochs, throttled, period=DEFAULT_PERIOD_SECONDS):
+    '''
+    merges consecutive throttled samples into intervals
+    Args:
+        epochs: sample epochs in increasing order
+        throttled: per sample flag, nan counts as not throttled
+        period: sample period used for the first sample
+    Returns:
+        list of (start, end) epochs
+    '''
+    epochs = np.asarray(epochs, dtype=np.float64)
+    throttled = np.nan_to_num(np.asarray(throttled, dtype=np.float64)) > 0
+    starts = sample_starts(epochs, period)
+    intervals = []
+    for start, end, flag in zip(starts, epochs, throttled):
+        if not flag:
+            continue
+        if intervals and start <= intervals[-1][1]:
+            intervals[-1] = (intervals[-1][0], float(end))
+        else:
+            intervals.append((float(start), float(end)))
+    return intervals
+
+
+def throttle_summary(df, start=None, end=None):
+    '''
+    summarizes the thermal samples within [start, end]
+    Args:
+        df: DataFrame returned by read_thermal
+        start, end: optional epochs bounding the samples
+    Returns:
+        dict with the throttled intervals and seconds, the mean and
+        lowest mean core frequency and the peak temperature, None
+        without samples
+    '''
+    in_window = np.ones(len(df), dtype=bool)
+    if start is not None:
+        in_window &= df["epoch_s"].to_numpy() >= start
+    if end is not None:
+        in_window &= df["epoch_s"].to_numpy() <= end
+    df = df[in_window]
+    if df.empty:
+        return None
+    intervals = throttle_intervals(df["epoch_s"], df["throttled"])
+    if start is not None and intervals:
+        # the first sample may reach back before the window
+        intervals[0] = (max(intervals[0][0], start), intervals[0][1])
+    first = float(sample_starts(df["epoch_s"])[0])
+    if start is not None:
+        first = max(first, start)
+    duration = float(df["epoch_s"].iloc[-1]) - first
+
+    def stat(column, method):
+        if column not in df.columns or df[column].isna().all():
+            return None
+        return float(getattr(df[column], method)())
+
+    throttled_seconds = sum(stop - begin for begin, stop in intervals)
+    gpu_columns = {column: GPU_FREQUENCY_PATTERN.match(column)
+                   for column in df.columns}
+    return {
+        "throttled": bool(intervals),
+        "throttled_seconds": throttled_seconds,
+        "throttled_percent": (100.0 * throttled_seconds / duration
+                              if duration > 0 else None),
+        "intervals": intervals,
+        "cpu_mhz_mean": stat("cpu_mhz_mean", "mean"),
+        "cpu_mhz_min": stat("cpu_mhz_mean", "min"),
+        "temp_c_max": stat("temp_c_max", "max"),
+        "gpu_mhz_mean": {match.group(1): stat(column, "mean")
+                         for column, match in gpu_columns.items() if match},
+    }
+
+
+def iteration_throttling(results_dir, start, end):
+    '''
+    tells whether the host throttled while an iteration was measured
+    Args:
+        results_dir: results directory the collector writes to
+        start, end: epochs of the iteration
+    Returns:
+        dict with throttled and throttled_seconds, None values when
+        there are no thermal samples for the iteration
+    '''
+    path = os.path.join(results_dir, THERMAL_FILE)
+    summary = None
+    if os.path.exists(path):
+        try:
+            summary = throttle_summary(read_thermal(path), start, end)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"WARN: cannot read the thermal samples of {path}: {e}")
+    if summary is None:
+        return {"throttled": None, "throttled_seconds": None}
+    if summary["throttled"]:
+        print(f"WARN: the host throttled for "
+              f"{summary['throttled_seconds']:.1f}s of the iteration, "
+              f"its result may be affected")
+    return {"throttled": summary["throttled"],
+            "throttled_seconds": summary["throttled_seconds"]}
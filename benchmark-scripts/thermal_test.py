@@ -0,0 +1,111 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import consolidate_multiple_run_of_metrics as consolidate
+import thermal
+import timeline
+
+# the collector runs inside the metrics-collector container
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'docker', 'scripts'))
+import collect_thermal  # noqa: E402
+
+THERMAL_LOG = ("epoch_s,monotonic_s,cpu_mhz_mean,cpu_mhz_min,cpu_max_mhz,"
+               "temp_c_max,throttle_events,throttled,gpu0_mhz,gpu0_max_mhz\n"
+               "1000.0,1,3000,2900,4000,70.0,0,0,1200,2000\n"
+               "1001.0,2,2000,1900,4000,95.0,3,1,600,2000\n"
+               "1002.0,3,2000,1900,4000,96.0,1,1,600,2000\n"
+               "1003.0,4,3000,2900,4000,80.0,0,0,1200,2000\n"
+               "1004.0,5,2000,1900,4000,95.0,2,1,600,2000\n")
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write(self, path, content):
+        path = os.path.join(self.test_dir, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_collector_sample(self):
+        for cpu, khz in enumerate([2000000, 3000000]):
+            cpu_dir = f"sys/devices/system/cpu/cpu{cpu}"
+            self.write(f"{cpu_dir}/cpufreq/scaling_cur_freq", f"{khz}\n")
+            self.write(f"{cpu_dir}/cpufreq/cpuinfo_max_freq", "4000000\n")
+            self.write(f"{cpu_dir}/thermal_throttle/core_throttle_count",
+                       "5\n")
+        self.write("sys/class/thermal/thermal_zone0/type", "x86_pkg_temp\n")
+        self.write("sys/class/thermal/thermal_zone0/temp", "85000\n")
+        self.write("sys/class/drm/card0/gt_act_freq_mhz", "900\n")
+        self.write("sys/class/drm/card0/gt_RP0_freq_mhz", "2050\n")
+        self.write("sys/class/drm/card0/gt/gt0/throttle_reason_status", "0\n")
+        # connectors are not GPUs
+        self.write("sys/class/drm/card0-HDMI-A-1/gt_act_freq_mhz", "1\n")
+        with patch.object(collect_thermal, 'SYS_ROOT',
+                          os.path.join(self.test_dir, 'sys')):
+            sensors = collect_thermal.discover_sensors()
+        self.assertEqual(collect_thermal.csv_header(sensors).split(",")[8:],
+                         ["gpu0_mhz", "gpu0_max_mhz", "cpu0_mhz", "cpu1_mhz",
+                          "thermal_zone0_x86_pkg_temp_c\n"])
+        values, count = collect_thermal.sample(sensors, 10)
+        self.assertEqual(count, 10)
+        self.assertEqual(values, ["2500", "2000", "4000", "85.0", "0", "0",
+                                  "900", "2050", "2000", "3000", "85.0"])
+        values, _ = collect_thermal.sample(sensors, 7)
+        self.assertEqual(values[4:6], ["3", "1"])
+
+    def test_throttle_summary(self):
+        path = self.write(thermal.THERMAL_FILE, THERMAL_LOG)
+        df = thermal.read_thermal(path)
+        self.assertEqual(thermal.throttle_intervals(
+            df["epoch_s"], df["throttled"]),
+            [(1000.0, 1002.0), (1003.0, 1004.0)])
+        summary = thermal.throttle_summary(df)
+        self.assertEqual(summary["throttled_seconds"], 3.0)
+        self.assertEqual(summary["throttled_percent"], 60.0)
+        self.assertEqual(summary["temp_c_max"], 96.0)
+        self.assertEqual(summary["gpu_mhz_mean"], {"0": 840.0})
+        summary = thermal.throttle_summary(df, 1000.5, 1001.5)
+        self.assertEqual(summary["intervals"], [(1000.5, 1001.0)])
+        self.assertIsNone(thermal.throttle_summary(df, 2000.0))
+
+        self.assertEqual(
+            thermal.iteration_throttling(self.test_dir, 1002.5, 1003.5),
+            {"throttled": False, "throttled_seconds": 0})
+        self.assertEqual(thermal.iteration_throttling(
+            self.test_dir, 1003.5, 1010.0)["throttled"], True)
+        self.assertIsNone(thermal.iteration_throttling(
+            self.test_dir, 0.0, 10.0)["throttled"])
+
+    def test_thermal_kpis(self):
+        path = self.write(thermal.THERMAL_FILE, THERMAL_LOG)
+        kpis = consolidate.ThermalExtractor().extract_data(path)
+        self.assertEqual(kpis[consolidate.CPU_FREQUENCY_CONSTANT], 2400.0)
+        self.assertEqual(kpis[consolidate.THROTTLE_INTERVALS_CONSTANT],
+                         "1000-1002 1003-1004")
+        self.assertEqual(kpis["GPU_0 Frequency MHz"], 840.0)
+        series = {s.name: s for s in timeline.read_series(path)}
+        np.testing.assert_array_equal(
+            series[timeline.THROTTLED_SERIES].values, [0, 1, 1, 0, 1])
+        self.assertIn("GPU_0 Frequency MHz", series)
+
+
+if __name__ == '__main__':
+    unittest.main()
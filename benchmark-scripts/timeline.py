@@ -0,0 +1,573 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import csv
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import log_io
+import thermal
+
+TIMELINE_FILE = "metrics_timeline.csv"
+DEFAULT_STEP_SECONDS = 1.0
+# sample periods of the sources that do not timestamp their samples:
+# free -s 1, intel_gpu_top's default 1000 ms and the pipeline fps logs
+FREE_PERIOD_SECONDS = 1.0
+IGT_PERIOD_SECONDS = 1.0
+PIPELINE_FPS_PERIOD_SECONDS = 1.0
+# pcm 1 in collect_platform.sh reports the energy of 1 s intervals
+PCM_PERIOD_SECONDS = 1.0
+
+CPU_SERIES = "CPU Utilization %"
+MEMORY_SERIES = "Memory Utilization %"
+MEMORY_USED_SERIES = "Memory Used GB"
+DISK_READ_SERIES = "Disk Read MB/s"
+DISK_WRITE_SERIES = "Disk Write MB/s"
+NPU_SERIES = "NPU Utilization %"
+FPS_SERIES = "FPS"
+CPU_FREQUENCY_SERIES = "CPU Frequency MHz"
+TEMPERATURE_SERIES = "Temperature C"
+THROTTLED_SERIES = "Throttled"
+GPU_FREQUENCY_SERIES = "Frequency MHz"
+# RAPL package power of collect_proc.py and pcm's package energy
+POWER_SERIES = "Package Power W"
+PCM_POWER_SERIES = "PCM Package Power W"
+PCM_ENERGY_COLUMN = "Proc Energy (Joules)"
+IGT_POWER_SUFFIX = "Power W pkg"
+
+AVERAGE_POWER_KPI = "Average Power W"
+ENERGY_PER_FRAME_KPI = "Energy per Frame J"
+FPS_PER_WATT_KPI = "FPS per Watt"
+POWER_SOURCE_KPI = "Power Source"
+
+WINDOW_FILE = "metrics_window.csv"
+DEFAULT_PLATEAU_TOLERANCE = 0.1
+DEFAULT_SMOOTHING_SECONDS = 5.0
+MIN_PLATEAU_SECONDS = 10.0
+EPOCH_THRESHOLD = 1e9
+
+_SAR_DATE_PATTERN = re.compile(
+    r'\s(\d{4}-\d\d-\d\d|\d\d/\d\d/\d{2,4})\s')
+_SAR_CPU_ROW_PATTERN = re.compile(
+    r'^(\d\d):(\d\d):(\d\d)(?:\s+([AP]M))?\s+all\s+(.*)$')
+_SAR_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y")
+_IGT_COLUMN_SUFFIXES = (" %", "Power W pkg", "Power W gpu")
+
+
+@dataclass
+class Series:
+    '''
+    samples of one metric on the epoch timeline
+    '''
+    name: str
+    epoch: np.ndarray
+    values: np.ndarray
+    # True when the epochs were inferred from the sample period and the
+    # log's modification time rather than read from the samples
+    inferred: bool = False
+
+    def __len__(self):
+        return len(self.values)
+
+
+def inferred_epochs(count, end_epoch, period):
+    '''
+    dates samples of a log without timestamps, assuming the last sample
+    was written at end_epoch and the samples are period seconds apart
+    '''
+    return end_epoch - period * np.arange(count - 1, -1, -1, dtype=np.float64)
+
+
+def _series(name, epoch, values, inferred=False):
+    return Series(name=name, epoch=np.asarray(epoch, dtype=np.float64),
+                  values=np.asarray(values, dtype=np.float64),
+                  inferred=inferred)
+
+
+def read_sar_cpu(path):
+    '''
+    reads the "all" cpu rows of a sar log, the date comes from the sar
+    header line and the times are UTC as set up by collect_platform.sh
+    '''
+    day = None
+    epochs = []
+    usages = []
+    previous = None
+    with log_io.open_log(path) as f:
+        for line in f:
+            if day is None:
+                date_match = _SAR_DATE_PATTERN.search(line)
+                if date_match:
+                    for date_format in _SAR_DATE_FORMATS:
+                        try:
+                            day = datetime.strptime(
+                                date_match.group(1), date_format).replace(
+                                    tzinfo=timezone.utc)
+                            break
+                        except ValueError:
+                            continue
+                continue
+            row = _SAR_CPU_ROW_PATTERN.match(line)
+            if not row:
+                continue
+            hours, minutes, seconds, meridiem, values = row.groups()
+            hours = int(hours)
+            if meridiem:
+                hours = hours % 12 + (12 if meridiem == "PM" else 0)
+            try:
+                idle = float(values.split()[-1])
+            except (ValueError, IndexError):
+                continue
+            timestamp = day + timedelta(
+                hours=hours, minutes=int(minutes), seconds=int(seconds))
+            if previous is not None and timestamp < previous:
+                # sar ran past midnight
+                day += timedelta(days=1)
+                timestamp += timedelta(days=1)
+            previous = timestamp
+            epochs.append(timestamp.timestamp())
+            usages.append(100 - idle)
+    if day is None:
+        return []
+    return [_series(CPU_SERIES, epochs, usages)]
+
+
+def read_free(path):
+    '''
+    reads the Mem: rows of a free -s 1 log, which carries no timestamps
+    '''
+    used = []
+    total = []
+    with log_io.open_log(path) as f:
+        for line in f:
+            if line.startswith("Mem:"):
+                parts = line.split()
+                try:
+                    total.append(float(parts[1]))
+                    used.append(float(parts[2]))
+                except (ValueError, IndexError):
+                    continue
+    if not used:
+        return []
+    epochs = inferred_epochs(
+        len(used), os.path.getmtime(path), FREE_PERIOD_SECONDS)
+    used = np.asarray(used)
+    total = np.asarray(total)
+    # free prints KiB by default
+    return [_series(MEMORY_SERIES, epochs, used / total * 100, True),
+            _series(MEMORY_USED_SERIES, epochs, used / (1024 * 1024), True)]
+
+
+def read_platform_usage(path):
+    '''
+    reads platform_usage.csv written by collect_proc.py
+    '''
+    with log_io.open_log(path) as f:
+        df = pd.read_csv(f)
+    df = df.apply(pd.to_numeric, errors='coerce').dropna(subset=["epoch_s"])
+    epochs = df["epoch_s"]
+    series = [_series(CPU_SERIES, epochs, df["cpu_percent"]),
+              _series(MEMORY_SERIES, epochs, df["mem_percent"]),
+              _series(MEMORY_USED_SERIES, epochs,
+                      df["mem_used_kb"] / (1024 * 1024)),
+              _series(DISK_READ_SERIES, epochs, df["disk_read_bps"] / 1000000),
+              _series(DISK_WRITE_SERIES, epochs,
+                      df["disk_write_bps"] / 1000000)]
+    # older logs have no power column, hosts without RAPL leave it empty
+    if "package_power_w" in df.columns and \
+            df["package_power_w"].notna().any():
+        series.append(_series(POWER_SERIES, epochs, df["package_power_w"]))
+    return series
+
+
+def read_npu_usage(path):
+    '''
+    reads npu_usage.csv, using the epoch_s column when present and the
+    isoformat timestamp column of older logs otherwise
+    '''
+    with log_io.open_log(path) as f:
+        df = pd.read_csv(f)
+    if "epoch_s" in df.columns:
+        df["epoch"] = pd.to_numeric(df["epoch_s"], errors='coerce')
+    else:
+        # isoformat without offset, the collector container runs on UTC
+        df["epoch"] = pd.to_datetime(
+            df["timestamp"], format="ISO8601", errors='coerce').map(
+                lambda timestamp: timestamp.timestamp()
+                if not pd.isna(timestamp) else np.nan)
+    df["percent_usage"] = pd.to_numeric(df["percent_usage"], errors='coerce')
+    df = df.dropna(subset=["epoch", "percent_usage"])
+    if "device" in df.columns and df["device"].nunique() > 1:
+        return [_series("NPU_{} {}".format(device, NPU_SERIES),
+                        rows["epoch"], rows["percent_usage"])
+                for device, rows in df.groupby("device")]
+    return [_series(NPU_SERIES, df["epoch"], df["percent_usage"])]
+
+
+def read_pcm(path):
+    '''
+    reads the package energy of a pcm csv as power, the Date and Time
+    columns of its second header row are UTC like the collector
+    '''
+    with log_io.open_log(path) as f:
+        rows = list(csv.reader(f))
+    if len(rows) < 3:
+        return []
+    groups, names = rows[0], rows[1]
+    try:
+        date_column = names.index("Date")
+        time_column = names.index("Time")
+    except ValueError:
+        return []
+    energy_columns = [
+        index for index, name in enumerate(names)
+        if PCM_ENERGY_COLUMN in name or
+        (index < len(groups) and PCM_ENERGY_COLUMN in groups[index])]
+    if not energy_columns:
+        return []
+    samples = rows[2:]
+    epochs = pd.to_datetime(
+        pd.Series([" ".join(row[date_column:time_column + 1])
+                   for row in samples]),
+        format="mixed", utc=True, errors='coerce')
+    epochs = np.array([timestamp.timestamp() if not pd.isna(timestamp)
+                       else np.nan for timestamp in epochs])
+    energy = np.zeros(len(samples))
+    for index in energy_columns:
+        energy += pd.to_numeric(pd.Series(
+            [row[index] if index < len(row) else "" for row in samples]),
+            errors='coerce').to_numpy()
+    # every sample holds the joules of the interval since the previous one
+    intervals = np.diff(epochs, prepend=np.nan)
+    intervals[~(intervals > 0)] = PCM_PERIOD_SECONDS
+    return [_series(PCM_POWER_SERIES, epochs, energy / intervals)]
+
+
+def read_thermal(path):
+    '''
+    reads the mean core frequency, the hottest zone, the throttle flag
+    and the GPU frequencies of thermal_usage.csv
+    '''
+    df = thermal.read_thermal(path)
+    epochs = df["epoch_s"]
+    series = [_series(CPU_FREQUENCY_SERIES, epochs, df["cpu_mhz_mean"]),
+              _series(TEMPERATURE_SERIES, epochs, df["temp_c_max"]),
+              _series(THROTTLED_SERIES, epochs, df["throttled"])]
+    for column in df.columns:
+        match = thermal.GPU_FREQUENCY_PATTERN.match(column)
+        if match:
+            series.append(_series("GPU_{} {}".format(
+                match.group(1), GPU_FREQUENCY_SERIES), epochs, df[column]))
+    return series
+
+
+def read_igt(path):
+    '''
+    reads the engine busy and power columns of an intel_gpu_top csv, or
+    its json conversion, which carry no timestamps
+    '''
+    with log_io.open_log(path) as f:
+        if ".json" in os.path.basename(path):
+            try:
+                rows = json.load(f)
+            except ValueError:
+                return []
+        else:
+            rows = list(csv.DictReader(f))
+    if not rows:
+        return []
+    # the json is converted after the run, the csv was written live
+    end_path = path
+    csv_path = re.sub(r'\.json(\.gz|\.zst)?$', '.csv',
+                      log_io.strip_compression_suffix(path))
+    if csv_path != path and os.path.exists(csv_path):
+        end_path = csv_path
+    epochs = inferred_epochs(
+        len(rows), os.path.getmtime(end_path), IGT_PERIOD_SECONDS)
+    device = re.findall(r'\d+', os.path.basename(path))
+    prefix = "GPU_{}".format(device[0] if device else 0)
+    series = []
+    for column in rows[0]:
+        if not column.strip().endswith(_IGT_COLUMN_SUFFIXES):
+            continue
+        values = pd.to_numeric(
+            pd.Series([str(row.get(column, "")).replace("%", "").strip()
+                       for row in rows]), errors='coerce')
+        series.append(_series("{} {}".format(prefix, column.strip()),
+                              epochs, values, True))
+    return series
+
+
+def read_pipeline_fps(path):
+    '''
+    reads the bare fps numbers of a pipeline log, one per period
+    '''
+    values = []
+    with log_io.open_log(path) as f:
+        for line in f:
+            try:
+                values.append(float(line))
+            except ValueError:
+                # "na" before the first frames arrive
+                values.append(np.nan)
+    if not values:
+        return []
+    camera = re.findall(r'\d+', os.path.basename(path))
+    epochs = inferred_epochs(
+        len(values), os.path.getmtime(path), PIPELINE_FPS_PERIOD_SECONDS)
+    return [_series("Camera_{} {}".format(camera[0] if camera else 0,
+                                          FPS_SERIES),
+                    epochs, values, True)]
+
+
+TIMELINE_SOURCES = {r"^cpu_usage\.log(?:\.gz|\.zst)?$": read_sar_cpu,
+                    r"^memory_usage\.log(?:\.gz|\.zst)?$": read_free,
+                    r"^platform_usage\.csv(?:\.gz|\.zst)?$":
+                        read_platform_usage,
+                    r"^npu_usage\.csv(?:\.gz|\.zst)?$": read_npu_usage,
+                    r"^pcm\.csv(?:\.gz|\.zst)?$": read_pcm,
+                    thermal.THERMAL_FILE_PATTERN: read_thermal,
+                    r"^igt.*\.(?:csv|json)(?:\.gz|\.zst)?$": read_igt,
+                    r"^pipeline.*\.log(?:\.gz|\.zst)?$": read_pipeline_fps}
+
+
+def read_series(path):
+    '''
+    reads the series of a single metric log with the matching reader
+    Returns:
+        list of Series, empty if the log is not a known metric source
+    '''
+    file = os.path.basename(path)
+    for pattern, reader in TIMELINE_SOURCES.items():
+        if re.search(pattern, file):
+            return [series for series in reader(path) if len(series)]
+    return []
+
+
+def load_timeline(results_dir):
+    '''
+    reads every known metric log directly under results_dir
+    Args:
+        results_dir: directory holding the benchmark results
+    Returns:
+        list of Series, empty series are dropped
+    '''
+    timeline = []
+    names = set()
+    for file in sorted(os.listdir(results_dir)):
+        path = os.path.join(results_dir, file)
+        if not os.path.isfile(path) or os.path.getsize(path) == 0:
+            continue
+        try:
+            series_list = read_series(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"WARN: cannot read the timeline of {path}: {e}")
+            continue
+        for series in series_list:
+            # igt writes a csv and its json conversion
+            if series.name not in names:
+                names.add(series.name)
+                timeline.append(series)
+    return timeline
+
+
+def resample(timeline, step=DEFAULT_STEP_SECONDS, start=None, end=None):
+    '''
+    linearly interpolates every series onto one common epoch grid
+    Args:
+        timeline: list of Series
+        step: grid spacing in seconds
+        start, end: grid range, by default the span of all series
+    Returns:
+        (grid, columns) where columns maps series names to values on the
+        grid, nan where the grid lies outside the series' own samples
+    '''
+    if not timeline:
+        return np.empty(0), {}
+    if start is None:
+        start = min(float(np.nanmin(series.epoch)) for series in timeline)
+    if end is None:
+        end = max(float(np.nanmax(series.epoch)) for series in timeline)
+    grid = np.arange(start, end + step / 2, step, dtype=np.float64)
+    columns = {}
+    for series in timeline:
+        order = np.argsort(series.epoch, kind="stable")
+        epoch = series.epoch[order]
+        values = series.values[order]
+        valid = ~np.isnan(values)
+        if not valid.any():
+            continue
+        columns[series.name] = np.interp(
+            grid, epoch[valid], values[valid], left=np.nan, right=np.nan)
+    return grid, columns
+
+
+def write_timeline(path, grid, columns):
+    '''
+    writes the resampled timeline as csv with one row per grid point
+    '''
+    df = pd.DataFrame(columns)
+    df.insert(0, "epoch_s", grid)
+    df.to_csv(path, index=False, float_format="%.6f")
+    return path
+
+
+def parse_window(text, origin=0.0):
+    '''
+    parses a "start,end" measurement window
+    Args:
+        text: start and end in seconds from the first sample, or as epochs;
+              an empty end means until the last sample
+        origin: epoch of the first sample
+    Returns:
+        (start, end) as epochs
+    '''
+    try:
+        start_text, end_text = text.split(",")
+        start = float(start_text) if start_text.strip() else 0.0
+        end = float(end_text) if end_text.strip() else float("inf")
+    except ValueError:
+        raise ValueError(f"invalid window '{text}', expected start,end")
+    if start > end:
+        raise ValueError(f"invalid window '{text}', start is after end")
+    # anything before 2001 cannot be an epoch of a benchmark run
+    if start < EPOCH_THRESHOLD:
+        start += origin
+        end += origin
+    return start, end
+
+
+def detect_plateau(grid, columns, tolerance=DEFAULT_PLATEAU_TOLERANCE,
+                   smoothing_seconds=DEFAULT_SMOOTHING_SECONDS,
+                   min_seconds=MIN_PLATEAU_SECONDS):
+    '''
+    finds the steady state of a run as the longest stretch in which the
+    smoothed total fps of all pipelines stays within tolerance of its
+    steady value, which leaves out start-up, model load and teardown
+    Args:
+        grid, columns: the resampled timeline
+        tolerance: allowed relative deviation from the steady fps
+        smoothing_seconds: width of the centered moving average
+        min_seconds: shortest plateau that is accepted
+    Returns:
+        (start, end) epochs of the plateau or None if there is none
+    '''
+    fps_columns = [values for name, values in columns.items()
+                   if name.endswith(" " + FPS_SERIES)]
+    if not fps_columns or len(grid) < 2:
+        return None
+    stacked = np.vstack(fps_columns)
+    valid = ~np.isnan(stacked).all(axis=0)
+    if not valid.any():
+        return None
+    total = np.where(valid, np.nansum(stacked, axis=0), np.nan)
+    step = grid[1] - grid[0]
+    smoothed = pd.Series(total).rolling(
+        max(1, int(round(smoothing_seconds / step))),
+        center=True, min_periods=1).mean().to_numpy()
+    # the second half of a run is the most likely to be settled
+    valid_index = np.flatnonzero(valid)
+    reference = np.nanmedian(smoothed[valid_index[len(valid_index) // 2:]])
+    if not reference > 0:
+        return None
+    steady = valid & (np.abs(smoothed - reference) <= tolerance * reference)
+    if not steady.any():
+        return None
+    edges = np.flatnonzero(np.diff(
+        np.concatenate(([0], steady.astype(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2] - 1
+    longest = int(np.argmax(ends - starts))
+    start, end = float(grid[starts[longest]]), float(grid[ends[longest]])
+    if end - start < min_seconds:
+        return None
+    return start, end
+
+
+def window_means(timeline, start, end):
+    '''
+    averages the raw samples of every series within [start, end]
+    Returns:
+        dict of series name to mean, series without samples in the
+        window are left out
+    '''
+    means = {}
+    for series in timeline:
+        in_window = ((series.epoch >= start) & (series.epoch <= end) &
+                     ~np.isnan(series.values))
+        if in_window.any():
+            means[series.name] = float(series.values[in_window].mean())
+    return means
+
+
+def trim(grid, columns, start, end):
+    '''
+    restricts a resampled timeline to [start, end]
+    '''
+    in_window = (grid >= start) & (grid <= end)
+    return grid[in_window], {name: values[in_window]
+                             for name, values in columns.items()}
+
+
+def power_columns(columns):
+    '''
+    picks the power timeline of the host: the RAPL package power, else
+    pcm's package energy, else the igt package power summed over GPUs;
+    the sources overlap, so they are never added up
+    Returns:
+        (source name, values on the grid) or (None, None)
+    '''
+    for name in (POWER_SERIES, PCM_POWER_SERIES):
+        if name in columns:
+            return name, columns[name]
+    gpu_power = [values for name, values in columns.items()
+                 if name.startswith("GPU_") and
+                 name.endswith(IGT_POWER_SUFFIX)]
+    if gpu_power:
+        stacked = np.vstack(gpu_power)
+        return IGT_POWER_SUFFIX, np.where(
+            np.isnan(stacked).all(axis=0), np.nan,
+            np.nansum(stacked, axis=0))
+    return None, None
+
+
+def energy_kpis(grid, columns):
+    '''
+    relates the power to the total fps of all pipelines on the grid
+    points where both are known, so a run's start-up or a collector
+    that stopped early does not skew the ratio
+    Args:
+        grid, columns: the resampled timeline, trimmed to a window when
+                       only the steady state should count
+    Returns:
+        dict with the average power, the energy per frame and the fps
+        per watt, empty without power or fps samples
+    '''
+    source, power = power_columns(columns)
+    fps_columns = [values for name, values in columns.items()
+                   if name.endswith(" " + FPS_SERIES)]
+    if source is None or not fps_columns:
+        return {}
+    stacked = np.vstack(fps_columns)
+    total_fps = np.where(np.isnan(stacked).all(axis=0), np.nan,
+                         np.nansum(stacked, axis=0))
+    aligned = ~np.isnan(power) & ~np.isnan(total_fps)
+    if not aligned.any():
+        return {}
+    # the grid is evenly spaced, so the means weigh every second alike
+    mean_power = float(power[aligned].mean())
+    mean_fps = float(total_fps[aligned].mean())
+    return {
+        AVERAGE_POWER_KPI: mean_power,
+        ENERGY_PER_FRAME_KPI: mean_power / mean_fps if mean_fps > 0 else "NA",
+        FPS_PER_WATT_KPI: mean_fps / mean_power if mean_power > 0 else "NA",
+        POWER_SOURCE_KPI: source,
+    }
@@ -0,0 +1,198 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+from datetime import datetime, timezone
+import math
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import timeline
+
+SAR_LOG = """Linux 6.8.0-45-generic (host) \t2026-10-19 \t_x86_64_\t(8 CPU)
+
+23:59:58        CPU     %user     %nice   %system   %iowait    %steal     %idle
+23:59:58        all     10.00      0.00      5.00      0.00      0.00     85.00
+23:59:59        all     20.00      0.00      5.00      0.00      0.00     75.00
+00:00:00        all     30.00      0.00      5.00      0.00      0.00     65.00
+Average:        all     20.00      0.00      5.00      0.00      0.00     75.00
+"""
+
+FREE_HEADER = ("               total        used        free      shared"
+               "  buff/cache   available\n")
+FREE_LOG = (FREE_HEADER +
+            "Mem:         2097152     1048576      524288        1024"
+            "      524288     1048576\n" +
+            "Swap:              0           0           0\n" +
+            "\n" +
+            FREE_HEADER +
+            "Mem:         2097152     1572864      262144        1024"
+            "      262144      524288\n" +
+            "Swap:              0           0           0\n")
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write(self, name, content, mtime=None):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_read_sar_cpu(self):
+        series, = timeline.read_sar_cpu(self.write('cpu_usage.log', SAR_LOG))
+        start = datetime(2026, 10, 19, 23, 59, 58,
+                         tzinfo=timezone.utc).timestamp()
+        # the last sample is past midnight
+        np.testing.assert_array_equal(
+            series.epoch, [start, start + 1, start + 2])
+        np.testing.assert_array_equal(series.values, [15.0, 25.0, 35.0])
+        self.assertFalse(series.inferred)
+
+    def test_read_free_inferred(self):
+        mem_percent, mem_used = timeline.read_free(
+            self.write('memory_usage.log', FREE_LOG, mtime=1000.0))
+        self.assertTrue(mem_percent.inferred)
+        np.testing.assert_array_equal(mem_percent.epoch, [999.0, 1000.0])
+        np.testing.assert_array_equal(mem_percent.values, [50.0, 75.0])
+        np.testing.assert_array_equal(mem_used.values, [1.0, 1.5])
+
+    def test_read_npu_usage_legacy_timestamps(self):
+        series, = timeline.read_npu_usage(self.write(
+            'npu_usage.csv',
+            "timestamp,percent_usage\n"
+            "1970-01-01T00:16:40,10.0\n1970-01-01T00:16:41.5,20.0\n"))
+        np.testing.assert_array_equal(series.epoch, [1000.0, 1001.5])
+
+    def test_load_and_resample(self):
+        self.write('platform_usage.csv',
+                   "epoch_s,monotonic_s,cpu_percent,iowait_percent,"
+                   "mem_total_kb,mem_used_kb,mem_percent,"
+                   "disk_read_bps,disk_write_bps\n"
+                   "1000.0,1,10,0,100,50,50.0,0,0\n"
+                   "1002.0,3,30,0,100,60,60.0,2000000,0\n")
+        self.write('pipeline1_gst.log', "na\n20.0\n21.0\n", mtime=1003.0)
+        self.write('summary.csv', "not,a metric log\n")
+        series = {s.name: s for s in timeline.load_timeline(self.test_dir)}
+        self.assertIn(timeline.CPU_SERIES, series)
+        self.assertIn("Camera_1 FPS", series)
+
+        grid, columns = timeline.resample(list(series.values()))
+        np.testing.assert_array_equal(grid, [1000.0, 1001.0, 1002.0, 1003.0])
+        cpu = columns[timeline.CPU_SERIES]
+        np.testing.assert_array_equal(cpu[:3], [10.0, 20.0, 30.0])
+        self.assertTrue(math.isnan(cpu[3]))
+        fps = columns["Camera_1 FPS"]
+        # the "na" sample at 1001 is left out of the interpolation
+        self.assertTrue(math.isnan(fps[0]))
+        np.testing.assert_array_equal(fps[2:], [20.0, 21.0])
+
+        path = timeline.write_timeline(
+            os.path.join(self.test_dir, timeline.TIMELINE_FILE),
+            grid, columns)
+        with open(path) as f:
+            self.assertTrue(f.readline().startswith("epoch_s,"))
+
+    def test_energy_kpis(self):
+        platform_path = self.write(
+            'platform_usage.csv',
+            "epoch_s,monotonic_s,cpu_percent,iowait_percent,"
+            "mem_total_kb,mem_used_kb,mem_percent,"
+            "disk_read_bps,disk_write_bps,package_power_w\n"
+            "1000.0,1,10,0,100,50,50.0,0,0,\n"
+            "1001.0,2,10,0,100,50,50.0,0,0,40.0\n"
+            "1002.0,3,10,0,100,50,50.0,0,0,60.0\n")
+        power = timeline.read_platform_usage(platform_path)[-1]
+        self.assertEqual(power.name, timeline.POWER_SERIES)
+        self.assertTrue(math.isnan(power.values[0]))
+
+        pcm_path = self.write(
+            'pcm.csv',
+            "System,System,Socket 0 Proc Energy (Joules),"
+            "Socket 1 Proc Energy (Joules)\n"
+            "Date,Time,Proc Energy (Joules),Proc Energy (Joules)\n"
+            "1970-01-01,00:16:40,20.0,10.0\n"
+            "1970-01-01,00:16:42,60.0,20.0\n")
+        pcm, = timeline.read_pcm(pcm_path)
+        np.testing.assert_array_equal(pcm.epoch, [1000.0, 1002.0])
+        # the joules of the 2 s interval make 40 W
+        np.testing.assert_array_equal(pcm.values, [30.0, 40.0])
+
+        grid = np.array([1000.0, 1001.0, 1002.0])
+        columns = {timeline.POWER_SERIES: np.array([np.nan, 40.0, 60.0]),
+                   timeline.PCM_POWER_SERIES: np.full(3, 99.0),
+                   "Camera_1 FPS": np.array([30.0, 50.0, 50.0]),
+                   "Camera_2 FPS": np.array([np.nan, 50.0, 50.0])}
+        kpis = timeline.energy_kpis(grid, columns)
+        # the RAPL power wins and the first point has no power sample
+        self.assertEqual(kpis[timeline.AVERAGE_POWER_KPI], 50.0)
+        self.assertEqual(kpis[timeline.FPS_PER_WATT_KPI], 2.0)
+        self.assertEqual(kpis[timeline.ENERGY_PER_FRAME_KPI], 0.5)
+        self.assertEqual(kpis[timeline.POWER_SOURCE_KPI],
+                         timeline.POWER_SERIES)
+
+        gpu_columns = {"GPU_0 Power W pkg": np.full(3, 10.0),
+                       "GPU_1 Power W pkg": np.full(3, 15.0),
+                       "Camera_1 FPS": np.full(3, 50.0)}
+        kpis = timeline.energy_kpis(grid, gpu_columns)
+        self.assertEqual(kpis[timeline.FPS_PER_WATT_KPI], 2.0)
+        self.assertEqual(timeline.energy_kpis(
+            grid, {"Camera_1 FPS": np.full(3, 50.0)}), {})
+
+    def test_parse_window(self):
+        self.assertEqual(timeline.parse_window("60,300", 1000.0),
+                         (1060.0, 1300.0))
+        self.assertEqual(timeline.parse_window("60,", 1000.0),
+                         (1060.0, float("inf")))
+        self.assertEqual(
+            timeline.parse_window("1790000000,1790000100", 1000.0),
+            (1790000000.0, 1790000100.0))
+        for window in ("60", "300,60", "a,b"):
+            with self.subTest(window=window):
+                with self.assertRaises(ValueError):
+                    timeline.parse_window(window)
+
+    def test_detect_plateau(self):
+        grid = np.arange(1000.0, 1100.0)
+        # 20 s start-up ramp, steady 30 fps with noise, 10 s teardown
+        fps = np.concatenate([np.linspace(0.0, 30.0, 20),
+                              30.0 + np.tile([0.5, -0.5], 35),
+                              np.linspace(30.0, 0.0, 10)])
+        columns = {"Camera_1 FPS": fps / 2, "Camera_2 FPS": fps / 2,
+                   timeline.CPU_SERIES: np.full(100, 50.0)}
+        start, end = timeline.detect_plateau(grid, columns)
+        self.assertTrue(1015.0 <= start <= 1022.0)
+        self.assertTrue(1088.0 <= end <= 1092.0)
+        self.assertIsNone(timeline.detect_plateau(
+            grid, {timeline.CPU_SERIES: np.full(100, 50.0)}))
+        self.assertIsNone(timeline.detect_plateau(
+            grid[:8], {"Camera_1 FPS": np.full(8, 30.0)}))
+        # no sample near the median of an alternating second half
+        alternating = np.concatenate([np.full(50, 30.0),
+                                      np.tile([100.0, 0.0], 25)])
+        self.assertIsNone(timeline.detect_plateau(
+            grid, {"Camera_1 FPS": alternating}, smoothing_seconds=1))
+
+        series = timeline._series(timeline.CPU_SERIES, grid,
+                                  np.where(grid < 1050, 90.0, 40.0))
+        self.assertEqual(timeline.window_means([series], 1050.0, 1099.0),
+                         {timeline.CPU_SERIES: 40.0})
+        trimmed_grid, trimmed = timeline.trim(grid, columns, start, end)
+        self.assertEqual(len(trimmed_grid), end - start + 1)
+        self.assertEqual(len(trimmed["Camera_1 FPS"]), len(trimmed_grid))
+
+
+if __name__ == '__main__':
+    unittest.main()
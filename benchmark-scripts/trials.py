@@ -0,0 +1,221 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import math
+import os
+import statistics
+import time
+import log_io
+
+TRIALS_FILE = "trials.json"
+# trials run before the confidence interval is trusted for stopping
+MIN_TRIALS = 3
+# --target_ci without --trials stops after this many trials at most
+DEFAULT_MAX_TRIALS = 10
+CONFIDENCE = 0.95
+# two-sided 95% student t critical values by degrees of freedom; larger
+# degrees of freedom use the closest smaller entry, which is conservative
+T_TABLE_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447,
+    7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179,
+    13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101,
+    19: 2.093, 20: 2.086, 21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064,
+    25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+    40: 2.021, 60: 2.000, 120: 1.980,
+}
+# modified z-score above which a trial is an outlier (Iglewicz and
+# Hoaglin); 0.6745 scales the MAD to the standard deviation
+OUTLIER_Z_SCORE = 3.5
+_MAD_SCALE = 0.6745
+
+
+def t_critical(degrees_of_freedom):
+    '''
+    returns the two-sided 95% student t critical value
+    '''
+    if degrees_of_freedom < 1:
+        raise ValueError("at least two samples are needed")
+    return T_TABLE_95[max(df for df in T_TABLE_95
+                          if df <= degrees_of_freedom)]
+
+
+def confidence_interval(values):
+    '''
+    returns the mean and the half width of its 95% confidence interval
+    Args:
+        values: list of trial results
+    Returns:
+        (mean, half_width), the half width is None for a single value
+    '''
+    mean = statistics.mean(values)
+    if len(values) < 2:
+        return mean, None
+    half_width = (t_critical(len(values) - 1) * statistics.stdev(values)
+                  / math.sqrt(len(values)))
+    return mean, half_width
+
+
+def find_outliers(values, threshold=OUTLIER_Z_SCORE):
+    '''
+    finds the outliers by their modified z-score around the median,
+    which a single wild trial cannot shift the way it shifts the mean
+    Args:
+        values: list of trial results
+        threshold: modified z-score above which a value is an outlier
+    Returns:
+        set of the indices of the outlying values
+    '''
+    if len(values) < MIN_TRIALS:
+        return set()
+    median = statistics.median(values)
+    mad = statistics.median(abs(value - median) for value in values)
+    if mad == 0:
+        return set()
+    return {i for i, value in enumerate(values)
+            if _MAD_SCALE * abs(value - median) / mad > threshold}
+
+
+def summarize_trials(values):
+    '''
+    summarizes trial results after rejecting the outliers
+    Args:
+        values: list of trial results in trial order
+    Returns:
+        dict with mean, ci_half_width, relative_ci and the indices of
+        the rejected trials
+    '''
+    rejected = find_outliers(values)
+    kept = [value for i, value in enumerate(values) if i not in rejected]
+    mean, half_width = confidence_interval(kept)
+    return {
+        "confidence": CONFIDENCE,
+        "trials": len(values),
+        "rejected": sorted(rejected),
+        "mean": mean,
+        "stdev": statistics.stdev(kept) if len(kept) > 1 else None,
+        "ci_half_width": half_width,
+        "relative_ci": (half_width / mean
+                        if half_width is not None and mean else None),
+    }
+
+
+def is_converged(summary, target_ci):
+    '''
+    checks whether the relative confidence interval is narrow enough
+    Args:
+        summary: dict returned by summarize_trials
+        target_ci: relative half width to reach, e.g. 0.02 for +/-2%
+    '''
+    kept = summary["trials"] - len(summary["rejected"])
+    return (kept >= MIN_TRIALS and summary["relative_ci"] is not None
+            and summary["relative_ci"] <= target_ci)
+
+
+class PipelineFpsWindow:
+    '''
+    reads the fps the pipelines logged during one trial window
+
+    The pipeline logs are followed with log_io.LogTailer, so consecutive
+    trials on the same running pipelines each see only their own lines.
+    '''
+    def __init__(self, results_dir, pattern="pipeline*.log"):
+        self.results_dir = results_dir
+        self.pattern = pattern
+        self.tailers = {}
+
+    def start(self):
+        '''
+        skips everything the pipelines logged before the window
+        '''
+        for path in log_io.glob_logs(
+                os.path.join(self.results_dir, self.pattern)):
+            if path not in self.tailers:
+                self.tailers[path] = log_io.LogTailer(path)
+            self.tailers[path].read_lines()
+
+    def read(self):
+        '''
+        returns the averaged fps per pipeline log over the window
+        '''
+        pipeline_fps = {}
+        for path, tailer in sorted(self.tailers.items()):
+            fps_list = []
+            for line in tailer.read_lines():
+                try:
+                    fps_list.append(float(line))
+                except ValueError:
+                    # "na" before the first frames
+                    continue
+            if fps_list:
+                pipeline_fps[os.path.basename(path)] = \
+                    statistics.mean(fps_list)
+        return pipeline_fps
+
+
+def run_trials(results_dir, duration, max_trials, target_ci=None,
+               pattern="pipeline*.log"):
+    '''
+    repeats the measurement window on the running pipelines until the
+    confidence interval on the total fps is narrower than target_ci or
+    max_trials are done, and writes the trials to trials.json
+    Args:
+        results_dir: directory the pipelines write their logs to
+        duration: length of every trial window in seconds
+        max_trials: maximum number of trials
+        target_ci: relative 95% confidence half width to stop at,
+                   all max_trials run when it is None
+        pattern: glob pattern of the pipeline fps logs
+    Returns:
+        dict with the trial summary and the per trial results
+    '''
+    window = PipelineFpsWindow(results_dir, pattern)
+    trials = []
+    summary = None
+    for trial in range(max_trials):
+        window.start()
+        start_time = time.time()
+        print(f"Trial {trial + 1}/{max_trials}: waiting {duration}s")
+        time.sleep(duration)
+        pipeline_fps = window.read()
+        trials.append({"trial": trial, "start_time": start_time,
+                       "end_time": time.time(),
+                       "total_fps": sum(pipeline_fps.values()),
+                       "pipeline_fps": pipeline_fps})
+        summary = summarize_trials([t["total_fps"] for t in trials])
+        print(f"Trial {trial + 1}: total FPS "
+              f"{trials[-1]['total_fps']:.2f}, " + format_summary(summary))
+        if target_ci is not None and is_converged(summary, target_ci):
+            print(f"Total FPS confidence interval within "
+                  f"{target_ci * 100:g}% after {trial + 1} trials")
+            break
+    for i, trial in enumerate(trials):
+        trial["outlier"] = i in summary["rejected"]
+    summary.update({
+        "target_ci": target_ci,
+        "converged": (is_converged(summary, target_ci)
+                      if target_ci is not None else None),
+        "duration": duration,
+        "trial_results": trials,
+    })
+    with open(os.path.join(results_dir, TRIALS_FILE), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def format_summary(summary):
+    '''
+    returns a one line description of a trial summary
+    '''
+    text = f"mean {summary['mean']:.2f}"
+    if summary["relative_ci"] is not None:
+        text += (f" +/- {summary['ci_half_width']:.2f} "
+                 f"({summary['relative_ci'] * 100:.1f}%, "
+                 f"{summary['confidence'] * 100:g}% CI)")
+    if summary["rejected"]:
+        text += (", rejected outlier trial(s) " +
+                 ", ".join(str(i + 1) for i in summary["rejected"]))
+    return text
@@ -0,0 +1,77 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import trials
+
+
+class Testing(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_confidence_interval(self):
+        self.assertEqual(trials.t_critical(4), 2.776)
+        # between table entries the smaller degrees of freedom are used
+        self.assertEqual(trials.t_critical(45), 2.021)
+        self.assertEqual(trials.t_critical(1000), 1.980)
+        mean, half_width = trials.confidence_interval(
+            [100.0, 102.0, 98.0, 101.0, 99.0])
+        self.assertAlmostEqual(mean, 100.0)
+        # stdev 1.5811, t(4) 2.776, sqrt(5)
+        self.assertAlmostEqual(half_width, 2.776 * 1.5811388 / 5 ** 0.5)
+        self.assertEqual(trials.confidence_interval([100.0]), (100.0, None))
+
+    def test_outlier_rejection(self):
+        values = [100.0, 101.0, 99.0, 100.5, 60.0]
+        self.assertEqual(trials.find_outliers(values), {4})
+        self.assertEqual(trials.find_outliers([100.0, 60.0]), set())
+        self.assertEqual(trials.find_outliers([5.0, 5.0, 5.0, 9.0]), set())
+        summary = trials.summarize_trials(values)
+        self.assertEqual(summary["rejected"], [4])
+        self.assertAlmostEqual(summary["mean"], 100.125)
+        self.assertTrue(trials.is_converged(summary, 0.02))
+        self.assertFalse(trials.is_converged(summary, 0.001))
+        self.assertFalse(trials.is_converged(
+            trials.summarize_trials([100.0, 100.1]), 0.5))
+
+    @patch('trials.time.sleep')
+    def test_run_trials(self, mock_sleep):
+        log_path = os.path.join(self.test_dir, 'pipeline1_gst.log')
+        with open(log_path, 'w') as f:
+            f.write("na\n1.0\n")
+        # every trial window the pipeline logs new fps values
+        windows = iter(["30.0\n30.2\n", "29.8\n30.0\n", "30.1\n29.9\n",
+                        "30.0\n30.0\n"])
+
+        def log_window(duration):
+            with open(log_path, 'a') as f:
+                f.write(next(windows))
+        mock_sleep.side_effect = log_window
+
+        summary = trials.run_trials(self.test_dir, 5, 10, target_ci=0.01)
+        # stops once three trials are within +/-1%
+        self.assertEqual(summary["trials"], 3)
+        self.assertTrue(summary["converged"])
+        self.assertAlmostEqual(summary["trial_results"][0]["total_fps"],
+                               30.1)
+        self.assertEqual(summary["trial_results"][0]["pipeline_fps"],
+                         {"pipeline1_gst.log": 30.1})
+        with open(os.path.join(self.test_dir, trials.TRIALS_FILE)) as f:
+            self.assertEqual(json.load(f)["trials"], 3)
+        self.assertIn("95% CI", trials.format_summary(summary))
+
+
+if __name__ == '__main__':
+    unittest.main()
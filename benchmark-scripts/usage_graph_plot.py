@@ -1,10 +1,10 @@
-import csv
 import json
 import matplotlib.pyplot as plt
 import os
 import subprocess
 import argparse
 import glob
+import timeline
 
 MAX_POINTS = 180
 
@@ -12,21 +12,36 @@ def downsample(x, y, max_points=MAX_POINTS):
     step = max(1, len(x) // max_points)
     return x[::step], y[::step]
 
-def plot_cpu_usage(ax, filepath):
-    cpu_usage = []
-    time_seconds = []
 
-    with open(filepath, 'r') as file:
-        for line in file:
-            parts = line.split()
-            if len(parts) >= 8 and parts[1] == 'all':
-                try:
-                    idle = float(parts[7])
-                    usage = 100 - idle
-                    cpu_usage.append(usage)
-                    time_seconds.append(len(cpu_usage) - 1)
-                except ValueError:
-                    continue
+def read_timeline_series(filepath, name, origin):
+    '''
+    returns the seconds since origin and the values of one timeline series
+    read from a metric log, empty lists if the log has no such series
+    '''
+    if not os.path.isfile(filepath) or os.path.getsize(filepath) == 0:
+        return [], []
+    for series in timeline.read_series(filepath):
+        if series.name == name or series.name.endswith(" " + name):
+            return list(series.epoch - origin), list(series.values)
+    return [], []
+
+
+def timeline_origin(filepaths):
+    '''
+    returns the epoch of the first sample over all logs, the common zero
+    of the time axes
+    '''
+    starts = []
+    for filepath in filepaths:
+        if os.path.isfile(filepath) and os.path.getsize(filepath) > 0:
+            starts.extend(min(series.epoch)
+                          for series in timeline.read_series(filepath))
+    return min(starts) if starts else 0.0
+
+
+def plot_cpu_usage(ax, filepath, origin=0.0):
+    time_seconds, cpu_usage = read_timeline_series(
+        filepath, timeline.CPU_SERIES, origin)
 
     if cpu_usage:
         time_ds, usage_ds = downsample(time_seconds, cpu_usage)
@@ -42,18 +57,11 @@ def plot_cpu_usage(ax, filepath):
         ax.text(0.5, 0.5, "No CPU data", ha='center', va='center')
         ax.axis('off')
 
-def plot_npu_usage(ax, filepath):
-    usage_values = []
-    with open(filepath, 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            try:
-                usage = float(row['percent_usage'])
-                usage_values.append(usage)
-            except ValueError:
-                continue
-
-    time_intervals = list(range(len(usage_values)))
+
+def plot_npu_usage(ax, filepath, origin=0.0):
+    # with several NPUs the first device is plotted
+    time_intervals, usage_values = read_timeline_series(
+        filepath, timeline.NPU_SERIES, origin)
     if usage_values:
         time_ds, usage_ds = downsample(time_intervals, usage_values)
         ax.plot(time_ds, usage_ds, color='darkorange', marker='o', linestyle='-', linewidth=2, label='NPU Usage (%)')
@@ -68,21 +76,11 @@ def plot_npu_usage(ax, filepath):
         ax.text(0.5, 0.5, "No NPU data", ha='center', va='center')
         ax.axis('off')
 
-def plot_memory_usage(ax, filepath):
-    used_mem = []
-    time = 0
-    with open(filepath, 'r') as file:
-        for line in file:
-            if line.startswith('Mem:'):
-                parts = line.split()
-                if len(parts) >= 3:
-                    try:
-                        used = int(parts[2]) / (1024 * 1024)  # Convert to GB
-                        used_mem.append(used)
-                    except ValueError:
-                        continue
+
+def plot_memory_usage(ax, filepath, origin=0.0):
+    time_series, used_mem = read_timeline_series(
+        filepath, timeline.MEMORY_USED_SERIES, origin)
     if used_mem:
-        time_series = list(range(len(used_mem)))
         time_ds, mem_ds = downsample(time_series, used_mem)
         ax.plot(time_ds, mem_ds, marker='o', color='green', label='Memory Used (GB)')
         ax.set_title('Memory Usage Over Time')
@@ -96,7 +94,8 @@ def plot_memory_usage(ax, filepath):
         ax.text(0.5, 0.5, "No Memory data", ha='center', va='center')
         ax.axis('off')
 
-def plot_gpu_metrics(ax, filepath):
+
+def plot_gpu_metrics(ax, filepath, origin=0.0):
     desc_map = {
         'CCS %': 'Compute[CCS]',
         'RCS %': 'Render/3D[RCS]',
@@ -113,8 +112,14 @@ def plot_gpu_metrics(ax, filepath):
         with open(filepath, 'r') as f:
             data = json.load(f)
 
-        for i, entry in enumerate(data):
-            time_series.append(i)
+        # igt samples carry no timestamps, timeline dates them from the
+        # end of the log and the sample period
+        gpu_series = timeline.read_series(filepath)
+        if gpu_series and len(gpu_series[0]) == len(data):
+            time_series = list(gpu_series[0].epoch - origin)
+        else:
+            time_series = list(range(len(data)))
+        for entry in data:
             for metric in desc_map:
                 try:
                     val = float(str(entry.get(metric, '0')).replace('%', '').strip())
@@ -163,6 +168,11 @@ def main():
     cpu_log = os.path.join(root, 'cpu_usage.log')
     npu_csv = os.path.join(root, 'npu_usage.csv')
     mem_log = os.path.join(root, 'memory_usage.log')
+    platform_csv = os.path.join(root, 'platform_usage.csv')
+    if not os.path.exists(cpu_log) and os.path.exists(platform_csv):
+        cpu_log = platform_csv
+    if not os.path.exists(mem_log) and os.path.exists(platform_csv):
+        mem_log = platform_csv
     gpu_files = sorted(glob.glob(os.path.join(root, 'igt*.json')))
 
     total_plots = 3  # CPU + NPU + Memory
@@ -172,13 +182,15 @@ def main():
     fig, axs = plt.subplots(total_plots, 1, figsize=(20, total_plots * 4))  # Wide + Tall
 
     print("📊 Generating single consolidated graph...")
-    plot_cpu_usage(axs[0], cpu_log)
-    plot_npu_usage(axs[1], npu_csv)
-    plot_memory_usage(axs[2], mem_log)
+    # every plot shares the same zero on the epoch timeline
+    origin = timeline_origin([cpu_log, npu_csv, mem_log] + gpu_files)
+    plot_cpu_usage(axs[0], cpu_log, origin)
+    plot_npu_usage(axs[1], npu_csv, origin)
+    plot_memory_usage(axs[2], mem_log, origin)
 
     if gpu_files:
         for idx, gpu_file in enumerate(gpu_files):
-            plot_gpu_metrics(axs[3 + idx], gpu_file)
+            plot_gpu_metrics(axs[3 + idx], gpu_file, origin)
     else:
         print("⚠️ No GPU metric files found (igt*.json). Skipping GPU plots.")
 
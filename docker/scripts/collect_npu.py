@@ -4,43 +4,108 @@
 * SPDX-License-Identifier: Apache-2.0
 '''
 
+import glob
 import os
 import time
 from datetime import datetime
 
-NPU_PATH = os.getenv("NPU_PATH", "/sys/devices/pci0000:00/0000:00:0b.0/npu_busy_time_us")
+from sampling import BatchedWriter, MonotonicSchedule, install_sigterm_handler
+
+# optional comma separated list of npu_busy_time_us files, when empty
+# every NPU device exposing npu_busy_time_us under /sys is sampled
+NPU_PATH = os.getenv("NPU_PATH", "")
 NPU_LOG = os.getenv("NPU_LOG", "npu_usage.csv")
+# sampling rate in Hz, e.g. 10-100 for short high resolution bursts
+NPU_SAMPLE_HZ = float(os.getenv("NPU_SAMPLE_HZ", "1"))
+# buffered samples are written out at most this often
+NPU_FLUSH_SECONDS = float(os.getenv("NPU_FLUSH_SECONDS", "1"))
+
+NPU_BUSY_TIME_FILE = "npu_busy_time_us"
+NPU_DISCOVERY_PATTERNS = [
+    "/sys/class/accel/accel*/device/" + NPU_BUSY_TIME_FILE,
+    "/sys/bus/pci/devices/*/" + NPU_BUSY_TIME_FILE,
+    "/sys/devices/pci*/*/" + NPU_BUSY_TIME_FILE,
+    "/sys/devices/pci*/*/*/" + NPU_BUSY_TIME_FILE,
+]
+CSV_HEADER = "timestamp,epoch_s,monotonic_s,device,percent_usage\n"
+
+
+def discover_npu_devices():
+    '''
+    finds the npu_busy_time_us files of all NPU devices
+    Returns:
+        dict of device name (PCI address) to busy time file path
+    '''
+    if NPU_PATH:
+        paths = [path.strip() for path in NPU_PATH.split(",") if path.strip()]
+    else:
+        paths = []
+        for pattern in NPU_DISCOVERY_PATTERNS:
+            paths.extend(glob.glob(pattern))
+
+    devices = {}
+    seen = set()
+    for path in paths:
+        # the same device shows up under /sys/class, /sys/bus and /sys/devices
+        real_path = os.path.realpath(path)
+        if real_path in seen:
+            continue
+        seen.add(real_path)
+        device = os.path.basename(os.path.dirname(real_path))
+        devices[device] = path
+    return devices
+
 
 def read_npu_runtime(path):
     try:
         with open(path) as f:
             return int(f.read().strip())
-    except:
+    except (OSError, ValueError):
         return None
 
+
 def main():
-    print(f"Logging NPU usage to '{NPU_LOG}' (Ctrl+C to stop)...")
+    devices = discover_npu_devices()
+    if not devices:
+        print("No NPU device with npu_busy_time_us found. Exiting.")
+        return
+
+    print(f"Logging NPU usage of {', '.join(devices)} to '{NPU_LOG}' "
+          f"at {NPU_SAMPLE_HZ} Hz (Ctrl+C to stop)...")
 
-    prev_runtime = read_npu_runtime(NPU_PATH)
-    prev_time = time.monotonic()
-    if prev_runtime is None:
+    previous = {}
+    for device, path in devices.items():
+        runtime = read_npu_runtime(path)
+        if runtime is not None:
+            previous[device] = (runtime, time.monotonic())
+    if not previous:
         print("Initial NPU read failed. Exiting.")
         return
 
-    with open(NPU_LOG, "w", buffering=1) as log:
-        log.write("timestamp,percent_usage\n")
-        try:
-            while True:
-                time.sleep(1)
-                curr_runtime = read_npu_runtime(NPU_PATH)
+    install_sigterm_handler()
+    schedule = MonotonicSchedule(NPU_SAMPLE_HZ)
+    writer = BatchedWriter(NPU_LOG, CSV_HEADER, NPU_FLUSH_SECONDS)
+    try:
+        while True:
+            epoch, _ = schedule.wait()
+            timestamp = datetime.fromtimestamp(epoch).isoformat()
+            for device, path in devices.items():
+                curr_runtime = read_npu_runtime(path)
                 curr_time = time.monotonic()
                 if curr_runtime is None:
                     continue
-                usage = (curr_runtime - prev_runtime) / ((curr_time - prev_time) * 1e6) * 100
-                log.write(f"{datetime.now().isoformat()},{usage:.2f}\n")
-                prev_runtime, prev_time = curr_runtime, curr_time
-        except KeyboardInterrupt:
-            print("\nStopped logging.")
+                if device in previous:
+                    prev_runtime, prev_time = previous[device]
+                    usage = ((curr_runtime - prev_runtime) /
+                             ((curr_time - prev_time) * 1e6) * 100)
+                    writer.add(f"{timestamp},{epoch:.6f},{curr_time:.6f},"
+                               f"{device},{usage:.2f}\n")
+                previous[device] = (curr_runtime, curr_time)
+    except (KeyboardInterrupt, SystemExit):
+        print("\nStopped logging.")
+    finally:
+        writer.close()
+
 
 if __name__ == "__main__":
     main()
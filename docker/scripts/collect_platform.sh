@@ -7,20 +7,33 @@
 
 echo "Starting platform data collection"
 
-echo "Starting sar collection"
-touch /tmp/results/cpu_usage.log
-chown 1000:1000 /tmp/results/cpu_usage.log
-sar 1 >& /tmp/results/cpu_usage.log &
-
-echo "Starting free collection"
-touch /tmp/results/memory_usage.log
-chown 1000:1000 /tmp/results/memory_usage.log
-free -s 1 >& /tmp/results/memory_usage.log &
-
-echo "Starting iotop collection"
-touch /tmp/results/disk_bandwidth.log
-chown 1000:1000 /tmp/results/disk_bandwidth.log
-iotop -o -P -b >& /tmp/results/disk_bandwidth.log &
+# PLATFORM_COLLECTOR=sysstat keeps the former sar, free and iotop
+# collection; by default one /proc based sampler covers cpu, memory
+# and disk bandwidth on a shared tick
+if [ "$PLATFORM_COLLECTOR" == "sysstat" ]
+  then
+    echo "Starting sar collection"
+    touch /tmp/results/cpu_usage.log
+    chown 1000:1000 /tmp/results/cpu_usage.log
+    # 24 hour UTC times and an ISO date in the header, so the samples
+    # can be placed on the epoch timeline
+    S_TIME_FORMAT=ISO S_TIME_DEF_TIME=UTC sar 1 >& /tmp/results/cpu_usage.log &
+
+    echo "Starting free collection"
+    touch /tmp/results/memory_usage.log
+    chown 1000:1000 /tmp/results/memory_usage.log
+    free -s 1 >& /tmp/results/memory_usage.log &
+
+    echo "Starting iotop collection"
+    touch /tmp/results/disk_bandwidth.log
+    chown 1000:1000 /tmp/results/disk_bandwidth.log
+    iotop -o -P -b >& /tmp/results/disk_bandwidth.log &
+  else
+    echo "Starting /proc platform collection"
+    touch /tmp/results/platform_usage.csv
+    chown 1000:1000 /tmp/results/platform_usage.csv
+    PLATFORM_LOG=/tmp/results/platform_usage.csv python3 /scripts/collect_proc.py &
+  fi
 
 is_xeon=`lscpu | grep -i xeon | wc -l`
 
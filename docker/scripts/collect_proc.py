@@ -0,0 +1,211 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import os
+import re
+
+from sampling import BatchedWriter, MonotonicSchedule, install_sigterm_handler
+
+PLATFORM_LOG = os.getenv("PLATFORM_LOG", "platform_usage.csv")
+PLATFORM_SAMPLE_HZ = float(os.getenv("PLATFORM_SAMPLE_HZ", "1"))
+PLATFORM_FLUSH_SECONDS = float(os.getenv("PLATFORM_FLUSH_SECONDS", "1"))
+PROC_ROOT = os.getenv("PROC_ROOT", "/proc")
+SYS_BLOCK = os.getenv("SYS_BLOCK", "/sys/block")
+POWERCAP_ROOT = os.getenv("POWERCAP_ROOT", "/sys/class/powercap")
+
+# /proc/diskstats counts 512 byte sectors regardless of the device
+SECTOR_BYTES = 512
+# virtual block devices whose I/O is already counted on a real disk
+VIRTUAL_DISK_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "nbd")
+# top level RAPL zones are the CPU packages, their subzones (core,
+# uncore, dram) are already part of the package energy
+RAPL_PACKAGE_PATTERN = re.compile(r"^intel-rapl:\d+$")
+CSV_HEADER = ("epoch_s,monotonic_s,cpu_percent,iowait_percent,"
+              "mem_total_kb,mem_used_kb,mem_percent,"
+              "disk_read_bps,disk_write_bps,package_power_w\n")
+
+
+def read_cpu_times():
+    '''
+    reads the aggregated cpu line of /proc/stat
+    Returns:
+        (total, idle, iowait) jiffies since boot
+    '''
+    with open(os.path.join(PROC_ROOT, "stat")) as f:
+        fields = f.readline().split()
+    # user nice system idle iowait irq softirq steal; guest time is
+    # already part of user and nice
+    times = [int(value) for value in fields[1:9]]
+    return sum(times), times[3], times[4]
+
+
+def read_meminfo():
+    '''
+    reads total and available memory from /proc/meminfo
+    Returns:
+        (total_kb, used_kb) where used is total minus available
+    '''
+    meminfo = {}
+    with open(os.path.join(PROC_ROOT, "meminfo")) as f:
+        for line in f:
+            key, value = line.split(":", 1)
+            if key in ("MemTotal", "MemAvailable"):
+                meminfo[key] = int(value.split()[0])
+                if len(meminfo) == 2:
+                    break
+    total = meminfo.get("MemTotal", 0)
+    return total, total - meminfo.get("MemAvailable", total)
+
+
+def physical_disks():
+    '''
+    returns the names of the whole, non-virtual block devices
+    '''
+    try:
+        names = os.listdir(SYS_BLOCK)
+    except OSError:
+        return None
+    return {name for name in names
+            if not name.startswith(VIRTUAL_DISK_PREFIXES)}
+
+
+def read_disk_sectors(disks):
+    '''
+    sums the sectors read and written by the given disks
+    Args:
+        disks: set of block device names, None to count every device
+               that is not a known virtual one
+    Returns:
+        (sectors_read, sectors_written) since boot
+    '''
+    sectors_read = 0
+    sectors_written = 0
+    with open(os.path.join(PROC_ROOT, "diskstats")) as f:
+        for line in f:
+            fields = line.split()
+            name = fields[2]
+            if disks is not None:
+                if name not in disks:
+                    continue
+            elif name.startswith(VIRTUAL_DISK_PREFIXES):
+                continue
+            sectors_read += int(fields[5])
+            sectors_written += int(fields[9])
+    return sectors_read, sectors_written
+
+
+def rapl_packages():
+    '''
+    finds the RAPL package zones whose energy counter is readable
+    Returns:
+        list of (energy_uj path, max_energy_range_uj) tuples, empty when
+        RAPL is missing or needs more privileges than the collector has
+    '''
+    try:
+        names = sorted(os.listdir(POWERCAP_ROOT))
+    except OSError:
+        return []
+    packages = []
+    for name in names:
+        if not RAPL_PACKAGE_PATTERN.match(name):
+            continue
+        zone = os.path.join(POWERCAP_ROOT, name)
+        try:
+            with open(os.path.join(zone, "max_energy_range_uj")) as f:
+                max_range = int(f.read())
+            with open(os.path.join(zone, "energy_uj")) as f:
+                int(f.read())
+        except (OSError, ValueError):
+            continue
+        packages.append((os.path.join(zone, "energy_uj"), max_range))
+    return packages
+
+
+def read_rapl_energy(packages):
+    '''
+    reads the energy counter of every RAPL package
+    Returns:
+        list of microjoules, None when a counter could not be read
+    '''
+    energy = []
+    for path, _ in packages:
+        try:
+            with open(path) as f:
+                energy.append(int(f.read()))
+        except (OSError, ValueError):
+            return None
+    return energy
+
+
+def package_power(packages, prev_energy, energy, interval):
+    '''
+    returns the mean power in watts of all packages between two readings
+    of their energy counters, None when either reading is missing
+    '''
+    if not packages or prev_energy is None or energy is None \
+            or interval <= 0:
+        return None
+    joules = 0
+    for (_, max_range), prev, current in zip(packages, prev_energy, energy):
+        delta = current - prev
+        if delta < 0:
+            # the counter wrapped around at max_energy_range_uj
+            delta += max_range
+        joules += delta / 1e6
+    return joules / interval
+
+
+def main():
+    disks = physical_disks()
+    packages = rapl_packages()
+    print(f"Logging platform usage to '{PLATFORM_LOG}' at "
+          f"{PLATFORM_SAMPLE_HZ} Hz (Ctrl+C to stop)...")
+
+    install_sigterm_handler()
+    schedule = MonotonicSchedule(PLATFORM_SAMPLE_HZ)
+    writer = BatchedWriter(PLATFORM_LOG, CSV_HEADER, PLATFORM_FLUSH_SECONDS)
+    prev_cpu = read_cpu_times()
+    prev_disk = read_disk_sectors(disks)
+    prev_energy = read_rapl_energy(packages)
+    prev_time = schedule.next_tick - schedule.period
+    try:
+        while True:
+            epoch, now = schedule.wait()
+            cpu = read_cpu_times()
+            mem_total, mem_used = read_meminfo()
+            disk = read_disk_sectors(disks)
+            energy = read_rapl_energy(packages)
+
+            total_delta = cpu[0] - prev_cpu[0]
+            if total_delta > 0:
+                # same definition as 100 - %idle reported by sar
+                cpu_percent = 100.0 * (
+                    1 - (cpu[1] - prev_cpu[1]) / total_delta)
+                iowait_percent = 100.0 * (cpu[2] - prev_cpu[2]) / total_delta
+            else:
+                cpu_percent = iowait_percent = 0.0
+            interval = now - prev_time
+            read_bps = (disk[0] - prev_disk[0]) * SECTOR_BYTES / interval
+            write_bps = (disk[1] - prev_disk[1]) * SECTOR_BYTES / interval
+            mem_percent = 100.0 * mem_used / mem_total if mem_total else 0.0
+            power = package_power(packages, prev_energy, energy, interval)
+            # left empty where RAPL is not available
+            power = "" if power is None else f"{power:.2f}"
+
+            writer.add(f"{epoch:.6f},{now:.6f},{cpu_percent:.2f},"
+                       f"{iowait_percent:.2f},{mem_total},{mem_used},"
+                       f"{mem_percent:.2f},{read_bps:.0f},{write_bps:.0f},"
+                       f"{power}\n")
+            prev_cpu, prev_disk, prev_time = cpu, disk, now
+            prev_energy = energy
+    except (KeyboardInterrupt, SystemExit):
+        print("\nStopped logging.")
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
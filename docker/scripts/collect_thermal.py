@@ -0,0 +1,192 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import glob
+import os
+import re
+
+from sampling import BatchedWriter, MonotonicSchedule, install_sigterm_handler
+
+THERMAL_LOG = os.getenv("THERMAL_LOG", "thermal_usage.csv")
+THERMAL_SAMPLE_HZ = float(os.getenv("THERMAL_SAMPLE_HZ", "1"))
+THERMAL_FLUSH_SECONDS = float(os.getenv("THERMAL_FLUSH_SECONDS", "1"))
+SYS_ROOT = os.getenv("SYS_ROOT", "/sys")
+
+# the kernel counts the thermal throttling events of every core and of
+# its package, the package counter repeats on every core of the package
+CPU_THROTTLE_FILES = ("core_throttle_count", "package_throttle_count")
+CARD_PATTERN = re.compile(r"^card(\d+)$")
+# actual and maximum frequency and throttle status files of the i915
+# and xe drivers, relative to /sys/class/drm/cardN
+GPU_FREQ_FILES = ("gt_act_freq_mhz", "device/tile0/gt0/freq0/act_freq")
+GPU_MAX_FREQ_FILES = ("gt_RP0_freq_mhz", "device/tile0/gt0/freq0/rp0_freq")
+GPU_THROTTLE_FILES = ("gt/gt0/throttle_reason_status",
+                      "device/tile0/gt0/freq0/throttle/status")
+SUMMARY_COLUMNS = ("epoch_s,monotonic_s,cpu_mhz_mean,cpu_mhz_min,"
+                   "cpu_max_mhz,temp_c_max,throttle_events,throttled")
+
+
+def read_number(path):
+    try:
+        with open(path) as f:
+            return float(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _first_existing(directory, candidates):
+    for candidate in candidates:
+        path = os.path.join(directory, candidate)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _cpu_number(path):
+    return int(re.search(r"cpu(\d+)", path).group(1))
+
+
+def discover_sensors():
+    '''
+    finds the frequency, temperature and throttling files under SYS_ROOT
+    Returns:
+        dict with "cpus" (name, scaling_cur_freq path), "cpu_max" paths,
+        "throttle" counter paths, "zones" (name, temp path) and "gpus"
+        (card, act freq path, max freq path, throttle status path)
+    '''
+    cpu_root = os.path.join(SYS_ROOT, "devices", "system", "cpu")
+    cpus = sorted(glob.glob(os.path.join(
+        cpu_root, "cpu[0-9]*", "cpufreq", "scaling_cur_freq")),
+        key=_cpu_number)
+    cpu_max = sorted(glob.glob(os.path.join(
+        cpu_root, "cpu[0-9]*", "cpufreq", "cpuinfo_max_freq")),
+        key=_cpu_number)
+    throttle = sorted(
+        path for name in CPU_THROTTLE_FILES for path in glob.glob(
+            os.path.join(cpu_root, "cpu[0-9]*", "thermal_throttle", name)))
+    zones = []
+    for zone in sorted(glob.glob(os.path.join(
+            SYS_ROOT, "class", "thermal", "thermal_zone*")),
+            key=lambda path: int(re.sub(r"\D", "", os.path.basename(path))
+                                 or 0)):
+        try:
+            with open(os.path.join(zone, "type")) as f:
+                zone_type = re.sub(r"[^A-Za-z0-9]+", "_", f.read().strip())
+        except OSError:
+            continue
+        zones.append((f"{os.path.basename(zone)}_{zone_type}",
+                      os.path.join(zone, "temp")))
+    gpus = []
+    for card in sorted(glob.glob(os.path.join(SYS_ROOT, "class", "drm",
+                                              "card*"))):
+        match = CARD_PATTERN.match(os.path.basename(card))
+        freq = _first_existing(card, GPU_FREQ_FILES)
+        if match is None or freq is None:
+            continue
+        gpus.append((match.group(1), freq,
+                     _first_existing(card, GPU_MAX_FREQ_FILES),
+                     _first_existing(card, GPU_THROTTLE_FILES)))
+    return {"cpus": [(f"cpu{_cpu_number(path)}", path) for path in cpus],
+            "cpu_max": cpu_max, "throttle": throttle, "zones": zones,
+            "gpus": gpus}
+
+
+def csv_header(sensors):
+    '''
+    returns the csv header line: the summary columns followed by one
+    column per gpu, core and thermal zone
+    '''
+    columns = [SUMMARY_COLUMNS]
+    for card, *_ in sensors["gpus"]:
+        columns += [f"gpu{card}_mhz", f"gpu{card}_max_mhz"]
+    columns += [f"{name}_mhz" for name, _ in sensors["cpus"]]
+    columns += [f"{name}_c" for name, _ in sensors["zones"]]
+    return ",".join(columns) + "\n"
+
+
+def read_throttle_count(sensors):
+    counts = [read_number(path) for path in sensors["throttle"]]
+    return sum(count for count in counts if count is not None)
+
+
+def _format(value, digits=0):
+    return "" if value is None else f"{value:.{digits}f}"
+
+
+def sample(sensors, prev_throttle):
+    '''
+    reads every sensor once
+    Args:
+        sensors: dict returned by discover_sensors
+        prev_throttle: throttle event count of the previous sample
+    Returns:
+        (csv values after the timestamps, throttle event count)
+    '''
+    # cpufreq reports kHz, the thermal zones millidegrees
+    core_mhz = [read_number(path) for _, path in sensors["cpus"]]
+    core_mhz = [None if value is None else value / 1000
+                for value in core_mhz]
+    valid_mhz = [value for value in core_mhz if value is not None]
+    max_mhz = [read_number(path) for path in sensors["cpu_max"]]
+    max_mhz = [value / 1000 for value in max_mhz if value is not None]
+    temperatures = [read_number(path) for _, path in sensors["zones"]]
+    temperatures = [None if value is None else value / 1000
+                    for value in temperatures]
+    valid_temperatures = [value for value in temperatures
+                          if value is not None]
+    throttle = read_throttle_count(sensors)
+    events = max(0, throttle - prev_throttle)
+    gpu_values = []
+    gpu_throttled = False
+    for _, freq, max_freq, status in sensors["gpus"]:
+        gpu_values += [read_number(freq),
+                       read_number(max_freq) if max_freq else None]
+        if status and read_number(status):
+            gpu_throttled = True
+    values = [
+        _format(sum(valid_mhz) / len(valid_mhz) if valid_mhz else None),
+        _format(min(valid_mhz) if valid_mhz else None),
+        _format(max(max_mhz) if max_mhz else None),
+        _format(max(valid_temperatures) if valid_temperatures else None, 1),
+        _format(events),
+        "1" if events or gpu_throttled else "0",
+    ]
+    values += [_format(value) for value in gpu_values]
+    values += [_format(value) for value in core_mhz]
+    values += [_format(value, 1) for value in temperatures]
+    return values, throttle
+
+
+def main():
+    sensors = discover_sensors()
+    if not (sensors["cpus"] or sensors["zones"] or sensors["gpus"]):
+        print(f"No cpufreq, thermal zone or GPU frequency found under "
+              f"'{SYS_ROOT}'. Exiting.")
+        return
+
+    print(f"Logging {len(sensors['cpus'])} core frequencies, "
+          f"{len(sensors['zones'])} thermal zones and "
+          f"{len(sensors['gpus'])} GPU frequencies to '{THERMAL_LOG}' at "
+          f"{THERMAL_SAMPLE_HZ} Hz (Ctrl+C to stop)...")
+
+    install_sigterm_handler()
+    schedule = MonotonicSchedule(THERMAL_SAMPLE_HZ)
+    writer = BatchedWriter(THERMAL_LOG, csv_header(sensors),
+                           THERMAL_FLUSH_SECONDS)
+    throttle = read_throttle_count(sensors)
+    try:
+        while True:
+            epoch, now = schedule.wait()
+            values, throttle = sample(sensors, throttle)
+            writer.add(f"{epoch:.6f},{now:.6f}," + ",".join(values) + "\n")
+    except (KeyboardInterrupt, SystemExit):
+        print("\nStopped logging.")
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+#!/usr/bin/env bash
+#
+# Copyright (C) 2025 Intel Corporation.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+# COLLECTOR_CPUSET pins supervisord, and with it every collector it
+# starts, to housekeeping cpus so the collectors do not compete with
+# the pipelines under test
+if [ -n "$COLLECTOR_CPUSET" ]
+  then
+    echo "Pinning the metric collectors to cpus $COLLECTOR_CPUSET"
+    exec taskset -c "$COLLECTOR_CPUSET" /usr/bin/supervisord -c /supervisord.conf
+  fi
+
+exec /usr/bin/supervisord -c /supervisord.conf
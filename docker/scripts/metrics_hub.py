@@ -0,0 +1,518 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+from collections import deque
+import csv
+import glob
+import http.server
+import json
+import os
+import re
+import socketserver
+import threading
+import time
+
+from sampling import install_sigterm_handler
+
+RESULTS_DIR = os.getenv("RESULTS_DIR", "/tmp/results")
+METRICS_SOCKET = os.getenv("METRICS_SOCKET",
+                           os.path.join(RESULTS_DIR, "metrics.sock"))
+# optional localhost TCP port serving the same protocol, 0 disables it
+METRICS_PORT = int(os.getenv("METRICS_PORT") or "0")
+METRICS_WINDOW = float(os.getenv("METRICS_WINDOW", "10"))
+METRICS_POLL_SECONDS = float(os.getenv("METRICS_POLL_SECONDS", "0.5"))
+# optional OpenMetrics endpoint for dashboards, 0 disables it
+METRICS_HTTP_PORT = int(os.getenv("METRICS_HTTP_PORT") or "0")
+METRICS_HTTP_ADDRESS = os.getenv("METRICS_HTTP_ADDRESS", "127.0.0.1")
+
+# columns of platform_usage.csv written by collect_proc.py
+PLATFORM_METRICS = {
+    "cpu_percent": "cpu",
+    "iowait_percent": "iowait",
+    "mem_percent": "memory",
+    "disk_read_bps": "disk_read_bps",
+    "disk_write_bps": "disk_write_bps",
+    "package_power_w": "power",
+}
+# columns of thermal_usage.csv written by collect_thermal.py
+THERMAL_METRICS = {
+    "cpu_mhz_mean": "cpu_mhz",
+    "temp_c_max": "temperature",
+    "throttled": "throttled",
+}
+# intel_gpu_top -c reports engine busy time in columns ending in " %",
+# RC6 is the idle residency and not an engine
+GPU_BUSY_SUFFIX = " %"
+GPU_IDLE_COLUMNS = ("RC6 %",)
+# stream density runs write the pipeline logs of each iteration to
+# iteration_<container>_<NNN> directories, see stream_density.py
+ITERATION_DIR_PATTERN = re.compile(r"^(iteration_.+)_(\d+)$")
+PIPELINE_FPS_PATTERN = "pipeline*.log"
+PIPELINE_TRACER_PATTERN = "gst-launch*.log"
+_LATENCY_MARKER = "latency_tracer_pipeline,"
+_FRAME_LATENCY_PATTERN = re.compile(
+    r"frame_latency=\(double\)([-+0-9.eE]+)")
+
+OPENMETRICS_CONTENT_TYPE = \
+    "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# hub metric name prefix, label names of the remaining "/" separated
+# name parts, exported metric family and its help text; a prefix with
+# several families lists the one with the most labels first
+OPENMETRICS_FAMILIES = (
+    ("cpu", (), "benchmark_cpu_utilization_percent",
+     "Host CPU utilization"),
+    ("iowait", (), "benchmark_cpu_iowait_percent",
+     "Host CPU time waiting for I/O"),
+    ("memory", (), "benchmark_memory_utilization_percent",
+     "Host memory in use"),
+    ("disk_read_bps", (), "benchmark_disk_read_bytes_per_second",
+     "Host disk read throughput"),
+    ("disk_write_bps", (), "benchmark_disk_write_bytes_per_second",
+     "Host disk write throughput"),
+    ("power", (), "benchmark_package_power_watts",
+     "Host CPU package power from RAPL"),
+    ("cpu_mhz", (), "benchmark_cpu_frequency_megahertz",
+     "Mean frequency of the host CPU cores"),
+    ("temperature", (), "benchmark_max_temperature_celsius",
+     "Hottest thermal zone of the host"),
+    ("throttled", (), "benchmark_throttled",
+     "1 while the host CPU or GPU is throttled"),
+    ("gpu", ("card", "engine"), "benchmark_gpu_engine_busy_percent",
+     "GPU engine busy time"),
+    ("gpu", ("card",), "benchmark_gpu_card_busy_percent",
+     "Busy time of the busiest engine of a GPU"),
+    ("gpu", (), "benchmark_gpu_busy_percent",
+     "Busy time of the busiest GPU engine"),
+    ("npu", ("device",), "benchmark_npu_device_utilization_percent",
+     "NPU device utilization"),
+    ("npu", (), "benchmark_npu_utilization_percent",
+     "NPU utilization"),
+    ("fps", ("pipeline",), "benchmark_pipeline_fps",
+     "Frames per second of a pipeline"),
+    ("latency", ("pipeline",), "benchmark_pipeline_latency_milliseconds",
+     "Per-frame latency of a pipeline"),
+)
+
+
+class RollingWindow:
+    '''
+    keeps the samples of the last window seconds with running sums, so
+    mean, last and max are available without rescanning the samples
+    '''
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._samples = deque()
+        # decreasing values, its head is the window maximum
+        self._max = deque()
+        self._sum = 0.0
+
+    def add(self, timestamp, value):
+        self._samples.append((timestamp, value))
+        self._sum += value
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+        self.expire(timestamp)
+
+    def expire(self, now):
+        cutoff = now - self.seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            _, value = self._samples.popleft()
+            self._sum -= value
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    def stats(self):
+        if not self._samples:
+            return None
+        count = len(self._samples)
+        return {"mean": self._sum / count,
+                "last": self._samples[-1][1],
+                "max": self._max[0][1],
+                "count": count,
+                "time": self._samples[-1][0]}
+
+
+class LineTailer:
+    '''
+    follows a text log and returns the complete lines appended since the
+    last call
+    '''
+    def __init__(self, path, from_end=False):
+        self.path = path
+        self.offset = 0
+        self._partial = ""
+        if from_end:
+            # skip the history of a log that was already running,
+            # the first line read may be the tail of a partial one
+            try:
+                self.offset = os.path.getsize(path)
+            except OSError:
+                pass
+
+    def _reset(self):
+        self.offset = 0
+        self._partial = ""
+
+    def read_lines(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self.offset:
+            # the writer restarted and truncated the file
+            self._reset()
+        if size == self.offset:
+            return []
+        with open(self.path, errors="replace") as f:
+            f.seek(self.offset)
+            data = self._partial + f.read()
+            self.offset = f.tell()
+        lines = data.split("\n")
+        # the last element is an incomplete line or empty
+        self._partial = lines.pop()
+        return lines
+
+
+class CsvTailer(LineTailer):
+    '''
+    follows a csv file written by a collector and returns the rows
+    appended since the last call
+    '''
+    def __init__(self, path):
+        super().__init__(path)
+        self.header = None
+
+    def _reset(self):
+        super()._reset()
+        self.header = None
+
+    def read_rows(self):
+        rows = []
+        for values in csv.reader(self.read_lines()):
+            if not values:
+                continue
+            if self.header is None:
+                self.header = [name.strip() for name in values]
+                continue
+            rows.append(dict(zip(self.header, values)))
+        return rows
+
+
+class MetricsHub:
+    '''
+    tails the collector logs under a results directory and keeps a
+    rolling window per metric
+    '''
+    def __init__(self, results_dir, window_seconds):
+        self.results_dir = results_dir
+        self.window_seconds = window_seconds
+        self.windows = {}
+        self.tailers = {}
+        self.lock = threading.Lock()
+        self._polled = False
+        self._followed = set()
+
+    def add(self, name, timestamp, value):
+        window = self.windows.get(name)
+        if window is None:
+            window = RollingWindow(self.window_seconds)
+            self.windows[name] = window
+        window.add(timestamp, value)
+
+    def _tailer(self, path, factory=CsvTailer):
+        tailer = self.tailers.get(path)
+        if tailer is None:
+            tailer = factory(path)
+            self.tailers[path] = tailer
+        self._followed.add(path)
+        return tailer
+
+    def pipeline_dirs(self):
+        '''
+        returns the directories the running pipelines write their logs
+        to: the results directory and the newest stream density
+        iteration of every container
+        '''
+        newest = {}
+        for path in glob.glob(os.path.join(self.results_dir, "iteration_*")):
+            match = ITERATION_DIR_PATTERN.match(os.path.basename(path))
+            if match is None or not os.path.isdir(path):
+                continue
+            iteration = int(match.group(2))
+            if iteration >= newest.get(match.group(1), (-1, None))[0]:
+                newest[match.group(1)] = (iteration, path)
+        return [self.results_dir] + sorted(
+            path for _, path in newest.values())
+
+    def _pipeline_lines(self, pattern):
+        '''
+        reads the lines appended to the pipeline logs matching pattern,
+        keyed by the log path relative to the results directory without
+        its .log suffix
+        '''
+        # logs found by the first poll were running before the hub
+        # started, their history would skew the windows
+        from_end = not self._polled
+        lines = {}
+        for directory in self.pipeline_dirs():
+            for path in sorted(glob.glob(os.path.join(directory, pattern))):
+                tailer = self._tailer(
+                    path, lambda path: LineTailer(path, from_end))
+                name = os.path.relpath(path, self.results_dir)[:-len(".log")]
+                lines[name] = tailer.read_lines()
+        return lines
+
+    def poll(self):
+        '''
+        reads the rows appended to every collector log since the last poll
+        '''
+        now = time.time()
+        self._followed = set()
+        platform_rows = self._tailer(
+            os.path.join(self.results_dir, "platform_usage.csv")).read_rows()
+        npu_rows = self._tailer(
+            os.path.join(self.results_dir, "npu_usage.csv")).read_rows()
+        thermal_rows = self._tailer(
+            os.path.join(self.results_dir, "thermal_usage.csv")).read_rows()
+        gpu_rows = {}
+        for path in sorted(glob.glob(
+                os.path.join(self.results_dir, "igt*.csv"))):
+            card = os.path.basename(path)[len("igt"):-len(".csv")]
+            gpu_rows[card] = self._tailer(path).read_rows()
+        fps_lines = self._pipeline_lines(PIPELINE_FPS_PATTERN)
+        tracer_lines = self._pipeline_lines(PIPELINE_TRACER_PATTERN)
+        self._polled = True
+        # forget the logs of finished stream density iterations
+        for path in set(self.tailers) - self._followed:
+            del self.tailers[path]
+
+        with self.lock:
+            for rows, metrics in ((platform_rows, PLATFORM_METRICS),
+                                  (thermal_rows, THERMAL_METRICS)):
+                for row in rows:
+                    timestamp = _to_float(row.get("epoch_s"), now)
+                    for column, name in metrics.items():
+                        value = _to_float(row.get(column))
+                        if value is not None:
+                            self.add(name, timestamp, value)
+            for row in npu_rows:
+                value = _to_float(row.get("percent_usage"))
+                if value is None:
+                    continue
+                timestamp = _to_float(row.get("epoch_s"), now)
+                self.add("npu", timestamp, value)
+                if row.get("device"):
+                    self.add("npu/" + row["device"], timestamp, value)
+            for card, rows in gpu_rows.items():
+                for row in rows:
+                    busy = [_to_float(value) for column, value in row.items()
+                            if column.endswith(GPU_BUSY_SUFFIX)
+                            and column not in GPU_IDLE_COLUMNS]
+                    busy = [value for value in busy if value is not None]
+                    if busy:
+                        # igt rows carry no timestamp, use the arrival time
+                        self.add("gpu", now, max(busy))
+                        self.add("gpu/" + card, now, max(busy))
+                    for column, value in row.items():
+                        value = _to_float(value)
+                        if (column.endswith(GPU_BUSY_SUFFIX)
+                                and column not in GPU_IDLE_COLUMNS
+                                and value is not None):
+                            engine = column[:-len(GPU_BUSY_SUFFIX)].strip()
+                            self.add(f"gpu/{card}/{engine}", now, value)
+            for name, lines in fps_lines.items():
+                for line in lines:
+                    # a pipeline log holds one fps value or "na" per line
+                    value = _to_float(line.strip())
+                    if value is not None:
+                        self.add("fps/" + name, now, value)
+            for name, lines in tracer_lines.items():
+                for line in lines:
+                    if _LATENCY_MARKER not in line:
+                        continue
+                    match = _FRAME_LATENCY_PATTERN.search(line)
+                    if match is not None:
+                        self.add("latency/" + name, now,
+                                 float(match.group(1)))
+            for name, window in list(self.windows.items()):
+                window.expire(now)
+                if window.stats() is None:
+                    # stopped pipelines, their windows are not refilled
+                    del self.windows[name]
+
+    def snapshot(self, names=None):
+        '''
+        returns the current window statistics
+        Args:
+            names: metric names to return, all metrics when empty
+        '''
+        with self.lock:
+            metrics = {}
+            for name, window in self.windows.items():
+                if names and name not in names:
+                    continue
+                stats = window.stats()
+                if stats is not None:
+                    metrics[name] = stats
+        return {"time": time.time(), "window_seconds": self.window_seconds,
+                "metrics": metrics}
+
+
+def _to_float(value, default=None):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class MetricsRequestHandler(socketserver.StreamRequestHandler):
+    '''
+    answers one request line of space separated metric names (empty for
+    all metrics) with one JSON line
+    '''
+    def handle(self):
+        request = self.rfile.readline(4096).decode(errors="replace")
+        reply = self.server.hub.snapshot(request.split())
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+def _label_value(value):
+    return (value.replace("\\", "\\\\").replace("\"", "\\\"")
+            .replace("\n", "\\n"))
+
+
+def _openmetrics_family(name):
+    '''
+    maps a hub metric name to its OpenMetrics family and labels
+    Returns:
+        (family name, help text, label dict) or None for unknown names
+    '''
+    prefix, _, rest = name.partition("/")
+    for family_prefix, labels, family, help_text in OPENMETRICS_FAMILIES:
+        if family_prefix != prefix:
+            continue
+        values = rest.split("/", len(labels) - 1) if rest else []
+        if len(values) == len(labels):
+            return family, help_text, dict(zip(labels, values))
+    return None
+
+
+def render_openmetrics(snapshot):
+    '''
+    renders a hub snapshot in the OpenMetrics text format, every metric
+    is exported as a gauge of its window mean
+    Args:
+        snapshot: the dictionary returned by MetricsHub.snapshot
+    Returns:
+        the exposition text
+    '''
+    families = {}
+    for name, stats in sorted(snapshot["metrics"].items()):
+        family = _openmetrics_family(name)
+        if family is None:
+            continue
+        family_name, help_text, labels = family
+        samples = families.setdefault(family_name, (help_text, []))[1]
+        samples.append((labels, stats["mean"]))
+
+    lines = []
+    for family_name, (help_text, samples) in families.items():
+        lines.append(f"# TYPE {family_name} gauge")
+        lines.append(f"# HELP {family_name} {help_text}, mean over the "
+                     f"last {snapshot['window_seconds']:g} seconds.")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{_label_value(label)}"'
+                                  for key, label in labels.items())
+            if label_text:
+                label_text = "{" + label_text + "}"
+            lines.append(f"{family_name}{label_text} {value!r}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class OpenMetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    '''
+    serves the current hub windows on /metrics for Prometheus compatible
+    scrapers
+    '''
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_openmetrics(self.server.hub.snapshot()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # scrapes every few seconds would flood the supervisord log
+        pass
+
+
+class HTTPMetricsServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class UnixMetricsServer(socketserver.ThreadingMixIn,
+                        socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TCPMetricsServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(server, hub):
+    server.hub = hub
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    hub = MetricsHub(RESULTS_DIR, METRICS_WINDOW)
+    if os.path.exists(METRICS_SOCKET):
+        os.remove(METRICS_SOCKET)
+    servers = [UnixMetricsServer(METRICS_SOCKET, MetricsRequestHandler)]
+    # the benchmark scripts run as a regular user on the host
+    os.chmod(METRICS_SOCKET, 0o666)  # nosec B103
+    if METRICS_PORT:
+        servers.append(TCPMetricsServer(("127.0.0.1", METRICS_PORT),
+                                        MetricsRequestHandler))
+    if METRICS_HTTP_PORT:
+        servers.append(HTTPMetricsServer(
+            (METRICS_HTTP_ADDRESS, METRICS_HTTP_PORT),
+            OpenMetricsRequestHandler))
+    for server in servers:
+        serve(server, hub)
+    print(f"Serving {METRICS_WINDOW}s metric windows on {METRICS_SOCKET}" +
+          (f" and 127.0.0.1:{METRICS_PORT}" if METRICS_PORT else ""))
+    if METRICS_HTTP_PORT:
+        print(f"Serving OpenMetrics on http://{METRICS_HTTP_ADDRESS}:"
+              f"{METRICS_HTTP_PORT}/metrics")
+
+    install_sigterm_handler()
+    try:
+        while True:
+            hub.poll()
+            time.sleep(METRICS_POLL_SECONDS)
+    except (KeyboardInterrupt, SystemExit):
+        print("\nStopped metrics hub.")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if os.path.exists(METRICS_SOCKET):
+            os.remove(METRICS_SOCKET)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+'''
+* Copyright (C) 2025 Intel Corporation.
+*
+* SPDX-License-Identifier: Apache-2.0
+'''
+
+import signal
+import time
+
+
+class MonotonicSchedule:
+    '''
+    ticks at a fixed rate on absolute monotonic deadlines, so the time
+    spent sampling does not accumulate into the timeline
+    '''
+    def __init__(self, rate_hz):
+        self.period = 1.0 / rate_hz
+        self.next_tick = time.monotonic() + self.period
+
+    def wait(self):
+        '''
+        sleeps until the next deadline
+        Returns:
+            (epoch, monotonic) timestamps of the tick
+        '''
+        delay = self.next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        now = time.monotonic()
+        epoch = time.time()
+        self.next_tick += self.period
+        if self.next_tick < now:
+            # fell behind, e.g. the host was suspended: skip the
+            # missed ticks instead of sampling in a burst
+            self.next_tick += (
+                int((now - self.next_tick) / self.period) + 1) * self.period
+        return epoch, now
+
+
+class BatchedWriter:
+    '''
+    buffers sample lines and writes them out in batches
+    '''
+    def __init__(self, path, header, flush_seconds):
+        self.flush_seconds = flush_seconds
+        self._lines = []
+        self._last_flush = time.monotonic()
+        self._log = open(path, "w")
+        self._log.write(header)
+        self._log.flush()
+
+    def add(self, line):
+        self._lines.append(line)
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_seconds:
+            self.flush()
+            self._last_flush = now
+
+    def flush(self):
+        if self._lines:
+            self._log.write("".join(self._lines))
+            self._log.flush()
+            self._lines.clear()
+
+    def close(self):
+        self.flush()
+        self._log.close()
+
+
+def handle_sigterm(_signum, _frame):
+    # supervisord stops programs with SIGTERM, exit through the
+    # normal path so buffered samples are written out
+    raise SystemExit(0)
+
+
+def install_sigterm_handler():
+    signal.signal(signal.SIGTERM, handle_sigterm)